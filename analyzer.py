@@ -0,0 +1,3626 @@
+"""Excel Analyzer Pro analysis engine.
+
+Parsing, profiling, recommendations and exports, usable without a
+Streamlit session. app.py renders these results; the command line entry
+point analyzes whole directories of workbooks in a process pool:
+
+    python analyzer.py analyze DIR --jobs 8 --output results.jsonl
+"""
+import argparse
+import copy
+import gzip
+import hashlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import warnings
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from io import BytesIO
+from multiprocessing import shared_memory
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+# Instrumentation settings
+INSTRUMENT_LOG_ENV = 'EXCEL_ANALYZER_INSTRUMENT_LOG'
+
+_instrument_log_lock = threading.Lock()
+
+class Instrumentation:
+    """Wall time, CPU time and peak allocation per named stage of one run.
+
+    Stages are timed with the stage() context manager and may nest; lap()
+    times consecutive sections inside a stage without indenting them.
+    Peak allocation comes from tracemalloc, which slows Python-level code
+    considerably, so it is only traced when trace_memory is set and only
+    while a stage is open. With log_path set each finished stage is appended
+    to that file as one JSON line along with the context fields.
+    """
+
+    def __init__(self, trace_memory=False, log_path=None, **context):
+        self.trace_memory = trace_memory
+        self.log_path = log_path
+        self.context = context
+        self.records = []
+        self._open = []
+        self._started_tracing = False
+
+    def _enter(self, name, lap=False):
+        record = {'stage': name, 'depth': len(self._open), 'seconds': None,
+                  'cpu_seconds': None, 'peak_mb': None}
+        self.records.append(record)
+        frame = {'record': record, 'lap': lap, 'traced': self.trace_memory}
+        if frame['traced']:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            if self._open and self._open[-1]['traced']:
+                # reset_peak() below would lose the enclosing stage's peak so far
+                self._open[-1]['peak'] = max(self._open[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['start'] = frame['peak'] = current
+        self._open.append(frame)
+        frame['wall'], frame['cpu'] = time.perf_counter(), time.process_time()
+
+    def _exit(self):
+        wall, cpu = time.perf_counter(), time.process_time()
+        frame = self._open.pop()
+        record = frame['record']
+        record['seconds'] = round(wall - frame['wall'], 4)
+        record['cpu_seconds'] = round(cpu - frame['cpu'], 4)
+        if frame['traced']:
+            peak = max(tracemalloc.get_traced_memory()[1], frame['peak'])
+            record['peak_mb'] = round(max(peak - frame['start'], 0) / 1024 ** 2, 2)
+            if self._open and self._open[-1]['traced']:
+                self._open[-1]['peak'] = max(self._open[-1]['peak'], peak)
+            elif self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        if self.log_path:
+            self._log(record)
+
+    def _log(self, record):
+        line = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), **self.context, **record}
+        with _instrument_log_lock, open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(line, default=str) + '\n')
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage name, closing any laps left open inside it"""
+        depth = len(self._open)
+        self._enter(name)
+        try:
+            yield self
+        finally:
+            while len(self._open) > depth:
+                self._exit()
+
+    def lap(self, name=None):
+        """End the running lap, if any, and start timing the next one; name=None only ends it"""
+        if self._open and self._open[-1]['lap']:
+            self._exit()
+        if name is not None:
+            self._enter(name, lap=True)
+
+    def summary(self):
+        """Finished stages as a DataFrame, nested stages indented under their parent"""
+        done = [r for r in self.records if r['seconds'] is not None]
+        return pd.DataFrame({
+            'Stage': [('  ' * (r['depth'] - 1) + '↳ ' if r['depth'] else '') + r['stage'] for r in done],
+            'Wall (s)': [r['seconds'] for r in done],
+            'CPU (s)': [r['cpu_seconds'] for r in done],
+            'Peak (MB)': [r['peak_mb'] for r in done],
+        })
+
+# Background job settings
+JOB_WORKERS = 2
+JOB_MAX_RESULTS = 16
+JOB_WAIT_SECONDS = 0.5
+
+class JobCancelled(Exception):
+    """Raised inside a background job at its next checkpoint once the job is cancelled"""
+
+_job_context = threading.local()
+
+def checkpoint():
+    """Stop the background job running on this thread if it was cancelled; a no-op elsewhere.
+
+    Long loops call this between chunks, so a superseded job stops within
+    one chunk instead of running to the end.
+    """
+    job = getattr(_job_context, 'job', None)
+    if job is not None and job.cancel_requested.is_set():
+        raise JobCancelled(job.name)
+
+class Job:
+    """One submitted computation: its future, timing and cancellation flag"""
+
+    def __init__(self, name, key):
+        self.name = name
+        self.key = key
+        self.slots = set()
+        self.cancel_requested = threading.Event()
+        self.future = None
+        self.seconds = None
+
+    def done(self):
+        return self.future.done()
+
+    def wait(self, timeout=JOB_WAIT_SECONDS):
+        """Block for at most timeout seconds; return whether the job has finished"""
+        return bool(wait([self.future], timeout=timeout).done)
+
+    def result(self):
+        return self.future.result()
+
+    @property
+    def state(self):
+        if self.cancel_requested.is_set():
+            return 'cancelled'
+        if not self.future.done():
+            return 'running' if self.future.running() else 'queued'
+        return 'failed' if self.future.exception() is not None else 'done'
+
+class JobManager:
+    """Runs heavy stages on a thread pool, one job per key.
+
+    A key names the dataset version and every parameter of the
+    computation, so submitting the same key again returns the running or
+    finished job instead of starting another; the last JOB_MAX_RESULTS
+    finished jobs are kept. A slot is what a caller is currently waiting
+    for (e.g. one session's profile): when a slot moves on to a different
+    key, the job it was waiting for is cancelled unless another slot still
+    waits for it. Cancellation drops queued jobs and stops running ones at
+    their next checkpoint().
+
+    Slots are (owner, name) tuples. With is_active, a callable telling
+    whether an owner (e.g. a browser session) is still around, the slots
+    of owners that went away are released once their jobs finish, so
+    results nobody can ask for again count against max_results.
+
+    Each job is timed as stage 'job.<name>' on its own Instrumentation,
+    which appends to log_path like the page's stages.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, max_results=JOB_MAX_RESULTS, is_active=None):
+        self.max_results = max_results
+        self.is_active = is_active
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analyzer-job')
+        self._jobs = OrderedDict()
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def submit(self, slot, name, key, func, *args, log_path=None, **context):
+        """The job for key, started with func(*args) unless it is already running or finished"""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or job.state == 'failed':
+                job = Job(name, key)
+                job.future = self._pool.submit(self._run, job, func, args, log_path, context)
+                self._jobs[key] = job
+            self._jobs.move_to_end(key)
+            self._assign(slot, job)
+            self._evict()
+        return job
+
+    def get(self, key):
+        """The job submitted for key, if it is still known"""
+        with self._lock:
+            return self._jobs.get(key)
+
+    def release(self, slot):
+        """Stop waiting on slot, cancelling its job if nothing else waits for it"""
+        with self._lock:
+            self._assign(slot, None)
+
+    def slot_jobs(self, owner):
+        """(slot name, job) for every slot of an owner, slots being (owner, name) tuples"""
+        with self._lock:
+            return [(slot[1], job) for slot, job in self._slots.items() if slot[0] == owner]
+
+    def _assign(self, slot, job):
+        previous = self._slots.pop(slot, None)
+        if job is not None:
+            self._slots[slot] = job
+            job.slots.add(slot)
+        if previous is None or previous is job:
+            return
+        previous.slots.discard(slot)
+        if not previous.slots and not previous.done():
+            previous.cancel_requested.set()
+            previous.future.cancel()
+            if self._jobs.get(previous.key) is previous:
+                del self._jobs[previous.key]
+
+    def _evict(self):
+        if self.is_active is not None:
+            # Running jobs of a departed owner finish first, so a brief disconnect cancels nothing
+            departed = [slot for slot, job in self._slots.items() if job.done() and not self.is_active(slot[0])]
+            for slot in departed:
+                self._assign(slot, None)
+        finished = [key for key, job in self._jobs.items() if job.done() and not job.slots]
+        for key in finished[:max(len(self._jobs) - self.max_results, 0)]:
+            del self._jobs[key]
+
+    @staticmethod
+    def _run(job, func, args, log_path, context):
+        if job.cancel_requested.is_set():
+            raise JobCancelled(job.name)
+        instrument = Instrumentation(log_path=log_path, **context)
+        _job_context.job = job
+        try:
+            with instrument.stage(f'job.{job.name}'):
+                return func(*args)
+        finally:
+            _job_context.job = None
+            job.seconds = instrument.records[0]['seconds']
+
+# Parse cache settings
+PARSE_CACHE_MAX_ENTRIES = 8
+PARSE_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB of parsed DataFrames
+DISK_CACHE_ENV = 'EXCEL_ANALYZER_CACHE_DIR'
+DISK_CACHE_DIR = Path(os.environ.get(DISK_CACHE_ENV) or Path(tempfile.gettempdir()) / 'excel-analyzer-cache')
+DISK_CACHE_MAX_BYTES = 10 * 1024 * 1024 * 1024  # 10 GB of Arrow files
+
+class ParseCache:
+    """Thread-safe LRU cache of parsed DataFrames with a memory budget.
+
+    Entries are keyed on a digest of the uploaded bytes plus the parse options.
+    The least recently used entries are evicted once either the entry count or
+    the total in-memory size of the cached frames exceeds its limit. Cached
+    frames are shared between sessions and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=PARSE_CACHE_MAX_ENTRIES, max_bytes=PARSE_CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, df):
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            if nbytes > self.max_bytes:
+                # Too large to ever fit the budget - don't flush everything else for it
+                return
+            self._entries[key] = (df, nbytes)
+            self.total_bytes += nbytes
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+class DiskParseCache:
+    """LRU cache of parsed DataFrames stored as Arrow IPC files in a directory.
+
+    Survives restarts and is shared by every process using the directory,
+    so a workbook is parsed once and later loads convert the cached Arrow
+    columns back to pandas instead, which is far cheaper than parsing. The
+    conversion copies every column into memory, so a hit holds as much as
+    the parsed DataFrame. Files are named by a digest of the cache key and
+    written atomically; a hit touches the file's modification time, and the
+    least recently used files are deleted once the directory exceeds
+    max_bytes. DataFrames Arrow cannot represent, such as object columns
+    mixing numbers and text, are simply not cached. Needs pyarrow.
+    """
+
+    ATTRS_METADATA_KEY = b'excel_analyzer.attrs'
+
+    def __init__(self, directory=DISK_CACHE_DIR, max_bytes=DISK_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.enabled = importlib.util.find_spec('pyarrow') is not None
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, key):
+        return self.directory / f"{hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).hexdigest()}.arrow"
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        import pyarrow as pa
+
+        path = self.path(key)
+        try:
+            with pa.memory_map(str(path)) as source:
+                table = pa.ipc.open_file(source).read_all()
+                df = table.to_pandas()
+            os.utime(path)
+        except (FileNotFoundError, pa.ArrowInvalid):
+            self.misses += 1
+            return None
+        attrs = (table.schema.metadata or {}).get(self.ATTRS_METADATA_KEY)
+        if attrs:
+            df.attrs.update(json.loads(attrs))
+        self.hits += 1
+        return df
+
+    def put(self, key, df):
+        if not self.enabled:
+            return
+        import pyarrow as pa
+
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (ValueError, TypeError):
+            return
+        if df.attrs:
+            table = table.replace_schema_metadata({
+                **(table.schema.metadata or {}), self.ATTRS_METADATA_KEY: json.dumps(df.attrs).encode('utf-8')
+            })
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(key)
+        staging = path.with_name(f'{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            with pa.OSFile(str(staging), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(staging, path)
+        finally:
+            staging.unlink(missing_ok=True)
+        self.evict()
+
+    def evict(self):
+        """Delete the least recently used files until the directory fits max_bytes"""
+        files = []
+        for path in self.directory.glob('*.arrow'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda f: f[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+_parse_cache = ParseCache()
+_disk_parse_cache = DiskParseCache()
+
+def get_parse_cache():
+    """Process-wide parse cache shared by all sessions"""
+    return _parse_cache
+
+def get_disk_parse_cache():
+    """On-disk parse cache shared by all processes using DISK_CACHE_DIR"""
+    return _disk_parse_cache
+
+def file_digest(data):
+    """Content digest of the uploaded bytes"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def projection_kwargs(options):
+    """read_csv/read_excel arguments for the column and row-range projection in options"""
+    skip_rows = options.get('skip_rows') or 0
+    return {
+        'usecols': list(options['columns']) if options.get('columns') else None,
+        'skiprows': range(1, skip_rows + 1) if skip_rows else None,
+        'nrows': options.get('n_rows') or None,
+    }
+
+def read_excel_pandas(data, options, engine=None):
+    """Read a sheet through pandas.read_excel with the given engine"""
+    return pd.read_excel(
+        BytesIO(data),
+        engine=engine,
+        sheet_name=options.get('sheet') or 0,
+        **projection_kwargs(options)
+    )
+
+def read_excel_calamine(data, options):
+    """Read a sheet with the Rust calamine parser (needs python-calamine)"""
+    return read_excel_pandas(data, options, engine='calamine')
+
+def unique_column_names(header):
+    """Column names for a header row, named and de-duplicated the way pandas does"""
+    names, seen = [], {}
+    for i, name in enumerate(header):
+        name = f'Unnamed: {i}' if name is None else name
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}.{seen[name]}'
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def read_excel_openpyxl_stream(data, options):
+    """Read a sheet with openpyxl in read-only mode, keeping only the projected cells"""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(BytesIO(data), read_only=True, data_only=True)
+    try:
+        sheet = workbook[options['sheet']] if options.get('sheet') else workbook.worksheets[0]
+        skip_rows = options.get('skip_rows') or 0
+        n_rows = options.get('n_rows') or None
+        rows = sheet.iter_rows(
+            min_row=2 + skip_rows,
+            max_row=1 + skip_rows + n_rows if n_rows else None,
+            values_only=True
+        )
+        header = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        names = unique_column_names(header)
+        if options.get('columns'):
+            missing = [col for col in options['columns'] if col not in names]
+            if missing:
+                # Same error as pandas' readers give for an unknown usecols entry
+                raise ValueError(f"Usecols do not match columns, columns expected but not found: {missing} "
+                                 f"(sheet: {options.get('sheet') or 0})")
+            positions = sorted(names.index(col) for col in options['columns'])
+            names = [names[i] for i in positions]
+            records = [tuple(row[i] if i < len(row) else None for i in positions) for row in rows]
+        else:
+            records = [tuple(row) for row in rows]
+    finally:
+        workbook.close()
+
+    # Formatted but empty cells at the bottom of a sheet come back as all-None rows
+    while records and all(value is None for value in records[-1]):
+        records.pop()
+    return pd.DataFrame.from_records(records, columns=names).infer_objects()
+
+# Excel reader backends, in order of preference
+EXCEL_READERS = OrderedDict([
+    ('calamine', read_excel_calamine),
+    ('openpyxl-stream', read_excel_openpyxl_stream),
+    ('pandas', read_excel_pandas),
+])
+# pandas engine used to list sheets and read headers for each backend
+EXCEL_READER_ENGINES = {'calamine': 'calamine', 'openpyxl-stream': 'openpyxl', 'pandas': None}
+
+def available_excel_readers(filename):
+    """Reader backends usable for this file, fastest first"""
+    readers = list(EXCEL_READERS)
+    if importlib.util.find_spec('python_calamine') is None:
+        readers.remove('calamine')
+    if not filename.lower().endswith('.xlsx'):
+        # openpyxl only understands the Office Open XML format
+        readers.remove('openpyxl-stream')
+    return readers
+
+def list_sheets(data, engine):
+    """Sheet names of a workbook, without parsing any sheet data"""
+    with pd.ExcelFile(BytesIO(data), engine=EXCEL_READER_ENGINES[engine]) as workbook:
+        return workbook.sheet_names
+
+def read_header(data, options):
+    """Column names of the selected sheet or CSV, reading only the header row"""
+    if options['format'] == 'csv':
+        return pd.read_csv(BytesIO(data), nrows=0).columns.tolist()
+    return pd.read_excel(
+        BytesIO(data),
+        engine=EXCEL_READER_ENGINES[options['engine']],
+        sheet_name=options.get('sheet') or 0,
+        nrows=0
+    ).columns.tolist()
+
+def parse_upload(data, options):
+    """Parse raw upload bytes into a DataFrame according to the parse options"""
+    if options['format'] == 'csv':
+        df = pd.read_csv(BytesIO(data), **projection_kwargs(options))
+    else:
+        df = EXCEL_READERS[options.get('engine', 'pandas')](data, options)
+    if options.get('optimize_memory'):
+        df, report = optimize_dtypes(df)
+        # attrs must stay JSON-serializable (pandas writes them into Parquet metadata)
+        df.attrs['memory_report'] = report.to_dict('list')
+    return df
+
+# Memory optimization settings
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+def optimize_dtypes(df, arrow_strings=True):
+    """Return a compact copy of df and a per-column memory report.
+
+    Low-cardinality text columns become categoricals, integers are downcast
+    to the smallest type that holds their range, floats are downcast to
+    float32 only where that is lossless, and the remaining text columns use
+    Arrow-backed strings when pyarrow is available.
+    """
+    arrow_strings = arrow_strings and importlib.util.find_spec('pyarrow') is not None
+    before = df.memory_usage(deep=True, index=False)
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_integer_dtype(series.dtype) and not pd.api.types.is_extension_array_dtype(series.dtype):
+            series = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series.dtype) and series.dtype == np.float64:
+            compact = series.astype(np.float32)
+            if np.array_equal(compact.to_numpy(dtype=np.float64), series.to_numpy(), equal_nan=True):
+                series = compact
+        elif series.dtype == object:
+            n_unique = series.nunique()
+            if len(series) and n_unique / len(series) <= CATEGORY_MAX_UNIQUE_RATIO:
+                series = series.astype('category')
+            elif arrow_strings and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+                series = series.astype('string[pyarrow]')
+        columns[col] = series
+    optimized = pd.DataFrame(columns, index=df.index)
+    after = optimized.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        'Column': df.columns,
+        'Before Type': df.dtypes.astype(str).values,
+        'After Type': optimized.dtypes.astype(str).values,
+        'Before (bytes)': before.values,
+        'After (bytes)': after.values,
+    })
+    return optimized, report
+
+def dataset_cache_key(data, options):
+    """Cache key identifying a dataset: content digest plus parse options"""
+    return (file_digest(data),) + tuple(sorted(options.items()))
+
+def load_upload(data, options, key=None):
+    """Return (df, cache_key) for the upload, parsing only when neither the memory nor the disk cache has it"""
+    key = dataset_cache_key(data, options) if key is None else key
+    cache = get_parse_cache()
+    df = cache.get(key)
+    if df is None:
+        disk_cache = get_disk_parse_cache()
+        df = disk_cache.get(key)
+        if df is None:
+            df = parse_upload(data, options)
+            disk_cache.put(key, df)
+        cache.put(key, df)
+    return df, key
+
+def ingest_upload(data, options, key=None):
+    """Read an upload the way its options ask and return (df, profile, cache_key).
+
+    The duckdb and streaming paths build their profile while reading, so
+    df only holds a preview of the first rows; the pandas path returns the
+    full DataFrame and no profile.
+    """
+    key = dataset_cache_key(data, options) if key is None else key
+    if options.get('backend') == 'duckdb':
+        profile = out_of_core_profile(data, options, options.get('approximate', False))
+        return profile.preview, profile, key
+    if options.get('stream_chunk_rows'):
+        profile = stream_csv_profile(BytesIO(data), options['stream_chunk_rows'], options)
+        return profile.preview, profile, key
+    df, key = load_upload(data, options, key)
+    return df, None, key
+
+# Sketch settings
+KLL_K = 400
+KLL_BATCH_ROWS = 1 << 16
+HLL_PRECISION = 14
+
+def hash_values(values):
+    """64-bit hashes of a Series' values or a DataFrame's rows"""
+    return pd.util.hash_pandas_object(values, index=False, categorize=False).to_numpy()
+
+def value_keys(uniques):
+    """(type, value) pairs for distinct object values, hashed in their place.
+
+    hash_pandas_object hashes object values through str(), under which 1
+    and '1', or NaN and 'nan', collide. Tagging each value with its type
+    keeps them apart. Numbers share one tag, with integral floats written
+    as ints, so equal numbers of different types still match as they do
+    for DataFrame.duplicated. Missing values of any kind match each other.
+    """
+    uniques = pd.Series(uniques, dtype=object)
+    missing = uniques.isna().to_numpy()
+    if pd.api.types.infer_dtype(uniques, skipna=True) in ('string', 'empty'):
+        return pd.DataFrame({'type': np.where(missing, 'missing', 'str'), 'value': uniques.where(~missing, '')})
+    types, values = [], []
+    for value, is_missing in zip(uniques, missing):
+        if is_missing:
+            types.append('missing')
+            values.append('')
+        elif isinstance(value, (int, float, np.number, np.bool_)):
+            value = value.item() if isinstance(value, (np.number, np.bool_)) else value
+            types.append('number')
+            values.append(int(value) if isinstance(value, bool) or isinstance(value, float) and value.is_integer() else value)
+        else:
+            types.append(type(value).__name__)
+            values.append(value)
+    return pd.DataFrame({'type': types, 'value': pd.Series(values, dtype=object)})
+
+def numeric_hashes(column):
+    """64-bit hashes of a numeric column's values that depend on the value alone, not the dtype.
+
+    A chunk's integer column turns float when a single value is missing,
+    so integral values hash as int64 and other values as float64, and
+    missing values alike, whichever dtype a chunk was read with.
+    """
+    if pd.api.types.is_integer_dtype(column.dtype):
+        missing = column.isna().to_numpy()
+        hashes = hash_values(pd.Series(np.asarray(column.to_numpy(na_value=0)).astype(np.int64)))
+    else:
+        floats = column.to_numpy(dtype=np.float64, na_value=np.nan)
+        missing = np.isnan(floats)
+        with np.errstate(invalid='ignore'):
+            integral = np.isfinite(floats) & (np.floor(floats) == floats) & (np.abs(floats) < 2.0 ** 63)
+        if integral.all():
+            hashes = hash_values(pd.Series(floats.astype(np.int64)))
+        else:
+            hashes = hash_values(pd.Series(floats))
+            if integral.any():
+                hashes[integral] = hash_values(pd.Series(floats[integral].astype(np.int64)))
+    hashes[missing] = hash_values(pd.Series([np.nan]))[0]
+    return hashes
+
+def value_hashes(column):
+    """64-bit hashes of a column's values, equal for values that are equal.
+
+    The one hash behind row hashes and every distinct-count sketch, so
+    sketches of chunks or columns read with different dtypes merge. Text
+    columns are factorized first so each distinct value is hashed once,
+    tagged with its type (see value_keys). Numbers hash the same whatever
+    their dtype (see numeric_hashes).
+    """
+    if column.dtype == object or isinstance(column.dtype, pd.StringDtype):
+        codes, uniques = pd.factorize(column, use_na_sentinel=False)
+        return hash_values(value_keys(uniques))[codes]
+    if pd.api.types.is_numeric_dtype(column.dtype) and not pd.api.types.is_bool_dtype(column.dtype):
+        return numeric_hashes(column)
+    return hash_values(column)
+
+def hash_rows(df):
+    """64-bit hashes of a DataFrame's rows, equal for rows with equal values.
+
+    Each column is hashed with value_hashes, so rows of chunks read with
+    different dtypes still match. The column hashes are combined with the
+    tuple hash scheme pandas uses, in numpy without a second hashing pass.
+    """
+    combined = np.full(len(df), 0x345678, dtype=np.uint64)
+    multiplier = np.uint64(1000003)
+    for i in range(df.shape[1]):
+        hashes = value_hashes(df.iloc[:, i])
+        combined ^= hashes
+        combined *= multiplier
+        multiplier += np.uint64(82520 + 2 * (df.shape[1] - i))
+    combined += np.uint64(97531)
+    return combined
+
+class KLLSketch:
+    """Mergeable KLL quantile sketch.
+
+    Items are kept in compactors of decreasing capacity; an item at level h
+    stands for 2**h input values. The rank error of quantile() and rank() is
+    about 1.7 / k of the number of values seen, so roughly 0.5% for k=400.
+    """
+
+    def __init__(self, k=KLL_K, seed=None):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(8, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            if len(self.levels[level]) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(self.levels[level])
+                keep = items[:len(items) % 2]
+                items = items[len(items) % 2:]
+                # Every other item survives with doubled weight, starting at a random offset
+                promoted = items[self._rng.integers(2)::2]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self.levels[level] = keep
+            level += 1
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.n += len(values)
+        # Sorting bounded batches is cheaper than one sort of a whole in-memory column
+        for start in range(0, len(values), KLL_BATCH_ROWS):
+            self.levels[0] = np.concatenate([self.levels[0], values[start:start + KLL_BATCH_ROWS]])
+            self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self._compress()
+
+    def _cumulative(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2.0 ** level) for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q):
+        """Approximate quantile(s) for q in [0, 1]"""
+        q = np.asarray(q, dtype=np.float64)
+        if self.n == 0:
+            return np.full(q.shape, np.nan)
+        items, cumulative = self._cumulative()
+        idx = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return items[np.minimum(idx, len(items) - 1)]
+
+    def rank(self, x):
+        """Approximate number of values strictly below x"""
+        if self.n == 0:
+            return np.zeros(np.shape(x))
+        items, cumulative = self._cumulative()
+        idx = np.searchsorted(items, x, side='left')
+        return np.where(idx > 0, cumulative[np.maximum(idx - 1, 0)], 0.0) * (self.n / cumulative[-1])
+
+class HyperLogLog:
+    """Mergeable HyperLogLog distinct-count sketch over 64-bit hashes.
+
+    Uses 2**p one-byte registers; the relative standard error of count() is
+    1.04 / sqrt(2**p), about 0.8% for p=14.
+    """
+
+    def __init__(self, p=HLL_PRECISION):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes) == 0:
+            return
+        idx = (hashes >> np.uint64(64 - self.p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # Position of the leftmost 1-bit in the remaining 64-p bits (bit length via the float exponent)
+        bit_length = np.frexp(rest.astype(np.float64))[1]
+        rho = (64 - self.p - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rho)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * self.m and zeros:
+            # Small-range correction: linear counting
+            estimate = self.m * np.log(self.m / zeros)
+        return int(round(estimate))
+
+def sorted_unique(values):
+    """np.unique for integer arrays via a plain sort, much faster than the hash-based path on 64-bit hashes"""
+    values = np.sort(values)
+    return values[np.r_[True, values[1:] != values[:-1]]] if len(values) else values
+
+class RowHashSet:
+    """Exact set of 64-bit row hashes kept as sorted runs that merge like a binary counter.
+
+    Costs 8 bytes per distinct row, which is what duplicate detection needs
+    when the rows themselves are streamed and discarded.
+    """
+
+    def __init__(self):
+        self._runs = []
+
+    def _contains(self, hashes):
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self._runs:
+            idx = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            found |= run[idx] == hashes
+        return found
+
+    def add(self, hashes):
+        """Add hashes and return how many of them were already present"""
+        unique = sorted_unique(hashes)
+        new = unique[~self._contains(unique)]
+        if len(new):
+            self._runs.append(new)
+            while len(self._runs) > 1 and len(self._runs[-2]) <= len(self._runs[-1]):
+                last = self._runs.pop()
+                self._runs[-1] = sorted_unique(np.concatenate([self._runs[-1], last]))
+        return len(hashes) - len(new)
+
+    def merge(self, other):
+        if not other._runs:
+            return 0
+        return self.add(np.concatenate(other._runs))
+
+    def __len__(self):
+        return sum(len(run) for run in self._runs)
+
+# Duplicate detection settings
+TOP_DUPLICATE_GROUPS = 100
+DUPLICATE_GROUP_ROWS = 1000
+
+def normalized_text(values):
+    """Text lowercased, with runs of punctuation and whitespace collapsed, as a categorical.
+
+    Only the distinct values are normalized, so the cost grows with the
+    column's cardinality rather than its length.
+    """
+    codes, uniques = pd.factorize(values)
+    normalized = pd.Series(uniques, dtype=object).astype(str).str.lower()
+    normalized = normalized.str.replace(r'[\W_]+', ' ', regex=True).str.strip()
+    normalized_codes, categories = pd.factorize(normalized)
+    return pd.Categorical.from_codes(np.where(codes >= 0, normalized_codes[codes], -1), categories=categories)
+
+class DuplicateIndex:
+    """Duplicate rows of a dataset, grouped by a 64-bit hash of the key columns.
+
+    Rows are hashed once with hash_rows and the hashes factorized, which
+    leaves one group id per row in order of first appearance. Counts,
+    the duplicate mask and the rows of any group are read from those ids
+    without comparing rows again. Distinct rows only collide with
+    probability of about n**2 / 2**65, under 3e-6 for ten million rows.
+
+    subset limits the key to some columns; normalize compares text columns
+    after normalized_text so rows differing only in case, spacing or
+    punctuation are reported as near-duplicates.
+    """
+
+    def __init__(self, df, subset=None, normalize=False):
+        self.subset = list(subset) if subset else list(df.columns)
+        self.normalize = normalize
+        self.n_rows = len(df)
+        keys = df[self.subset]
+        if normalize:
+            columns = {}
+            for i, dtype in enumerate(keys.dtypes):
+                column = keys.iloc[:, i]
+                is_text = dtype == object or isinstance(dtype, (pd.StringDtype, pd.CategoricalDtype))
+                columns[i] = normalized_text(column) if is_text else column
+            keys = pd.DataFrame(columns)
+        codes, uniques = pd.factorize(hash_rows(keys))
+        self.codes = codes.astype(np.int32) if len(uniques) < 2 ** 31 else codes
+        self.sizes = np.bincount(self.codes, minlength=len(uniques))
+        self.duplicate_count = self.n_rows - len(uniques)
+        self.group_ids = np.flatnonzero(self.sizes > 1)
+        self.group_count = len(self.group_ids)
+
+    def duplicated(self):
+        """Boolean mask of rows repeating an earlier row, like DataFrame.duplicated()"""
+        if not self.n_rows:
+            return np.zeros(0, dtype=bool)
+        # Group ids are numbered in order of first appearance, so a row starts
+        # a group exactly when its id exceeds every id before it
+        seen = np.maximum.accumulate(self.codes)
+        return np.r_[False, self.codes[1:] <= seen[:-1]]
+
+    def groups(self, top=TOP_DUPLICATE_GROUPS):
+        """The largest duplicate groups: group id, row count and first row position"""
+        order = np.argsort(-self.sizes[self.group_ids], kind='stable')[:top]
+        ids = self.group_ids[order]
+        first_rows = np.flatnonzero(~self.duplicated())
+        return pd.DataFrame({'group': ids, 'size': self.sizes[ids], 'first_row': first_rows[ids]})
+
+    def group_rows(self, group, limit=DUPLICATE_GROUP_ROWS):
+        """Positions of the rows in a group"""
+        return np.flatnonzero(self.codes == group)[:limit]
+
+# Column-parallel profiling settings
+COLUMN_EXECUTORS = ['serial', 'thread', 'process']
+COLUMN_WORKERS = os.cpu_count() or 1
+NUMERIC_STATS = ['q1', 'median', 'q3', 'mean', 'std', 'skew', 'kurtosis', 'min', 'max', 'outliers']
+
+_column_pools = {}
+_column_pools_lock = threading.Lock()
+
+def get_column_pool(executor, workers=None):
+    """Long-lived thread or process pool for per-column work, created on first use"""
+    workers = workers or COLUMN_WORKERS
+    with _column_pools_lock:
+        pool = _column_pools.get((executor, workers))
+        if pool is None:
+            if executor == 'process':
+                # spawn rather than fork: the app process runs server threads
+                pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+            else:
+                pool = ThreadPoolExecutor(workers, thread_name_prefix='column-stats')
+            _column_pools[(executor, workers)] = pool
+        return pool
+
+def text_column_stats(series, approximate):
+    """Null and unique counts of a non-numeric column"""
+    stats = {'nulls': int(series.isna().sum())}
+    if approximate:
+        stats['distinct_sketch'] = HyperLogLog()
+        stats['distinct_sketch'].update(value_hashes(series.dropna()))
+        stats['unique'] = min(stats['distinct_sketch'].count(), len(series) - stats['nulls'])
+    else:
+        stats['unique'] = series.nunique()
+    return stats
+
+def numeric_column_stats(values, approximate):
+    """Statistics of one numeric column, given as float64 values with NaN for missing ones"""
+    series = pd.Series(values, copy=False)
+    valid = values[~np.isnan(values)]
+    stats = {'nulls': len(values) - len(valid)}
+    if approximate:
+        stats['distinct_sketch'] = HyperLogLog()
+        stats['distinct_sketch'].update(value_hashes(pd.Series(valid)))
+        stats['unique'] = min(stats['distinct_sketch'].count(), len(valid))
+        stats['quantile_sketch'] = KLLSketch(seed=0)
+        stats['quantile_sketch'].update(valid)
+        stats['q1'], stats['median'], stats['q3'] = stats['quantile_sketch'].quantile([0.25, 0.5, 0.75])
+    else:
+        stats['unique'] = series.nunique()
+        stats['q1'], stats['median'], stats['q3'] = np.quantile(valid, [0.25, 0.5, 0.75]) if len(valid) else [np.nan] * 3
+    iqr = stats['q3'] - stats['q1']
+    stats['outliers'] = int(((values < stats['q1'] - 1.5 * iqr) | (values > stats['q3'] + 1.5 * iqr)).sum())
+    stats['mean'] = series.mean()
+    stats['std'] = series.std()
+    stats['skew'] = series.skew()
+    stats['kurtosis'] = series.kurtosis()
+    stats['min'] = valid.min() if len(valid) else np.nan
+    stats['max'] = valid.max() if len(valid) else np.nan
+    return stats
+
+def shared_numeric_column_stats(name, shape, index, approximate):
+    """numeric_column_stats for one column of a float64 matrix in shared memory (process workers)"""
+    # Spawned workers share the parent's resource tracker, so attaching here
+    # does not hand ownership of the block to the worker
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=block.buf, order='F')
+        stats = numeric_column_stats(matrix[:, index], approximate)
+        # No views into the block may outlive it
+        del matrix
+        return stats
+    finally:
+        block.close()
+
+def column_statistics(df, numeric_cols, approximate=False, executor='serial', workers=None):
+    """Per-column statistics of df, one dict per column in column order.
+
+    Every column is an independent task. executor='thread' runs them on a
+    thread pool; executor='process' copies the numeric columns once into a
+    shared-memory float64 matrix that process workers read in place, while
+    the text columns, which would have to be pickled, stay on threads.
+    Each task computes exactly what the serial path does, so the results
+    are identical in every mode.
+    """
+    numeric_set = {i for i, col in enumerate(df.columns) if col in set(numeric_cols)}
+    numeric_positions = sorted(numeric_set)
+    positions = range(df.shape[1])
+    def numeric_values(i):
+        return df.iloc[:, i].to_numpy(dtype=np.float64, na_value=np.nan)
+    def task(i):
+        checkpoint()
+        if i in numeric_set:
+            return numeric_column_stats(numeric_values(i), approximate)
+        return text_column_stats(df.iloc[:, i], approximate)
+
+    if executor == 'serial':
+        return [task(i) for i in positions]
+    threads = get_column_pool('thread', workers)
+    if executor == 'thread' or not numeric_positions or not len(df):
+        return list(threads.map(task, positions))
+
+    shape = (len(df), len(numeric_positions))
+    block = shared_memory.SharedMemory(create=True, size=shape[0] * shape[1] * 8)
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=block.buf, order='F')
+        for j, i in enumerate(numeric_positions):
+            matrix[:, j] = numeric_values(i)
+        del matrix
+        processes = get_column_pool('process', workers)
+        futures = {i: processes.submit(shared_numeric_column_stats, block.name, shape, j, approximate)
+                   for j, i in enumerate(numeric_positions)}
+        futures.update({i: threads.submit(text_column_stats, df.iloc[:, i], approximate)
+                        for i in positions if i not in numeric_set})
+        return [futures[i].result() for i in positions]
+    finally:
+        block.close()
+        block.unlink()
+
+class DatasetProfile:
+    """Column statistics for a dataset, computed once in vectorized passes.
+
+    The recommendation rules and the Overview, Quality and Advanced tabs all
+    read from this object instead of rescanning the DataFrame.
+
+    With approximate=True, quartiles come from per-column KLL sketches (rank
+    error about 1.7 / KLL_K of the non-null count) and unique counts from
+    HyperLogLog sketches (relative standard error 1.04 / sqrt(2**HLL_PRECISION)).
+    The sketches are kept on the profile so they are reused, not rebuilt,
+    when another column is selected.
+
+    executor='thread' or 'process' computes the per-column statistics on a
+    pool of workers (see column_statistics); the results are identical to
+    executor='serial'.
+    """
+
+    streaming = False
+    out_of_core = False
+    sampled = False
+    union = False
+
+    def __init__(self, df, approximate=False, executor='serial', workers=None):
+        self.approximate = approximate
+        self.n_rows = len(df)
+        self.n_cols = len(df.columns)
+        self.total_cells = self.n_rows * self.n_cols
+        self.dtypes = df.dtypes
+        self.numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        self.categorical_cols = df.select_dtypes(include=['object', 'category', 'string']).columns.tolist()
+
+        # Per-column statistics, optionally spread over a worker pool
+        columns = column_statistics(df, self.numeric_cols, approximate, executor, workers)
+        stats = pd.DataFrame(columns, index=df.columns)
+        self.null_counts = stats['nulls'].astype(np.int64)
+        self.non_null_counts = self.n_rows - self.null_counts
+        self.missing_total = int(self.null_counts.sum())
+        self.completeness = (1 - self.missing_total / self.total_cells) * 100 if self.total_cells else 100.0
+        self.unique_counts = stats['unique'].astype(np.int64)
+        self.duplicates = DuplicateIndex(df)
+        self.duplicate_count = self.duplicates.duplicate_count
+        self.duplicate_percent = (self.duplicate_count / self.n_rows) * 100 if self.n_rows else 0.0
+        if approximate:
+            self.distinct_sketches = dict(zip(df.columns, stats['distinct_sketch']))
+            self.quantile_sketches = {col: columns[i]['quantile_sketch'] for i, col in enumerate(df.columns)
+                                      if col in self.numeric_cols}
+
+        # Numeric distribution statistics
+        numeric = stats.loc[self.numeric_cols].reindex(columns=NUMERIC_STATS).astype(np.float64)
+        self.q1 = numeric['q1']
+        self.median = numeric['median']
+        self.q3 = numeric['q3']
+        iqr = self.q3 - self.q1
+        self.lower_fence = self.q1 - 1.5 * iqr
+        self.upper_fence = self.q3 + 1.5 * iqr
+        self.outlier_counts = numeric['outliers'].astype(np.int64)
+        self.mean = numeric['mean']
+        self.std = numeric['std']
+        self.skew = numeric['skew']
+        self.kurtosis = numeric['kurtosis']
+        if self.numeric_cols:
+            self.describe = self.numeric_describe(numeric['min'], numeric['max'])
+        else:
+            self.describe = df.describe()
+
+    def numeric_describe(self, minimums, maximums):
+        """describe()-shaped table assembled from the already computed column statistics"""
+        return pd.DataFrame({
+            'count': self.non_null_counts[self.numeric_cols].astype(np.float64),
+            'mean': self.mean,
+            'std': self.std,
+            'min': minimums,
+            '25%': self.q1,
+            '50%': self.median,
+            '75%': self.q3,
+            'max': maximums,
+        }).T
+
+    @property
+    def column_info(self):
+        return pd.DataFrame({
+            'Column Name': self.dtypes.index,
+            'Data Type': self.dtypes.values,
+            'Non-Null Count': self.non_null_counts.values,
+            'Null Count': self.null_counts.values,
+            'Unique Values (approx.)' if self.approximate else 'Unique Values': self.unique_counts.values
+        })
+
+    def column_stats(self, col):
+        return {
+            'Mean': self.mean[col],
+            'Median': self.median[col],
+            'Std Dev': self.std[col],
+            'Skewness': self.skew[col],
+            'Kurtosis': self.kurtosis[col]
+        }
+
+# Streaming ingestion settings
+STREAM_CHUNK_ROWS = 100_000
+STREAM_PREVIEW_ROWS = 100
+
+class ColumnAccumulator:
+    """Mergeable statistics for one column: nulls, moments, min/max and sketches"""
+
+    def __init__(self, numeric):
+        self.numeric = numeric
+        self.count = 0
+        self.nulls = 0
+        self.mean = 0.0
+        self.m2 = self.m3 = self.m4 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.quantiles = KLLSketch() if numeric else None
+        self.distinct = HyperLogLog()
+
+    def _merge_moments(self, n, mean, m2, m3, m4):
+        """Combine central moment sums (Welford/Pebay update for arbitrary batch sizes)"""
+        na, nb = self.count, n
+        if nb == 0:
+            return
+        if na == 0:
+            self.count, self.mean, self.m2, self.m3, self.m4 = n, mean, m2, m3, m4
+            return
+        total = na + nb
+        delta = mean - self.mean
+        self.m4 = (self.m4 + m4
+                   + delta ** 4 * na * nb * (na * na - na * nb + nb * nb) / total ** 3
+                   + 6 * delta ** 2 * (na * na * m2 + nb * nb * self.m2) / total ** 2
+                   + 4 * delta * (na * m3 - nb * self.m3) / total)
+        self.m3 = (self.m3 + m3
+                   + delta ** 3 * na * nb * (na - nb) / total ** 2
+                   + 3 * delta * (na * m2 - nb * self.m2) / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * na * nb / total
+        self.mean = self.mean + delta * nb / total
+        self.count = total
+
+    def drop_numeric(self):
+        """Stop tracking numeric statistics once the column turns out to hold text"""
+        self.numeric = False
+        self.mean = 0.0
+        self.m2 = self.m3 = self.m4 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.quantiles = None
+
+    def update(self, series):
+        valid = series.dropna()
+        self.nulls += len(series) - len(valid)
+        self.distinct.update(value_hashes(valid))
+        if not self.numeric:
+            self.count += len(valid)
+            return
+        x = valid.to_numpy(dtype=np.float64)
+        if len(x) == 0:
+            return
+        mean = x.mean()
+        d = x - mean
+        d2 = d * d
+        self._merge_moments(len(x), mean, d2.sum(), (d2 * d).sum(), (d2 * d2).sum())
+        self.min = min(self.min, x.min())
+        self.max = max(self.max, x.max())
+        self.quantiles.update(x)
+
+    def merge(self, other):
+        if self.numeric and not other.numeric:
+            self.drop_numeric()
+        self.nulls += other.nulls
+        self.distinct.merge(other.distinct)
+        if not self.numeric:
+            self.count += other.count
+            return
+        self._merge_moments(other.count, other.mean, other.m2, other.m3, other.m4)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.quantiles.merge(other.quantiles)
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    @property
+    def skew(self):
+        # Adjusted Fisher-Pearson coefficient, as returned by pandas
+        n = self.count
+        if n < 3:
+            return np.nan
+        if self.m2 == 0:
+            return 0.0
+        g1 = (self.m3 / n) / (self.m2 / n) ** 1.5
+        return np.sqrt(n * (n - 1)) / (n - 2) * g1
+
+    @property
+    def kurtosis(self):
+        # Excess kurtosis with the same bias correction as pandas
+        n = self.count
+        if n < 4:
+            return np.nan
+        if self.m2 == 0:
+            return 0.0
+        g2 = (self.m4 / n) / (self.m2 / n) ** 2 - 3
+        return ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3))
+
+class StreamingProfile(DatasetProfile):
+    """Dataset profile folded chunk by chunk, so memory is bounded by the chunk size.
+
+    Exposes the same attributes as DatasetProfile. Quantiles, unique counts
+    and outlier counts are estimated from the column sketches; exact
+    duplicate detection keeps one 64-bit hash per distinct row. Profiles of
+    different parts of a file can be combined with merge().
+    """
+
+    streaming = True
+    approximate = True
+
+    def __init__(self):
+        self.n_rows = 0
+        self.duplicate_count = 0
+        self.preview = None
+        self.accumulators = OrderedDict()
+        self._dtypes = OrderedDict()
+        self._row_hashes = RowHashSet()
+
+    def update(self, chunk, row_hashes=None):
+        """Fold in a chunk of rows; row_hashes may pass hash_rows(chunk) when already computed"""
+        if self.preview is None:
+            self.preview = chunk.head(STREAM_PREVIEW_ROWS).copy()
+        numeric = set(chunk.select_dtypes(include=[np.number]).columns)
+        for col in chunk.columns:
+            acc = self.accumulators.get(col)
+            if acc is None:
+                acc = self.accumulators[col] = ColumnAccumulator(col in numeric)
+                self._dtypes[col] = chunk[col].dtype
+            elif acc.numeric and col not in numeric:
+                acc.drop_numeric()
+                self._dtypes[col] = np.dtype(object)
+            elif acc.numeric and chunk[col].dtype != self._dtypes[col]:
+                self._dtypes[col] = np.dtype(np.float64)
+            acc.update(chunk[col])
+        self.duplicate_count += self._row_hashes.add(hash_rows(chunk) if row_hashes is None else row_hashes)
+        self.n_rows += len(chunk)
+
+    def merge(self, other):
+        """Fold in the state of another profile, which is left unchanged"""
+        self._fold(other)
+        self.finalize()
+
+    def _fold(self, other):
+        if self.preview is None:
+            self.preview = other.preview
+        for col, other_acc in other.accumulators.items():
+            acc = self.accumulators.get(col)
+            if acc is None:
+                self.accumulators[col] = copy.deepcopy(other_acc)
+                self._dtypes[col] = other._dtypes[col]
+                continue
+            acc.merge(other_acc)
+            if not acc.numeric and other._dtypes[col] != self._dtypes[col]:
+                self._dtypes[col] = np.dtype(object)
+            elif other._dtypes[col] != self._dtypes[col]:
+                self._dtypes[col] = np.dtype(np.float64)
+        self.duplicate_count += other.duplicate_count + self._row_hashes.merge(other._row_hashes)
+        self.n_rows += other.n_rows
+
+    def finalize(self):
+        """Derive the DatasetProfile attributes from the accumulated state"""
+        accs = self.accumulators
+        self.n_cols = len(accs)
+        self.total_cells = self.n_rows * self.n_cols
+        self.dtypes = pd.Series(self._dtypes, dtype=object)
+        self.numeric_cols = [col for col, acc in accs.items() if acc.numeric]
+        self.categorical_cols = [col for col, dtype in self._dtypes.items()
+                                 if dtype == object or isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype))]
+
+        self.null_counts = pd.Series({col: acc.nulls for col, acc in accs.items()}, dtype=np.int64)
+        self.non_null_counts = self.n_rows - self.null_counts
+        self.missing_total = int(self.null_counts.sum())
+        self.completeness = (1 - self.missing_total / self.total_cells) * 100 if self.total_cells else 100.0
+        self.distinct_sketches = {col: acc.distinct for col, acc in accs.items()}
+        self.unique_counts = pd.Series({col: min(acc.distinct.count(), acc.count) for col, acc in accs.items()}, dtype=np.int64)
+        self.duplicate_percent = (self.duplicate_count / self.n_rows) * 100 if self.n_rows else 0.0
+
+        numeric = [accs[col] for col in self.numeric_cols]
+        self.quantile_sketches = {col: accs[col].quantiles for col in self.numeric_cols}
+        def series(values):
+            return pd.Series(values, index=self.numeric_cols, dtype=np.float64)
+        quantiles = np.array([acc.quantiles.quantile([0.25, 0.5, 0.75]) for acc in numeric]).reshape(-1, 3)
+        self.q1 = series(quantiles[:, 0])
+        self.median = series(quantiles[:, 1])
+        self.q3 = series(quantiles[:, 2])
+        iqr = self.q3 - self.q1
+        self.lower_fence = self.q1 - 1.5 * iqr
+        self.upper_fence = self.q3 + 1.5 * iqr
+        self.outlier_counts = pd.Series([
+            int(round(acc.quantiles.rank(low) + acc.count - acc.quantiles.rank(np.nextafter(high, np.inf))))
+            for acc, low, high in zip(numeric, self.lower_fence, self.upper_fence)
+        ], index=self.numeric_cols, dtype=np.int64)
+        self.mean = series([acc.mean if acc.count else np.nan for acc in numeric])
+        self.std = series([acc.std for acc in numeric])
+        self.skew = series([acc.skew for acc in numeric])
+        self.kurtosis = series([acc.kurtosis for acc in numeric])
+        if self.numeric_cols:
+            self.describe = self.numeric_describe(
+                series([acc.min if acc.count else np.nan for acc in numeric]),
+                series([acc.max if acc.count else np.nan for acc in numeric])
+            )
+        else:
+            self.describe = pd.DataFrame({'count': self.non_null_counts, 'unique': self.unique_counts}).T
+        return self
+
+def stream_csv_profile(fileobj, chunk_rows=STREAM_CHUNK_ROWS, options=None):
+    """Profile a CSV by folding it in chunks of chunk_rows rows.
+
+    With options['sample_rows'], a row sample (stratified by
+    options['stratify'] when given) is drawn in the same pass.
+    """
+    options = options or {}
+    if options.get('sample_rows'):
+        profile = SampledProfile(options['sample_rows'], options.get('stratify'))
+    else:
+        profile = StreamingProfile()
+    for chunk in pd.read_csv(fileobj, chunksize=chunk_rows, **projection_kwargs(options)):
+        checkpoint()
+        profile.update(chunk)
+    return profile.finalize()
+
+# Incremental profiling settings
+INCREMENTAL_CHUNK_ROWS = 50_000
+INCREMENTAL_CACHE_MAX_CHUNKS = 256
+
+class IncrementalProfile(StreamingProfile):
+    """StreamingProfile of an in-memory DataFrame, assembled from per-chunk states.
+
+    The rows are still at hand, so charts and exports read them as for a
+    DatasetProfile; the statistics carry the sketch error of a streamed
+    profile. reused_rows counts the rows whose chunk state came from an
+    earlier upload instead of being recomputed.
+    """
+
+    streaming = False
+
+    def __init__(self):
+        super().__init__()
+        self.reused_rows = 0
+
+class ChunkStateCache:
+    """Thread-safe LRU map from chunk digest to that chunk's unfinalized StreamingProfile.
+
+    A chunk's digest covers the column names and dtypes plus the 64-bit
+    hash of every row, so equal digests mean the same rows in the same
+    schema. Stored states are never mutated; profiles are assembled by
+    folding them into a fresh one.
+    """
+
+    def __init__(self, max_entries=INCREMENTAL_CACHE_MAX_CHUNKS):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest):
+        with self._lock:
+            state = self._entries.get(digest)
+            if state is not None:
+                self._entries.move_to_end(digest)
+            return state
+
+    def put(self, digest, state):
+        with self._lock:
+            self._entries[digest] = state
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+_chunk_state_cache = ChunkStateCache()
+
+def get_chunk_state_cache():
+    """Process-wide chunk state cache shared by all sessions"""
+    return _chunk_state_cache
+
+def incremental_profile(df, chunk_rows=INCREMENTAL_CHUNK_ROWS, cache=None):
+    """Profile df chunk by chunk, reusing the state of every chunk already profiled.
+
+    Chunks are fixed row ranges, so a re-upload with appended rows shares
+    all but its last chunks with the previous version, and an edit only
+    invalidates the chunk it falls in. Only the remaining chunks are
+    profiled; all chunk states are then merged and the result finalized,
+    so the recommendations are evaluated on the merged state.
+    """
+    cache = get_chunk_state_cache() if cache is None else cache
+    signature = repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode('utf-8')
+    profile = IncrementalProfile()
+    for start in range(0, len(df), chunk_rows):
+        checkpoint()
+        chunk = df.iloc[start:start + chunk_rows]
+        row_hashes = hash_rows(chunk)
+        digest = hashlib.blake2b(signature + row_hashes.tobytes(), digest_size=16).hexdigest()
+        state = cache.get(digest)
+        if state is None:
+            state = StreamingProfile()
+            state.update(chunk, row_hashes)
+            cache.put(digest, state)
+        else:
+            profile.reused_rows += len(chunk)
+        profile._fold(state)
+    if profile.preview is None:
+        profile.preview = df.head(STREAM_PREVIEW_ROWS)
+    return profile.finalize()
+
+def build_profile(df, approximate=False, executor='serial'):
+    """Exact DatasetProfile of df, or with approximate=True an incremental_profile.
+
+    Approximate profiles are assembled from per-chunk states, so a re-upload
+    with appended or edited rows only profiles the chunks that changed.
+    """
+    if approximate:
+        return incremental_profile(df)
+    return DatasetProfile(df, executor=executor)
+
+# Chart aggregation settings
+HISTOGRAM_BINS = 30
+BOX_OUTLIER_SAMPLE = 500
+TOP_CATEGORIES = 10
+CORRELATION_BLOCK_ROWS = 65_536
+CORRELATION_SAMPLE_ROWS = 200_000
+CORRELATION_HEATMAP_MAX = 40
+TOP_CORRELATION_PAIRS = 20
+
+def histogram_counts(values, nbins=HISTOGRAM_BINS):
+    """Bin edges and counts for the non-null values of a numeric column"""
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return np.zeros(nbins + 1), np.zeros(nbins, dtype=np.int64)
+    counts, edges = np.histogram(values, bins=nbins)
+    return edges, counts
+
+def sketch_histogram(sketch, low, high, nbins=HISTOGRAM_BINS):
+    """Approximate bin edges and counts read off a KLL sketch's rank function"""
+    if sketch.n == 0 or not np.isfinite(low):
+        return np.zeros(nbins + 1), np.zeros(nbins, dtype=np.int64)
+    edges = np.linspace(low, high, nbins + 1)
+    ranks = sketch.rank(np.append(edges[:-1], np.nextafter(high, np.inf)))
+    return edges, np.round(np.diff(ranks)).astype(np.int64)
+
+def column_histogram(df, profile, col, nbins=HISTOGRAM_BINS):
+    """Histogram bins for a numeric column, read off its sketch when the rows were streamed.
+
+    For a sampled profile the counts are population estimates, followed by
+    a third array of confidence half-widths.
+    """
+    if profile.out_of_core or profile.sampled or profile.union:
+        return profile.histogram(col, nbins)
+    if profile.streaming:
+        sketch = profile.quantile_sketches[col]
+        return sketch_histogram(sketch, profile.describe.loc['min', col], profile.describe.loc['max', col], nbins)
+    return histogram_counts(df[col].to_numpy(dtype=np.float64, na_value=np.nan), nbins)
+
+def box_summary(df, profile, col):
+    """Five-number summary plus a bounded sample of outliers for a numeric column"""
+    if profile.out_of_core or profile.sampled or profile.union:
+        return profile.box_summary(col)
+    summary = {
+        'q1': profile.q1[col],
+        'median': profile.median[col],
+        'q3': profile.q3[col],
+        'mean': profile.mean[col],
+    }
+    if profile.streaming:
+        # Raw rows are gone; whiskers are clipped to the observed range and outliers are not shown
+        summary['lowerfence'] = max(profile.lower_fence[col], profile.describe.loc['min', col])
+        summary['upperfence'] = min(profile.upper_fence[col], profile.describe.loc['max', col])
+        summary['outliers'] = np.empty(0)
+        return summary
+    values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    values = values[~np.isnan(values)]
+    inside = (values >= profile.lower_fence[col]) & (values <= profile.upper_fence[col])
+    summary['lowerfence'] = values[inside].min() if inside.any() else summary['q1']
+    summary['upperfence'] = values[inside].max() if inside.any() else summary['q3']
+    outliers = values[~inside]
+    if len(outliers) > BOX_OUTLIER_SAMPLE:
+        outliers = np.random.default_rng(0).choice(outliers, BOX_OUTLIER_SAMPLE, replace=False)
+    summary['outliers'] = outliers
+    return summary
+
+def value_counts(df, profile, col, top=TOP_CATEGORIES):
+    """Most frequent values of a column; estimated counts with a margin column for a sampled profile"""
+    if profile.out_of_core or profile.sampled or profile.union:
+        return profile.value_counts(col, top)
+    return df[col].value_counts().head(top)
+
+def correlation_sums(df, cols, means, rows=None, weights=None, block_rows=CORRELATION_BLOCK_ROWS):
+    """Pair counts, sums, sums of squares and cross products of cols, accumulated over row blocks.
+
+    Values are shifted by means first. The result is a (4, k, k) array;
+    sums over different row sets with the same means simply add up.
+    """
+    k = len(cols)
+    columns = [df[col] for col in cols]
+    n_rows = len(df) if rows is None else len(rows)
+    weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+    count, sums, squares, products = np.zeros((4, k, k))
+    for start in range(0, n_rows, block_rows):
+        checkpoint()
+        block_index = slice(start, start + block_rows) if rows is None else rows[start:start + block_rows]
+        # Column by column, so only this block of rows is copied
+        block = np.column_stack([column.iloc[block_index].to_numpy(dtype=np.float64, na_value=np.nan)
+                                 for column in columns])
+        present = ~np.isnan(block)
+        mask = present.astype(np.float64)
+        values = np.where(present, block - means, 0.0)
+        block_weights = 1.0 if weights is None else weights[block_index, None]
+        weighted = mask * block_weights
+        count += mask.T @ weighted
+        # sums[i, j] is the sum of column i over the rows where column j is also present
+        sums += values.T @ weighted
+        squares += (values * values).T @ weighted
+        products += values.T @ (values * block_weights)
+    return np.stack([count, sums, squares, products])
+
+def correlation_from_sums(accumulated, cols):
+    """Correlation matrix from the output of correlation_sums"""
+    count, sums, squares, products = accumulated
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = count * products - sums * sums.T
+        variance = count * squares - sums * sums
+        corr = covariance / np.sqrt(variance * variance.T)
+    corr[(count < 2) | ~np.isfinite(corr)] = np.nan
+    corr = np.clip(corr, -1.0, 1.0)
+    return pd.DataFrame(corr, index=cols, columns=cols)
+
+def blocked_correlation(df, cols, block_rows=CORRELATION_BLOCK_ROWS, sample_rows=None, seed=0, weights=None):
+    """Pairwise-complete Pearson correlation accumulated over row blocks.
+
+    Each block adds its pair counts, sums, sums of squares and cross
+    products to k x k accumulators, so memory is bounded by one block of
+    the numeric columns instead of a float copy of the whole table. Values
+    are shifted by the column means first to keep the one-pass sums
+    accurate. With sample_rows, only a uniform random sample of that many
+    rows is read, which is the approximation used for very large tables.
+    weights gives each row a frequency weight, as for a stratified sample.
+    """
+    rows = None
+    if sample_rows is not None and len(df) > sample_rows:
+        rows = np.sort(np.random.default_rng(seed).choice(len(df), sample_rows, replace=False))
+    means = np.array([df[col].mean() for col in cols], dtype=np.float64)
+    return correlation_from_sums(correlation_sums(df, cols, means, rows, weights, block_rows), cols)
+
+def correlation_matrix(df, profile, cols, sample_rows=None):
+    """Pearson correlation matrix of the numeric columns"""
+    if profile.out_of_core or profile.sampled or profile.union:
+        return profile.correlation(cols)
+    return blocked_correlation(df, cols, sample_rows=sample_rows)
+
+def top_correlated_pairs(corr, top=TOP_CORRELATION_PAIRS):
+    """The top column pairs of a correlation matrix by absolute correlation"""
+    values = corr.to_numpy()
+    upper_i, upper_j = np.triu_indices(len(values), k=1)
+    pair_values = values[upper_i, upper_j]
+    strength = np.nan_to_num(np.abs(pair_values), nan=-1.0)
+    order = np.argsort(-strength, kind='stable')[:top]
+    order = order[strength[order] >= 0]
+    return pd.DataFrame({
+        'Column A': corr.index[upper_i[order]],
+        'Column B': corr.columns[upper_j[order]],
+        'Correlation': pair_values[order],
+    })
+
+def cluster_order(corr):
+    """Column order that places strongly correlated columns next to each other.
+
+    Spectral seriation: columns are sorted by the Fiedler vector of the
+    graph whose edge weights are the absolute correlations.
+    """
+    weights = np.nan_to_num(np.abs(corr.to_numpy()), nan=0.0)
+    if len(weights) < 3:
+        return list(corr.columns)
+    np.fill_diagonal(weights, 0.0)
+    laplacian = np.diag(weights.sum(axis=1)) - weights
+    _, vectors = np.linalg.eigh(laplacian)
+    return list(corr.columns[np.argsort(vectors[:, 1], kind='stable')])
+
+def clustered_correlation(corr, max_size=CORRELATION_HEATMAP_MAX):
+    """Correlation matrix reordered by cluster_order and, past max_size columns, block-averaged.
+
+    Downsampling averages the correlations inside each block of adjacent
+    columns, so the heatmap stays at most max_size cells wide; block labels
+    name the first and last column of the block.
+    """
+    order = cluster_order(corr)
+    corr = corr.loc[order, order]
+    if len(order) <= max_size:
+        return corr
+    bounds = np.linspace(0, len(order), max_size + 1).astype(int)
+    blocks = [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+    labels = [f"{order[b.start]} … {order[b.stop - 1]} ({b.stop - b.start})" if b.stop - b.start > 1 else order[b.start]
+              for b in blocks]
+    values = corr.to_numpy()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        reduced = np.array([[np.nanmean(values[row, col]) for col in blocks] for row in blocks])
+    return pd.DataFrame(reduced, index=labels, columns=labels)
+
+# Group-by cube settings
+CUBE_MAX_CARDINALITY = 50  # distinct values a categorical column may have to become a cube dimension
+CUBE_MAX_CELLS = 100_000  # bound on the product of the dimensions' cardinalities
+CUBE_STATISTICS = ('sum', 'count', 'mean', 'min', 'max')
+CUBE_MISSING = '(missing)'
+
+def cube_dimensions(profile, max_cardinality=CUBE_MAX_CARDINALITY, max_cells=CUBE_MAX_CELLS):
+    """Categorical columns to group the cube by, lowest cardinality first.
+
+    Columns with more than max_cardinality distinct values are left out, and
+    so is every further column once the product of cardinalities (counting
+    a missing-value group for each) would exceed max_cells.
+    """
+    cardinality = profile.unique_counts[profile.categorical_cols]
+    dimensions, cells = [], 1
+    for col, unique in cardinality[cardinality <= max_cardinality].sort_values(kind='stable').items():
+        if cells * (unique + 1) > max_cells:
+            break
+        dimensions.append(col)
+        cells *= unique + 1
+    return dimensions
+
+class GroupCube:
+    """sum, count, min and max of numeric measures per combination of categorical dimension values.
+
+    Each cell is one observed combination of dimension values; missing
+    dimension values form their own CUBE_MISSING group. Every coarser
+    breakdown (fewer dimensions, or a filter on some of them) rolls up from
+    the cells: sums, counts and row counts add, minimums and maximums take
+    the extreme, and means divide the rolled-up sum by the rolled-up count.
+    Cubes over different rows with the same dimensions and measures merge
+    the same way.
+    """
+
+    def __init__(self, rows, sums, counts, minimums, maximums):
+        self.rows = rows
+        self.sums = sums
+        self.counts = counts
+        self.minimums = minimums
+        self.maximums = maximums
+        self.dimensions = list(rows.index.names)
+        self.measures = list(sums.columns)
+
+    @classmethod
+    def from_frame(cls, df, dimensions, measures, weights=None):
+        """Cube of df in one grouped pass; with weights, rows, sums and counts are weighted totals"""
+        checkpoint()
+        # One dense cell number per row, folded a dimension at a time so it never overflows;
+        # cell_codes holds each dimension's value code for every cell
+        cell, cell_codes, labels = np.zeros(len(df), dtype=np.int64), [], []
+        for dim in dimensions:
+            codes, uniques = pd.factorize(df[dim])
+            radix = len(uniques) + 1
+            cell, folded = pd.factorize(cell * radix + np.where(codes < 0, len(uniques), codes))
+            previous, own = np.divmod(folded, radix)
+            cell_codes = [dim_codes[previous] for dim_codes in cell_codes] + [own]
+            # Labels are the values as text, so columns mixing types still sort
+            labels.append(np.array([str(value) for value in uniques] + [CUBE_MISSING], dtype=object))
+        index = pd.MultiIndex.from_arrays([label[dim_codes] for label, dim_codes in zip(labels, cell_codes)],
+                                          names=dimensions)
+        return cls.from_cells(df, cell, index, measures, weights)
+
+    @classmethod
+    def from_cells(cls, df, cell, index, measures, weights=None):
+        """Cube from the cell number of each row of df, 0 to len(index) - 1, and the index labelling the cells"""
+        n_cells = len(index)
+        def total(where=slice(None), by=None):
+            # Per-cell count of the rows in where, or the sum of by over them; integer unless weighted
+            if weights is not None:
+                by = weights if by is None else by * weights
+            return np.bincount(cell[where], None if by is None else by[where], n_cells)
+        weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+        values = df[measures].to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+        sums = np.column_stack([total(present[:, j], values[:, j]) for j in range(len(measures))])
+        counts = np.column_stack([total(present[:, j]) for j in range(len(measures))])
+        extremes = pd.DataFrame(values, columns=measures).groupby(cell, sort=True)
+        order = index.argsort()
+        def cells(table):
+            return table.set_axis(index, axis=0).iloc[order]
+        return cls(cells(pd.Series(total())),
+                   cells(pd.DataFrame(sums, columns=measures)), cells(pd.DataFrame(counts, columns=measures)),
+                   cells(extremes.min()), cells(extremes.max()))
+
+    def merge(self, other):
+        """Cube over the rows of both cubes"""
+        cells = GroupCube(*(pd.concat([a, b]) for a, b in zip(self._tables(), other._tables())))
+        return cells.regroup(level=self.dimensions)
+
+    def regroup(self, **groupby):
+        """Cube with the cells combined by the given groupby arguments (by= labels per cell, or level=)"""
+        def combine(table, how):
+            return getattr(table.groupby(sort=True, **groupby), how)()
+        return GroupCube(combine(self.rows, 'sum'), combine(self.sums, 'sum'), combine(self.counts, 'sum'),
+                         combine(self.minimums, 'min'), combine(self.maximums, 'max'))
+
+    def _tables(self):
+        return self.rows, self.sums, self.counts, self.minimums, self.maximums
+
+    def values(self, dimension, filters=None):
+        """Values of dimension among the cells matching filters"""
+        return self._select(filters).index.get_level_values(dimension).unique().tolist()
+
+    def _select(self, filters):
+        mask = np.ones(len(self.rows), dtype=bool)
+        for dim, value in (filters or {}).items():
+            mask &= self.rows.index.get_level_values(dim) == value
+        return self.rows[mask]
+
+    def breakdown(self, measure, by, filters=None):
+        """Rows and every CUBE_STATISTICS of measure per combination of the by dimensions.
+
+        filters maps dimensions to the one value to keep, for drilling into
+        a slice. by may be empty for the total over the selected cells.
+        """
+        cells = self._select(filters).index
+        rows = self.rows.loc[cells]
+        table = pd.DataFrame({
+            'rows': rows,
+            'sum': self.sums.loc[cells, measure],
+            'count': self.counts.loc[cells, measure],
+            'min': self.minimums.loc[cells, measure],
+            'max': self.maximums.loc[cells, measure],
+        })
+        if by:
+            grouped = table.groupby(level=list(by), sort=True)
+            table = pd.concat([grouped[['rows', 'sum', 'count']].sum(), grouped['min'].min(), grouped['max'].max()], axis=1)
+        else:
+            table = pd.DataFrame({'rows': [table['rows'].sum()], 'sum': [table['sum'].sum()], 'count': [table['count'].sum()],
+                                  'min': [table['min'].min()], 'max': [table['max'].max()]}, index=['Total'])
+        table['mean'] = table['sum'] / table['count'].where(table['count'] > 0)
+        return table[['rows', *CUBE_STATISTICS]]
+
+def group_cube(df, profile, dimensions=None, measures=None):
+    """GroupCube of the numeric columns by the low-cardinality categorical columns (see cube_dimensions).
+
+    None when the dataset has no such columns or no numeric columns.
+    """
+    dimensions = cube_dimensions(profile) if dimensions is None else list(dimensions)
+    measures = list(profile.numeric_cols) if measures is None else list(measures)
+    if not dimensions or not measures:
+        return None
+    if profile.out_of_core or profile.sampled or profile.union:
+        return profile.group_cube(dimensions, measures)
+    return GroupCube.from_frame(df, dimensions, measures)
+
+# Time series settings
+DATETIME_PROBE_ROWS = 20  # values of a text column tried first; most text columns are ruled out here
+DATETIME_SAMPLE_ROWS = 1_000
+DATETIME_PARSE_SHARE = 0.9  # share of a text column's values that must parse as dates
+TIMESERIES_LEVELS = ('hour', 'day', 'week', 'month')
+TIMESERIES_LEVEL_POINTS = 5_000  # most buckets a zoom window may span at the level it is served from
+TIMESERIES_POINTS = 1_000  # points per chart after LTTB downsampling
+HOUR_NS = 3_600 * 10 ** 9
+
+def as_datetime(values):
+    """values as naive datetime64[ns]; text is parsed, unparseable values become NaT and times move to UTC"""
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            values = pd.to_datetime(values.astype(object), errors='coerce')
+    if values.dt.tz is not None:
+        values = values.dt.tz_convert(None)
+    return values.astype('datetime64[ns]')
+
+def datetime_columns(df, profile):
+    """Datetime columns, and text columns whose values mostly parse as dates (judged on df's first rows)"""
+    found = []
+    for col, dtype in profile.dtypes.items():
+        kind = column_kind(dtype)
+        if kind == 'datetime':
+            found.append(col)
+        elif kind == 'text' and col in df.columns:
+            values = df[col].dropna()
+            for sample in (values.head(DATETIME_PROBE_ROWS), values.head(DATETIME_SAMPLE_ROWS)):
+                # Plain numbers would parse as years or epochs
+                numeric = pd.to_numeric(sample.astype(object), errors='coerce').notna()
+                if sample.empty or numeric.mean() >= 0.5 or as_datetime(sample).notna().mean() < DATETIME_PARSE_SHARE:
+                    break
+            else:
+                found.append(col)
+    return found
+
+def bucket_start(times, level):
+    """Start of the hour, day, week (from Monday) or month containing each of times, a DatetimeIndex"""
+    if level == 'hour':
+        starts = times.floor('h')
+    elif level == 'day':
+        starts = times.floor('D')
+    elif level == 'week':
+        starts = times.floor('D') - pd.to_timedelta(times.weekday, unit='D')
+    elif level == 'month':
+        starts = times.to_period('M').to_timestamp()
+    else:
+        raise ValueError(f"Unknown time level: {level}")
+    return starts.rename(times.name)
+
+def lttb(x, y, threshold):
+    """Positions of the points kept by Largest-Triangle-Three-Buckets downsampling to threshold points.
+
+    The first and last points are always kept. Every other point
+    represents one of threshold - 2 equal buckets: the one spanning the
+    largest triangle with the previously kept point and the average of the
+    next bucket, which preserves peaks, troughs and the overall shape.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    bounds = np.append(np.linspace(1, n - 1, threshold - 1).astype(np.int64), n)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    kept = 0
+    for i in range(threshold - 2):
+        start, stop, following = bounds[i], bounds[i + 1], bounds[i + 2]
+        next_x, next_y = x[stop:following].mean(), y[stop:following].mean()
+        area = np.abs((x[kept] - next_x) * (y[start:stop] - y[kept]) - (x[kept] - x[start:stop]) * (next_y - y[kept]))
+        kept = start + int(np.argmax(area))
+        keep[i + 1] = kept
+    return keep
+
+class TimeRollup:
+    """Totals of numeric measures per hour, day, week and month of a datetime column.
+
+    Each level is a GroupCube whose one dimension is the bucket start time.
+    Rows are aggregated once into hours; days, weeks and months are rolled
+    up from the hours, so the whole pyramid costs one pass over the rows. A
+    zoom window is served from the finest level that spans at most
+    TIMESERIES_LEVEL_POINTS buckets in it (see level_for).
+    """
+
+    def __init__(self, hours):
+        self.column = hours.dimensions[0]
+        self.measures = hours.measures
+        self.levels = {'hour': hours}
+        for level in TIMESERIES_LEVELS[1:]:
+            self.levels[level] = hours.regroup(by=bucket_start(hours.rows.index, level))
+        times = hours.rows.index
+        self.empty = len(times) == 0
+        self.start = None if self.empty else times[0]
+        self.end = None if self.empty else times[-1] + pd.Timedelta(hours=1)
+
+    @classmethod
+    def from_frame(cls, df, col, measures, weights=None):
+        """Rollup of df's rows with a parseable col; with weights, rows, sums and counts are weighted totals"""
+        checkpoint()
+        times = as_datetime(df[col])
+        valid = times.notna().to_numpy()
+        cell, hours = pd.factorize(np.floor_divide(times.to_numpy()[valid].view(np.int64), HOUR_NS), sort=True)
+        index = pd.DatetimeIndex((hours * HOUR_NS).astype('datetime64[ns]'), name=col)
+        weights = None if weights is None else np.asarray(weights, dtype=np.float64)[valid]
+        return cls(GroupCube.from_cells(df.loc[valid, measures], cell, index, measures, weights))
+
+    def merge(self, other):
+        """Rollup over the rows of both rollups"""
+        return TimeRollup(self.levels['hour'].merge(other.levels['hour']))
+
+    def level_for(self, start=None, end=None, max_points=TIMESERIES_LEVEL_POINTS):
+        """Finest level with at most max_points buckets between start and end, else the coarsest"""
+        for level in TIMESERIES_LEVELS:
+            if len(self.levels[level].rows.loc[start:end]) <= max_points:
+                return level
+        return TIMESERIES_LEVELS[-1]
+
+    def series(self, level, measure=None, statistic='sum', start=None, end=None):
+        """One of CUBE_STATISTICS of measure per bucket of level between start and end; row counts for measure=None"""
+        cube = self.levels[level]
+        window = slice(start, end)
+        if measure is None:
+            return cube.rows.loc[window]
+        if statistic == 'mean':
+            counts = cube.counts[measure].loc[window]
+            return cube.sums[measure].loc[window] / counts.where(counts > 0)
+        tables = {'sum': cube.sums, 'count': cube.counts, 'min': cube.minimums, 'max': cube.maximums}
+        return tables[statistic][measure].loc[window]
+
+def time_rollup(df, profile, col, measures=None):
+    """TimeRollup of the numeric columns over the datetime (or date-like text) column col"""
+    measures = list(profile.numeric_cols) if measures is None else list(measures)
+    if profile.out_of_core or profile.sampled or profile.union:
+        return profile.time_rollup(col, measures)
+    return TimeRollup.from_frame(df, col, measures)
+
+# Data grid settings
+GRID_PAGE_SIZES = (25, 50, 100, 500)
+GRID_MAX_VALUES = 1_000  # distinct values a column may have to be filtered by picking values
+GRID_CACHE_ENTRIES = 16  # sort orders, value indexes and filtered row orders kept per grid
+GRID_RADIX_VALUES = 2 ** 16 - 1  # columns with fewer distinct values are sorted through their value index
+
+def grid_filter_kind(profile, col):
+    """How a grid column is filtered: a 'range' of numbers or dates, picked 'values', or text that 'contains'"""
+    if column_kind(profile.dtypes[col]) in ('number', 'datetime'):
+        return 'range'
+    if profile.unique_counts[col] <= GRID_MAX_VALUES:
+        return 'values'
+    return 'contains'
+
+class DataGrid:
+    """Pages of a DataFrame's rows under column filters and a sort, for browsing datasets of any size.
+
+    Only the rows of the requested page are copied out of the DataFrame.
+    Each column gets, on first use, a value index (its distinct values in
+    sorted order with the positions of the rows holding each one) and a
+    sort order. Below GRID_RADIX_VALUES distinct values the index comes
+    from a linear-time radix sort and doubles as the sort order; other
+    number and date columns are argsorted. Missing values sort last, and
+    descending orders reverse the ascending ones. Picked values and text
+    searches read the value index, so their cost grows with the matching
+    rows and distinct values rather than the row count; ranges are one
+    vectorized comparison. The row order of each filter and sort
+    combination is cached too, so paging only slices it.
+
+    filters map columns to ('values', values), ('range', (low, high)) or
+    ('contains', text); None among picked values selects missing values.
+    """
+
+    def __init__(self, df, unique_counts=None, max_entries=GRID_CACHE_ENTRIES):
+        self.df = df
+        self.n_rows = len(df)
+        self.columns = list(df.columns)
+        self.unique_counts = {} if unique_counts is None else dict(unique_counts)
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, key, build):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        value = build()
+        with self._lock:
+            self._cache[key] = value
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return value
+
+    def _positions(self, positions):
+        # Row positions are held as int32 where they fit, halving the memory of each cached order
+        return positions.astype(np.int32) if self.n_rows < 2 ** 31 else positions
+
+    def value_index(self, col):
+        """(values, positions, offsets): col's distinct values in sorted order, the rows holding values[i]
+        being positions[offsets[i]:offsets[i + 1]] and the missing ones positions[offsets[-2]:]"""
+        def build():
+            checkpoint()
+            codes, uniques = pd.factorize(self.df[col])
+            uniques = pd.Index(uniques)
+            # Text labels sort any mix of types; numbers and dates sort by value
+            kind = column_kind(uniques.dtype)
+            order = (uniques if kind in ('number', 'datetime', 'bool') else uniques.astype(str)).argsort(kind='stable')
+            rank = np.empty(len(uniques) + 1, dtype=np.int64)
+            rank[order] = np.arange(len(uniques))
+            rank[-1] = len(uniques)
+            codes = rank[codes]
+            # Radix sort, in linear time, when the codes fit 16 bits
+            radix = len(uniques) < GRID_RADIX_VALUES
+            positions = self._positions(np.argsort(codes.astype(np.uint16) if radix else codes,
+                                                   kind='stable' if radix else None))
+            offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(uniques) + 1))])
+            return uniques[order], positions, offsets
+        return self._cached(('values', col), build)
+
+    def sort_order(self, col, descending=False):
+        """Positions of all rows sorted by col, with missing values last"""
+        order, n_valid = self._cached(('order', col), lambda: self._sort_order(col))
+        if not descending:
+            return order
+        return self._cached(('descending', col), lambda: np.concatenate([order[:n_valid][::-1], order[n_valid:]]))
+
+    def _sort_order(self, col):
+        values = self.df[col]
+        kind = column_kind(values.dtype)
+        if kind == 'text' or self.unique_counts.get(col, GRID_RADIX_VALUES) < GRID_RADIX_VALUES:
+            # The value index already lists the rows grouped by value, in value order
+            _, positions, offsets = self.value_index(col)
+            return positions, offsets[-2]
+        if kind == 'datetime':
+            key = as_datetime(values).to_numpy().view(np.int64)
+            missing = values.isna().to_numpy()
+        else:
+            key = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            missing = np.isnan(key)
+        checkpoint()
+        valid = np.flatnonzero(~missing)
+        order = valid[np.argsort(key[valid])]
+        return self._positions(np.concatenate([order, np.flatnonzero(missing)])), len(valid)
+
+    def values(self, col):
+        """col's distinct values in sorted order"""
+        return self.value_index(col)[0].tolist()
+
+    def bounds(self, col):
+        """Smallest and largest value of a number or date column, None for an empty column"""
+        values = self.df[col]
+        low, high = values.min(), values.max()
+        return None if pd.isna(low) else (low, high)
+
+    def _matches(self, col, kind, argument):
+        """Boolean mask of the rows passing one filter"""
+        if kind == 'range':
+            values, (low, high) = self.df[col], argument
+            if column_kind(values.dtype) == 'datetime':
+                values, low, high = as_datetime(values), pd.Timestamp(low), pd.Timestamp(high)
+            return ((values >= low) & (values <= high)).to_numpy(dtype=bool, na_value=False)
+        values, positions, offsets = self.value_index(col)
+        mask = np.zeros(self.n_rows, dtype=bool)
+        if kind == 'values':
+            picked = values.get_indexer([value for value in argument if value is not None])
+            picked = picked[picked >= 0].tolist() + ([len(values)] if None in argument else [])
+        elif kind == 'contains':
+            picked = np.flatnonzero(values.astype(str).str.contains(argument, case=False, regex=False))
+        else:
+            raise ValueError(f"Unknown grid filter: {kind}")
+        for i in picked:
+            mask[positions[offsets[i]:offsets[i + 1]]] = True
+        return mask
+
+    def rows(self, filters=None, sort=None, descending=False):
+        """Positions of the rows passing every filter, in sort order; None for all rows in their own order"""
+        filters = tuple(sorted((filters or {}).items(), key=lambda item: item[0]))
+        if not filters and sort is None:
+            return None
+        def build():
+            mask = None
+            for col, (kind, argument) in filters:
+                mask = self._matches(col, kind, argument) if mask is None else mask & self._matches(col, kind, argument)
+            if sort is None:
+                return self._positions(np.flatnonzero(mask))
+            order = self.sort_order(sort, descending)
+            return order if mask is None else order[mask[order]]
+        return self._cached(('rows', filters, sort, descending), build)
+
+    def page(self, start, stop, filters=None, sort=None, descending=False):
+        """(rows start:stop of the filtered and sorted dataset, number of rows passing the filters)"""
+        positions = self.rows(filters, sort, descending)
+        if positions is None:
+            return self.df.iloc[start:stop], self.n_rows
+        return self.df.take(positions[start:stop]), len(positions)
+
+def data_grid(df, profile):
+    """DataGrid over the dataset's rows, or None when they are not held anywhere (streaming and union modes)"""
+    if profile.out_of_core or profile.sampled:
+        return profile.data_grid()
+    if profile.streaming:
+        return None
+    return DataGrid(df, profile.unique_counts)
+
+# Sampling settings
+SAMPLE_ROWS = 100_000
+SAMPLE_MIN_PER_STRATUM = 100
+SAMPLE_MAX_STRATA = 1_000
+SAMPLE_CONFIDENCE = 0.95
+SAMPLE_OPTIONS = ('sample_rows', 'stratify', 'stream_chunk_rows')
+
+class RowSample:
+    """Uniform or stratified row sample drawn in a single pass over chunks.
+
+    Every row gets a uniform random key and the rows with the size smallest
+    keys are kept, which is a uniform sample without replacement of the rows
+    seen so far, so memory stays bounded by the sample size. With a stratify
+    column, the SAMPLE_MIN_PER_STRATUM smallest keys of every stratum are
+    kept as well so rare values are represented. Within a stratum the kept
+    rows are still a simple random sample; the population count of every
+    stratum is recorded to weight them back.
+    """
+
+    def __init__(self, size=SAMPLE_ROWS, stratify=None, seed=0):
+        self.size = size
+        self.stratify = stratify
+        self.rng = np.random.default_rng(seed)
+        self.rows = None
+        self.keys = np.empty(0)
+        self.strata = np.empty(0, dtype=np.int64)
+        self.labels = {}
+        self.population = np.zeros(0, dtype=np.int64)
+
+    def _stratum_codes(self, chunk):
+        if self.stratify is None:
+            codes = np.zeros(len(chunk), dtype=np.int64)
+            self.labels.setdefault(None, 0)
+        else:
+            codes, uniques = pd.factorize(chunk[self.stratify], use_na_sentinel=False)
+            mapping = np.array([self.labels.setdefault(None if pd.isna(value) else value, len(self.labels))
+                                for value in uniques], dtype=np.int64)
+            if len(self.labels) > SAMPLE_MAX_STRATA:
+                raise ValueError(f"Cannot stratify by {self.stratify!r}: it has more than "
+                                 f"{SAMPLE_MAX_STRATA:,} distinct values")
+            codes = mapping[codes]
+        population = np.bincount(codes, minlength=len(self.labels))
+        population[:len(self.population)] += self.population
+        self.population = population
+        return codes
+
+    def update(self, chunk):
+        strata = np.concatenate([self.strata, self._stratum_codes(chunk)])
+        keys = np.concatenate([self.keys, self.rng.random(len(chunk))])
+        rows = chunk if self.rows is None else pd.concat([self.rows, chunk], ignore_index=True)
+        keep = np.zeros(len(keys), dtype=bool)
+        if len(keys) > self.size:
+            keep[np.argpartition(keys, self.size - 1)[:self.size]] = True
+        else:
+            keep[:] = True
+        if self.stratify is not None:
+            order = np.lexsort((keys, strata))
+            ordered = strata[order]
+            rank = np.arange(len(order)) - np.searchsorted(ordered, ordered)
+            keep[order[rank < SAMPLE_MIN_PER_STRATUM]] = True
+        keep = np.flatnonzero(keep)
+        self.rows = rows.iloc[keep].reset_index(drop=True)
+        self.keys = keys[keep]
+        self.strata = strata[keep]
+
+def weighted_quantile(values, weights, q):
+    """Quantiles of values under frequency weights (inverse of the weighted empirical CDF)"""
+    order = np.argsort(values, kind='stable')
+    cumulative = np.cumsum(weights[order])
+    if len(cumulative) == 0:
+        return np.full(np.shape(q), np.nan)
+    positions = np.searchsorted(cumulative, np.asarray(q) * cumulative[-1])
+    return values[order][np.minimum(positions, len(values) - 1)]
+
+class SampledProfile(StreamingProfile):
+    """Streaming profile that also keeps a RowSample for exploration.
+
+    The profile statistics cover every row, as in StreamingProfile.
+    Histograms, category counts, correlations and box plots are estimated
+    from the sample instead, weighted by stratum, and come with confidence
+    intervals at SAMPLE_CONFIDENCE from the stratified sampling variance
+    (a simple random sample is the one-stratum case).
+    """
+
+    sampled = True
+
+    def __init__(self, size=SAMPLE_ROWS, stratify=None, seed=0):
+        super().__init__()
+        self.sampler = RowSample(size, stratify, seed)
+
+    def update(self, chunk, row_hashes=None):
+        super().update(chunk, row_hashes)
+        self.sampler.update(chunk)
+
+    def finalize(self):
+        super().finalize()
+        sampler = self.sampler
+        self.stratify = sampler.stratify
+        self.sample = sampler.rows if sampler.rows is not None else pd.DataFrame(columns=list(self.accumulators))
+        self.sample_strata = sampler.strata
+        self.strata_population = sampler.population.astype(np.float64)
+        self.strata_sample = np.bincount(sampler.strata, minlength=len(sampler.population)).astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.weights = (self.strata_population / self.strata_sample)[self.sample_strata]
+        self.z = NormalDist().inv_cdf((1 + SAMPLE_CONFIDENCE) / 2)
+        return self
+
+    def _totals(self, y):
+        """Estimated population totals of the columns of y and their standard errors.
+
+        y has one row per sampled row. Uses the stratified estimator
+        sum_h N_h * mean_h with variance sum_h N_h^2 (1 - n_h/N_h) s_h^2 / n_h.
+        """
+        groups = pd.DataFrame(y).groupby(self.sample_strata)
+        strata = groups.size().index.to_numpy()
+        population = self.strata_population[strata, None]
+        sampled = self.strata_sample[strata, None]
+        totals = (population * groups.mean().to_numpy()).sum(axis=0)
+        variance = population ** 2 * (1 - sampled / population) * groups.var().fillna(0).to_numpy() / sampled
+        return totals, np.sqrt(variance.sum(axis=0))
+
+    def _ratio(self, y, valid):
+        """Estimated population mean of y over the rows where valid holds, with its standard error"""
+        valid = valid.astype(np.float64)
+        y = np.where(valid > 0, y, 0.0)
+        (total_y, total_valid), _ = self._totals(np.column_stack([y, valid]))
+        if total_valid == 0:
+            return np.nan, np.nan
+        ratio = total_y / total_valid
+        # Linearized variance of the ratio estimator
+        _, error = self._totals((y - ratio * valid) / total_valid)
+        return ratio, error[0]
+
+    def _values(self, col):
+        values = self.sample[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        return values, ~np.isnan(values)
+
+    def histogram(self, col, nbins=HISTOGRAM_BINS):
+        """Estimated population bin counts over the column's full range, with confidence half-widths"""
+        values, valid = self._values(col)
+        low, high = self.describe.loc['min', col], self.describe.loc['max', col]
+        if not valid.any() or not np.isfinite(low):
+            return np.zeros(nbins + 1), np.zeros(nbins), np.zeros(nbins)
+        edges = np.linspace(low, high, nbins + 1)
+        bins = np.clip(np.searchsorted(edges, values[valid], side='right') - 1, 0, nbins - 1)
+        indicator = np.zeros((len(values), nbins))
+        indicator[np.flatnonzero(valid), bins] = 1.0
+        counts, error = self._totals(indicator)
+        return edges, counts, self.z * error
+
+    def value_counts(self, col, top=TOP_CATEGORIES):
+        """Estimated population counts of the most frequent values, with confidence half-widths"""
+        codes, uniques = pd.factorize(self.sample[col])
+        present = codes >= 0
+        weighted = np.bincount(codes[present], weights=self.weights[present], minlength=len(uniques))
+        order = np.argsort(-weighted, kind='stable')[:top]
+        counts, error = self._totals((codes[:, None] == order[None, :]).astype(np.float64))
+        return pd.DataFrame({'count': counts, 'margin': self.z * error},
+                            index=pd.Index(np.asarray(uniques)[order], name=col))
+
+    def correlation(self, cols):
+        return blocked_correlation(self.sample, cols, weights=self.weights)
+
+    def group_cube(self, dimensions, measures):
+        """Cube of the sample with rows, sums and counts scaled to population estimates"""
+        return GroupCube.from_frame(self.sample, dimensions, measures, weights=self.weights)
+
+    def time_rollup(self, col, measures):
+        """Rollup of the sample with rows, sums and counts scaled to population estimates"""
+        return TimeRollup.from_frame(self.sample, col, measures, weights=self.weights)
+
+    def data_grid(self):
+        """Grid over the sampled rows"""
+        return DataGrid(self.sample, self.unique_counts)
+
+    def correlation_intervals(self, pairs):
+        """Fisher z confidence bounds for the correlations of a top_correlated_pairs table.
+
+        Uses the Kish effective sample size of the rows where both columns
+        are present, which accounts for unequal stratum weights.
+        """
+        bounds = []
+        for a, b, r in pairs[['Column A', 'Column B', 'Correlation']].itertuples(index=False):
+            weights = self.weights[(self.sample[a].notna() & self.sample[b].notna()).to_numpy()]
+            effective = weights.sum() ** 2 / (weights ** 2).sum() if len(weights) else 0
+            if effective <= 3 or np.isnan(r):
+                bounds.append((np.nan, np.nan))
+                continue
+            half = self.z / np.sqrt(effective - 3)
+            with np.errstate(divide='ignore'):
+                center = np.arctanh(np.clip(r, -1, 1))
+            bounds.append((np.tanh(center - half), np.tanh(center + half)))
+        return pd.DataFrame(bounds, columns=['Low', 'High'], index=pairs.index)
+
+    def quantile_interval(self, col, q):
+        """Weighted sample quantile with a Woodruff confidence interval"""
+        values, valid = self._values(col)
+        if not valid.any():
+            return np.nan, np.nan, np.nan
+        estimate = weighted_quantile(values[valid], self.weights[valid], q)
+        _, error = self._ratio((values <= estimate).astype(np.float64), valid)
+        low, high = weighted_quantile(values[valid], self.weights[valid],
+                                      np.clip([q - self.z * error, q + self.z * error], 0, 1))
+        return estimate, low, high
+
+    def mean_interval(self, col):
+        """Weighted sample mean with its confidence interval"""
+        values, valid = self._values(col)
+        estimate, error = self._ratio(values, valid)
+        return estimate, estimate - self.z * error, estimate + self.z * error
+
+    def box_summary(self, col):
+        """Five-number summary and outliers of the sample, with intervals for the quartiles and mean"""
+        intervals = {name: self.quantile_interval(col, q) for name, q in [('q1', 0.25), ('median', 0.5), ('q3', 0.75)]}
+        intervals['mean'] = self.mean_interval(col)
+        summary = {name: interval[0] for name, interval in intervals.items()}
+        iqr = summary['q3'] - summary['q1']
+        values, valid = self._values(col)
+        values = values[valid]
+        inside = (values >= summary['q1'] - 1.5 * iqr) & (values <= summary['q3'] + 1.5 * iqr)
+        summary['lowerfence'] = values[inside].min() if inside.any() else summary['q1']
+        summary['upperfence'] = values[inside].max() if inside.any() else summary['q3']
+        outliers = values[~inside]
+        if len(outliers) > BOX_OUTLIER_SAMPLE:
+            outliers = np.random.default_rng(0).choice(outliers, BOX_OUTLIER_SAMPLE, replace=False)
+        summary['outliers'] = outliers
+        summary['intervals'] = intervals
+        return summary
+
+def exact_profile(data, options):
+    """Parse the whole upload and profile it exactly; the full-data job behind a sampled view"""
+    options = {name: value for name, value in options.items() if name not in SAMPLE_OPTIONS}
+    df, key = load_upload(data, options)
+    return df, key, DatasetProfile(df)
+
+# Multi-sheet analysis settings
+SHEET_READ_OPTIONS = ('optimize_memory',)
+
+def upload_sheet_options(name, data, options):
+    """Parse options for every sheet of one upload in all-sheets mode.
+
+    The column and row projection belong to the sheet picked for the
+    detailed analysis, so only the reader settings carry over; an Excel
+    reader that can't open this file is swapped for one that can.
+    """
+    shared = {key: options[key] for key in SHEET_READ_OPTIONS if options.get(key)}
+    if name.endswith('.csv'):
+        return [{**shared, 'format': 'csv'}]
+    engines = available_excel_readers(name)
+    engine = options['engine'] if options.get('engine') in engines else engines[0]
+    return [{**shared, 'format': 'excel', 'engine': engine, 'sheet': sheet} for sheet in list_sheets(data, engine)]
+
+def parse_sheet_file(path, options):
+    """parse_upload on an upload staged on disk, so process workers don't each get the bytes pickled"""
+    return parse_upload(Path(path).read_bytes(), options)
+
+def analyze_sheets(uploads, options, executor='process', workers=None):
+    """Parse every sheet of every upload concurrently, then profile each one independently.
+
+    uploads is a list of (name, bytes). Sheets missing from the parse caches
+    are parsed on a process pool (or a thread pool with executor='thread')
+    from a copy of each upload staged on disk. Every sheet then gets an
+    incremental_profile, so sheets sharing a schema can be combined by
+    UnionProfile, and its own recommendations. Returns one dict per sheet,
+    in upload and sheet order, with keys file, sheet, key, df, profile and
+    recommendations.
+    """
+    cache, disk_cache = get_parse_cache(), get_disk_parse_cache()
+    pool = get_column_pool(executor, workers)
+    sheets, pending, staged = [], {}, []
+    try:
+        for name, data in uploads:
+            digest, path = file_digest(data), None
+            for sheet_options in upload_sheet_options(name, data, options):
+                # Same key as dataset_cache_key, without hashing the upload once per sheet
+                key = (digest,) + tuple(sorted(sheet_options.items()))
+                df = cache.get(key)
+                if df is None:
+                    df = disk_cache.get(key)
+                    if df is not None:
+                        cache.put(key, df)
+                if df is None:
+                    if path is None:
+                        fd, path = tempfile.mkstemp(suffix=Path(name).suffix)
+                        with os.fdopen(fd, 'wb') as f:
+                            f.write(data)
+                        staged.append(path)
+                    pending[len(sheets)] = pool.submit(parse_sheet_file, path, sheet_options)
+                sheets.append({'file': name, 'sheet': sheet_options.get('sheet'), 'key': key, 'df': df})
+        for index, future in pending.items():
+            checkpoint()
+            df = future.result()
+            disk_cache.put(sheets[index]['key'], df)
+            cache.put(sheets[index]['key'], df)
+            sheets[index]['df'] = df
+    finally:
+        for future in pending.values():
+            future.cancel()
+        for path in staged:
+            Path(path).unlink(missing_ok=True)
+
+    def profile_sheet(sheet):
+        sheet['profile'] = incremental_profile(sheet['df'])
+        sheet['recommendations'] = generate_recommendations(sheet['df'], sheet['profile'])
+        return sheet
+    return list(get_column_pool('thread', workers).map(profile_sheet, sheets))
+
+def column_kind(dtype):
+    """Coarse type of a column: bool, number, datetime or text"""
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'bool'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'number'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    return 'text'
+
+def schema_signature(df):
+    """Column names with a coarse type per column; sheets with equal signatures can be analyzed together"""
+    return tuple((str(col), column_kind(dtype)) for col, dtype in df.dtypes.items())
+
+def schema_groups(sheets):
+    """Positions of the sheets sharing each schema signature, for signatures shared by two or more sheets"""
+    groups = OrderedDict()
+    for i, sheet in enumerate(sheets):
+        groups.setdefault(schema_signature(sheet['df']), []).append(i)
+    return [members for members in groups.values() if len(members) > 1]
+
+def workbook_summary(sheets):
+    """One row per sheet: size, completeness, duplicates and its most pressing recommendation"""
+    rows = []
+    for sheet in sheets:
+        profile = sheet['profile']
+        issues = [r for r in sheet['recommendations'] if r['type'] in ('danger', 'warning')]
+        rows.append({
+            'File': sheet['file'],
+            'Sheet': sheet['sheet'] or '',
+            'Rows': profile.n_rows,
+            'Columns': profile.n_cols,
+            'Completeness (%)': round(profile.completeness, 1),
+            'Duplicates': profile.duplicate_count,
+            'Issues': len(issues),
+            'Top Issue': issues[0]['title'] if issues else 'None',
+        })
+    return pd.DataFrame(rows)
+
+class UnionProfile(IncrementalProfile):
+    """Profile of schema-compatible DataFrames analyzed as one dataset, without concatenating them.
+
+    The statistics come from merging the chunk states of the members'
+    incremental profiles, duplicates across members included. Histograms,
+    category counts, correlations and box plots are computed member by
+    member and combined, so the rows stay in the member DataFrames.
+    """
+
+    streaming = True
+    union = True
+
+    def __init__(self, frames, profiles):
+        super().__init__()
+        self.frames = list(frames)
+        for profile in profiles:
+            self._fold(profile)
+        self.finalize()
+
+    def _values(self, frame, col):
+        values = frame[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        return values[~np.isnan(values)]
+
+    def histogram(self, col, nbins=HISTOGRAM_BINS):
+        """The bins np.histogram would return for the concatenated column"""
+        low, high = self.describe.loc['min', col], self.describe.loc['max', col]
+        if not np.isfinite(low):
+            return np.zeros(nbins + 1), np.zeros(nbins, dtype=np.int64)
+        edges = np.histogram_bin_edges([low, high], bins=nbins)
+        counts = sum(np.histogram(self._values(frame, col), bins=edges)[0] for frame in self.frames)
+        return edges, counts
+
+    def value_counts(self, col, top=TOP_CATEGORIES):
+        counts = pd.concat([frame[col].value_counts() for frame in self.frames])
+        counts.index = counts.index.astype(object)
+        return counts.groupby(level=0, sort=False).sum().sort_values(ascending=False, kind='stable').head(top)
+
+    def correlation(self, cols):
+        means = self.mean[cols].to_numpy(dtype=np.float64)
+        return correlation_from_sums(sum(correlation_sums(frame, cols, means) for frame in self.frames), cols)
+
+    def group_cube(self, dimensions, measures):
+        """Cubes of the members merged cell by cell"""
+        cube = None
+        for frame in self.frames:
+            part = GroupCube.from_frame(frame, dimensions, measures)
+            cube = part if cube is None else cube.merge(part)
+        return cube
+
+    def time_rollup(self, col, measures):
+        """Rollups of the members merged hour by hour"""
+        rollup = None
+        for frame in self.frames:
+            part = TimeRollup.from_frame(frame, col, measures)
+            rollup = part if rollup is None else rollup.merge(part)
+        return rollup
+
+    def box_summary(self, col):
+        """Quartiles from the merged sketches; whiskers and a bounded sample of outliers from the members"""
+        low, high = self.lower_fence[col], self.upper_fence[col]
+        inside_min, inside_max, outliers = np.inf, -np.inf, []
+        for frame in self.frames:
+            values = self._values(frame, col)
+            inside = (values >= low) & (values <= high)
+            if inside.any():
+                inside_min = min(inside_min, values[inside].min())
+                inside_max = max(inside_max, values[inside].max())
+            outliers.append(values[~inside])
+        outliers = np.concatenate(outliers) if outliers else np.empty(0)
+        if len(outliers) > BOX_OUTLIER_SAMPLE:
+            outliers = np.random.default_rng(0).choice(outliers, BOX_OUTLIER_SAMPLE, replace=False)
+        return {
+            'q1': self.q1[col],
+            'median': self.median[col],
+            'q3': self.q3[col],
+            'mean': self.mean[col],
+            'lowerfence': inside_min if np.isfinite(inside_min) else self.q1[col],
+            'upperfence': inside_max if np.isfinite(inside_max) else self.q3[col],
+            'outliers': outliers,
+        }
+
+def union_profile(sheets, members):
+    """UnionProfile of the sheets at the given positions, e.g. one of schema_groups(sheets)"""
+    return UnionProfile([sheets[i]['df'] for i in members], [sheets[i]['profile'] for i in members])
+
+# Out-of-core backend settings
+COMPUTE_BACKENDS = ['pandas', 'duckdb']
+OUT_OF_CORE_DIR = Path(tempfile.gettempdir()) / 'excel-analyzer'
+DUCKDB_MEMORY_LIMIT = None  # DuckDB's default is 80% of RAM; e.g. '4GB' to leave room for the app
+
+def available_backends():
+    """Compute backends usable here; duckdb needs the duckdb package"""
+    backends = list(COMPUTE_BACKENDS)
+    if importlib.util.find_spec('duckdb') is None:
+        backends.remove('duckdb')
+    return backends
+
+def quote_identifier(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+def quote_literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+def duckdb_connection():
+    """In-memory DuckDB connection that spills to OUT_OF_CORE_DIR"""
+    import duckdb
+
+    OUT_OF_CORE_DIR.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect()
+    con.execute(f"SET temp_directory = {quote_literal(OUT_OF_CORE_DIR)}")
+    if DUCKDB_MEMORY_LIMIT:
+        con.execute(f"SET memory_limit = {quote_literal(DUCKDB_MEMORY_LIMIT)}")
+    return con
+
+def convert_to_parquet(source, options, path):
+    """Write the dataset in source (a file path or the uploaded bytes) to a Parquet file at path.
+
+    CSVs are converted by DuckDB in bounded memory, spilling to disk when
+    needed. Excel sheets are parsed in memory first; a worksheet holds at
+    most about a million rows anyway.
+    """
+    if options['format'] != 'csv':
+        data = Path(source).read_bytes() if isinstance(source, (str, Path)) else bytes(source)
+        parse_upload(data, {**options, 'optimize_memory': False}).to_parquet(path, index=False)
+        return path
+    staged = None
+    if not isinstance(source, (str, Path)):
+        staged = Path(path).with_suffix('.csv')
+        staged.write_bytes(source)
+        source = staged
+    columns = ', '.join(map(quote_identifier, options['columns'])) if options.get('columns') else '*'
+    query = f"SELECT {columns} FROM read_csv({quote_literal(source)}, header = true)"
+    if options.get('n_rows'):
+        query += f" LIMIT {int(options['n_rows'])}"
+    if options.get('skip_rows'):
+        query += f" OFFSET {int(options['skip_rows'])}"
+    try:
+        with duckdb_connection() as con:
+            con.execute(f"COPY ({query}) TO {quote_literal(path)} (FORMAT parquet)")
+    finally:
+        if staged is not None:
+            staged.unlink(missing_ok=True)
+    return path
+
+class DuckDBProfile(DatasetProfile):
+    """Dataset profile computed by DuckDB queries over a Parquet file.
+
+    Exposes the same attributes as DatasetProfile, but the rows stay on
+    disk: every statistic is an aggregate query, and DuckDB spills to
+    OUT_OF_CORE_DIR when a sort or hash table outgrows its memory limit.
+    Histograms, category counts, correlations and box plots are queried
+    on demand. Exact quartiles are queried one column at a time, so only
+    one column's values are buffered at once; with approximate=True they
+    come from DuckDB's t-digest in the main scan and unique counts from
+    HyperLogLog instead.
+
+    With owns_file=True the Parquet file is deleted together with the
+    profile.
+    """
+
+    streaming = True
+    out_of_core = True
+
+    def __init__(self, path, approximate=False, owns_file=False):
+        import pyarrow.parquet as pq
+
+        self.path = str(path)
+        self.approximate = approximate
+        self._lock = threading.Lock()
+        self._con = duckdb_connection()
+        self._con.execute(f"CREATE VIEW dataset AS SELECT * FROM read_parquet({quote_literal(self.path)})")
+        if owns_file:
+            weakref.finalize(self, Path(self.path).unlink, missing_ok=True)
+
+        self.dtypes = pq.read_schema(self.path).empty_table().to_pandas().dtypes
+        columns = list(self.dtypes.index)
+        self.numeric_cols = [col for col, dtype in self.dtypes.items() if pd.api.types.is_numeric_dtype(dtype)
+                             and not pd.api.types.is_bool_dtype(dtype)]
+        self.categorical_cols = [col for col, dtype in self.dtypes.items()
+                                 if dtype == object or isinstance(dtype, (pd.CategoricalDtype, pd.StringDtype))]
+        self.preview = self.query(f"SELECT * FROM dataset LIMIT {STREAM_PREVIEW_ROWS}").df()
+
+        # One scan for the per-column aggregates
+        distinct = 'approx_count_distinct({})' if approximate else 'count(DISTINCT {})'
+        # Exact quartiles are queried below, one column at a time
+        quantile = 'approx_quantile({}, [0.25, 0.5, 0.75])' if approximate else 'NULL'
+        aggregates = ['count(*)']
+        for col in columns:
+            name = quote_identifier(col)
+            aggregates += [f'count({name})', distinct.format(name)]
+        for col in self.numeric_cols:
+            name = quote_identifier(col)
+            aggregates += [quantile.format(name), f'avg({name})', f'stddev_samp({name})', f'skewness({name})',
+                           f'kurtosis({name})', f'min({name})', f'max({name})']
+        row = self.query(f"SELECT {', '.join(aggregates)} FROM dataset").fetchone()
+
+        self.n_rows = row[0]
+        self.n_cols = len(columns)
+        self.total_cells = self.n_rows * self.n_cols
+        self.non_null_counts = pd.Series(row[1:1 + 2 * self.n_cols:2], index=columns, dtype=np.int64)
+        self.null_counts = self.n_rows - self.non_null_counts
+        self.missing_total = int(self.null_counts.sum())
+        self.completeness = (1 - self.missing_total / self.total_cells) * 100 if self.total_cells else 100.0
+        self.unique_counts = pd.Series(row[2:1 + 2 * self.n_cols:2], index=columns, dtype=np.int64)
+        self.unique_counts = self.unique_counts.clip(upper=self.non_null_counts)
+        distinct_rows = self.query("SELECT count(*) FROM (SELECT DISTINCT * FROM dataset)").fetchone()[0]
+        self.duplicate_count = self.n_rows - distinct_rows
+        self.duplicate_percent = (self.duplicate_count / self.n_rows) * 100 if self.n_rows else 0.0
+
+        stats = np.array(row[1 + 2 * self.n_cols:], dtype=object).reshape(-1, 7)
+        def series(values):
+            return pd.Series([np.nan if v is None else v for v in values], index=self.numeric_cols, dtype=np.float64)
+        quartiles = list(stats[:, 0])
+        if not approximate:
+            # quantile_cont buffers every value of its column, so each column gets a scan of its own
+            quartiles = [self.query(f"SELECT quantile_cont({quote_identifier(col)}, [0.25, 0.5, 0.75]) "
+                                    f"FROM dataset").fetchone()[0] for col in self.numeric_cols]
+        quartiles = [q if q is not None else [None] * 3 for q in quartiles]
+        self.q1 = series([q[0] for q in quartiles])
+        self.median = series([q[1] for q in quartiles])
+        self.q3 = series([q[2] for q in quartiles])
+        iqr = self.q3 - self.q1
+        self.lower_fence = self.q1 - 1.5 * iqr
+        self.upper_fence = self.q3 + 1.5 * iqr
+        self.mean = series(stats[:, 1])
+        self.std = series(stats[:, 2])
+        self.skew = series(stats[:, 3])
+        self.kurtosis = series(stats[:, 4])
+        if self.numeric_cols:
+            outside = [f"count(*) FILTER (WHERE {quote_identifier(col)} < ? OR {quote_identifier(col)} > ?)"
+                       for col in self.numeric_cols]
+            fences = [float(v) for pair in zip(self.lower_fence.fillna(-np.inf), self.upper_fence.fillna(np.inf))
+                      for v in pair]
+            counts = self.query(f"SELECT {', '.join(outside)} FROM dataset", fences).fetchone()
+            self.outlier_counts = pd.Series(counts, index=self.numeric_cols, dtype=np.int64)
+            self.describe = self.numeric_describe(series(stats[:, 5]), series(stats[:, 6]))
+        else:
+            self.outlier_counts = pd.Series(dtype=np.int64)
+            self.describe = pd.DataFrame({'count': self.non_null_counts, 'unique': self.unique_counts}).T
+
+    def query(self, sql, parameters=None):
+        """Run sql on this profile's connection; safe to call from several sessions at once"""
+        with self._lock:
+            return self._con.cursor().execute(sql, parameters)
+
+    def histogram(self, col, nbins=HISTOGRAM_BINS):
+        """np.histogram-style equal-width bins over the column's range"""
+        low, high = self.describe.loc['min', col], self.describe.loc['max', col]
+        if not np.isfinite(low):
+            return np.zeros(nbins + 1), np.zeros(nbins, dtype=np.int64)
+        if low == high:
+            low, high = low - 0.5, high + 0.5
+        edges = np.linspace(low, high, nbins + 1)
+        name = quote_identifier(col)
+        # The last bin is closed on the right, like np.histogram
+        rows = self.query(
+            f"SELECT least(floor(({name} - ?) * ?)::BIGINT, ?) AS bin, count(*) FROM dataset "
+            f"WHERE {name} IS NOT NULL GROUP BY bin",
+            [float(low), float(nbins / (high - low)), nbins - 1]
+        ).fetchall()
+        counts = np.zeros(nbins, dtype=np.int64)
+        for index, count in rows:
+            counts[index] = count
+        return edges, counts
+
+    def value_counts(self, col, top=TOP_CATEGORIES):
+        name = quote_identifier(col)
+        rows = self.query(
+            f"SELECT {name}, count(*) AS n FROM dataset WHERE {name} IS NOT NULL "
+            f"GROUP BY {name} ORDER BY n DESC LIMIT {int(top)}"
+        ).fetchall()
+        return pd.Series([n for _, n in rows], index=[value for value, _ in rows], name='count')
+
+    def _grouped_cube(self, keys, names, measures, where='TRUE', parameters=()):
+        """GroupCube from one GROUP BY over the key expressions, whose values label the cells"""
+        aggregates = [f"{func}({quote_identifier(col)})" for col in measures for func in ('sum', 'count', 'min', 'max')]
+        cells = self.query(
+            f"SELECT {', '.join(keys)}, count(*), {', '.join(aggregates)} FROM dataset WHERE {where} GROUP BY ALL",
+            list(parameters)
+        ).df()
+        cells = cells.set_axis(pd.MultiIndex.from_frame(cells.iloc[:, :len(keys)], names=names)).sort_index()
+        stats = cells.iloc[:, len(keys) + 1:].to_numpy(dtype=np.float64).reshape(len(cells), len(measures), 4)
+        def table(i):
+            return pd.DataFrame(stats[:, :, i], index=cells.index, columns=measures)
+        return GroupCube(cells.iloc[:, len(keys)].astype(np.int64), table(0).fillna(0.0), table(1).astype(np.int64), table(2), table(3))
+
+    def group_cube(self, dimensions, measures):
+        """GroupCube from one GROUP BY over the dataset"""
+        keys = [f"coalesce(CAST({quote_identifier(dim)} AS VARCHAR), ?)" for dim in dimensions]
+        return self._grouped_cube(keys, dimensions, measures, parameters=[CUBE_MISSING] * len(keys))
+
+    def time_rollup(self, col, measures):
+        """TimeRollup from one GROUP BY hour over the dataset; text columns are cast to timestamps"""
+        time = f"TRY_CAST({quote_identifier(col)} AS TIMESTAMP)"
+        hours = self._grouped_cube([f"date_trunc('hour', {time})"], [col], measures, where=f"{time} IS NOT NULL")
+        index = pd.DatetimeIndex(hours.rows.index.get_level_values(0), name=col).astype('datetime64[ns]')
+        return TimeRollup(GroupCube(*(table.set_axis(index, axis=0) for table in hours._tables())))
+
+    def data_grid(self):
+        """Grid whose pages are queried from the Parquet file"""
+        return DuckDBGrid(self)
+
+    def correlation(self, cols):
+        """Pearson correlation matrix over pairwise complete rows, in one scan"""
+        pairs = [(a, b) for i, a in enumerate(cols) for b in cols[i + 1:]]
+        values = self.query(
+            "SELECT " + ', '.join(f"corr({quote_identifier(a)}, {quote_identifier(b)})" for a, b in pairs)
+            + " FROM dataset"
+        ).fetchone() if pairs else []
+        matrix = pd.DataFrame(np.eye(len(cols)), index=cols, columns=cols)
+        for (a, b), value in zip(pairs, values):
+            matrix.loc[a, b] = matrix.loc[b, a] = np.nan if value is None else value
+        return matrix
+
+    def box_summary(self, col):
+        """Whiskers at the most extreme values inside the fences, plus a bounded sample of outliers"""
+        name = quote_identifier(col)
+        low, high = float(self.lower_fence[col]), float(self.upper_fence[col])
+        lower, upper = self.query(
+            f"SELECT min({name}), max({name}) FROM dataset WHERE {name} BETWEEN ? AND ?", [low, high]
+        ).fetchone()
+        # A sample clause applies before WHERE, so the outliers are filtered in a subquery first
+        outliers = self.query(
+            f"SELECT * FROM (SELECT {name} FROM dataset WHERE {name} < ? OR {name} > ?) "
+            f"USING SAMPLE reservoir({BOX_OUTLIER_SAMPLE} ROWS) REPEATABLE (0)",
+            [low, high]
+        ).fetchall()
+        return {
+            'q1': self.q1[col],
+            'median': self.median[col],
+            'q3': self.q3[col],
+            'mean': self.mean[col],
+            'lowerfence': self.q1[col] if lower is None else lower,
+            'upperfence': self.q3[col] if upper is None else upper,
+            'outliers': np.array([value for value, in outliers], dtype=np.float64),
+        }
+
+class DuckDBGrid:
+    """DataGrid over a DuckDBProfile's rows, answered by queries so the rows stay on disk.
+
+    Filters become a WHERE clause and the sort an ORDER BY, for which
+    DuckDB keeps only the rows up to the end of the page. Ties are broken
+    by the rows' position in the file, so pages never overlap. Matching row
+    counts are cached per filter combination, so paging runs one query.
+    """
+
+    def __init__(self, profile, max_entries=GRID_CACHE_ENTRIES):
+        self.profile = profile
+        self.n_rows = profile.n_rows
+        self.columns = list(profile.dtypes.index)
+        self.max_entries = max_entries
+        self._counts = OrderedDict()
+        self._lock = threading.Lock()
+        profile.query(f"CREATE OR REPLACE VIEW grid_rows AS SELECT * FROM "
+                      f"read_parquet({quote_literal(profile.path)}, file_row_number = true)")
+
+    def values(self, col):
+        """col's distinct values in sorted order"""
+        name = quote_identifier(col)
+        return self.profile.query(f"SELECT DISTINCT {name} FROM dataset WHERE {name} IS NOT NULL ORDER BY 1").df()[col].tolist()
+
+    def bounds(self, col):
+        """Smallest and largest value of a number or date column, None for an empty column"""
+        name = quote_identifier(col)
+        low, high = self.profile.query(f"SELECT min({name}), max({name}) FROM dataset").df().iloc[0]
+        return None if pd.isna(low) else (low, high)
+
+    def _where(self, filters):
+        clauses, parameters = [], []
+        for col, (kind, argument) in sorted((filters or {}).items(), key=lambda item: item[0]):
+            name = quote_identifier(col)
+            if kind == 'range':
+                clauses.append(f"{name} BETWEEN ? AND ?")
+                parameters += list(argument)
+            elif kind == 'values':
+                picked = [value for value in argument if value is not None]
+                terms = [f"{name} IN ({', '.join('?' * len(picked))})"] if picked else []
+                if None in argument:
+                    terms.append(f"{name} IS NULL")
+                clauses.append(f"({' OR '.join(terms) or 'FALSE'})")
+                parameters += picked
+            elif kind == 'contains':
+                clauses.append(f"contains(lower(CAST({name} AS VARCHAR)), lower(?))")
+                parameters.append(argument)
+            else:
+                raise ValueError(f"Unknown grid filter: {kind}")
+        return ' AND '.join(clauses) or 'TRUE', parameters
+
+    def page(self, start, stop, filters=None, sort=None, descending=False):
+        """(rows start:stop of the filtered and sorted dataset, number of rows passing the filters)"""
+        where, parameters = self._where(filters)
+        key = (where, tuple(map(str, parameters)))
+        with self._lock:
+            count = self._counts.get(key)
+        if count is None:
+            count = self.profile.query(f"SELECT count(*) FROM dataset WHERE {where}", parameters).fetchone()[0]
+            with self._lock:
+                self._counts[key] = count
+                while len(self._counts) > self.max_entries:
+                    self._counts.popitem(last=False)
+        order = f"{quote_identifier(sort)} {'DESC' if descending else 'ASC'} NULLS LAST, " if sort else ''
+        rows = self.profile.query(
+            f"SELECT * EXCLUDE (file_row_number) FROM grid_rows WHERE {where} "
+            f"ORDER BY {order}file_row_number LIMIT ? OFFSET ?", parameters + [max(stop - start, 0), start]
+        ).df()
+        return rows, count
+
+def out_of_core_profile(source, options, approximate=False):
+    """Convert source to Parquet under OUT_OF_CORE_DIR and profile it with DuckDB"""
+    OUT_OF_CORE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, path = tempfile.mkstemp(suffix='.parquet', dir=OUT_OF_CORE_DIR)
+    os.close(fd)
+    try:
+        convert_to_parquet(source, options, path)
+        return DuckDBProfile(path, approximate, owns_file=True)
+    except Exception:
+        Path(path).unlink(missing_ok=True)
+        raise
+
+# Export settings
+EXPORT_CHUNK_ROWS = 50_000
+EXCEL_MAX_ROWS = 1_048_576
+EXPORT_FORMATS = OrderedDict([
+    ('CSV', ('csv', 'text/csv')),
+    ('CSV (gzip)', ('csv.gz', 'application/gzip')),
+    ('Excel', ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')),
+    ('Parquet', ('parquet', 'application/vnd.apache.parquet')),
+])
+
+def available_export_formats(n_rows):
+    """Export formats usable for a dataset of n_rows rows in this environment"""
+    formats = list(EXPORT_FORMATS)
+    if n_rows + 1 > EXCEL_MAX_ROWS:
+        formats.remove('Excel')
+    if importlib.util.find_spec('pyarrow') is None and importlib.util.find_spec('fastparquet') is None:
+        formats.remove('Parquet')
+    return formats
+
+def iter_export_rows(df):
+    """Rows of df as tuples with missing values as None, converted one chunk at a time"""
+    for start in range(0, len(df), EXPORT_CHUNK_ROWS):
+        checkpoint()
+        chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS].astype(object)
+        yield from chunk.where(chunk.notna(), None).itertuples(index=False, name=None)
+
+def write_csv(df, fileobj):
+    """Write df as UTF-8 CSV in row chunks, so only one chunk is ever held as text"""
+    for start in range(0, max(len(df), 1), EXPORT_CHUNK_ROWS):
+        checkpoint()
+        chunk = df.iloc[start:start + EXPORT_CHUNK_ROWS]
+        fileobj.write(chunk.to_csv(index=False, header=start == 0).encode('utf-8'))
+
+def write_xlsx(df, fileobj):
+    """Write df as a single-sheet workbook row by row (xlsxwriter constant-memory mode when available)"""
+    header = [str(col) for col in df.columns]
+    if importlib.util.find_spec('xlsxwriter') is not None:
+        import xlsxwriter
+
+        workbook = xlsxwriter.Workbook(fileobj, {
+            'constant_memory': True,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+            'remove_timezone': True,
+        })
+        worksheet = workbook.add_worksheet('Data')
+        worksheet.write_row(0, 0, header)
+        for row_number, row in enumerate(iter_export_rows(df), start=1):
+            worksheet.write_row(row_number, 0, row)
+        workbook.close()
+    else:
+        from openpyxl import Workbook
+
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet('Data')
+        worksheet.append(header)
+        for row in iter_export_rows(df):
+            worksheet.append(row)
+        workbook.save(fileobj)
+
+def export_bytes(df, export_format):
+    """Serialize df in one of EXPORT_FORMATS"""
+    buffer = BytesIO()
+    if export_format == 'CSV':
+        write_csv(df, buffer)
+    elif export_format == 'CSV (gzip)':
+        with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=6) as compressed:
+            write_csv(df, compressed)
+    elif export_format == 'Excel':
+        write_xlsx(df, buffer)
+    elif export_format == 'Parquet':
+        df.to_parquet(buffer, index=False)
+    else:
+        raise ValueError(f"Unknown export format: {export_format}")
+    return buffer.getvalue()
+
+# Recommendation rule settings
+RULE_SAMPLE_ROWS = 256  # rows read by the checks that look at values rather than column statistics
+MOSTLY_MISSING_RATIO = 0.5
+IDENTIFIER_UNIQUE_RATIO = 0.99
+IDENTIFIER_MIN_ROWS = 50
+HIGH_CARDINALITY_RATIO = 0.5
+HIGH_CARDINALITY_MIN_UNIQUE = 50
+SKEW_THRESHOLD = 2.0
+MIXED_TYPE_SHARE = (0.05, 0.95)  # numeric-looking share of a text column's values that counts as mixed
+DATE_GAP_FACTOR = 30  # largest gap between consecutive dates, in multiples of the median spacing
+REASONING_COLUMNS = 5  # columns named in a column-level recommendation's reasoning
+PRIORITY_ORDER = {'critical': 0, 'high': 1, 'medium': 2}
+
+# Statistics the rules read straight off the profile, without touching the data
+PROFILE_STATISTICS = (
+    'n_rows', 'total_cells', 'missing_total', 'completeness', 'duplicate_count', 'duplicate_percent',
+    'numeric_cols', 'categorical_cols', 'dtypes', 'null_counts', 'non_null_counts', 'unique_counts',
+    'outlier_counts', 'skew',
+)
+RULE_STATISTICS = {}
+RECOMMENDATION_RULES = {}
+
+def rule_statistic(name, needs=()):
+    """Register a statistic computed for all columns at once by func(df, profile, stats).
+
+    stats holds the statistics named in needs, already computed.
+    """
+    def register(func):
+        RULE_STATISTICS[name] = (func, tuple(needs))
+        return func
+    return register
+
+def recommendation_rule(name, needs=()):
+    """Register func(stats) as a rule returning a recommendation dict or None.
+
+    Rules run in registration order and read only the statistics they name
+    in needs: profile attributes (PROFILE_STATISTICS) or registered
+    rule_statistic names. Each statistic is computed once per evaluation,
+    however many rules need it.
+    """
+    def register(func):
+        RECOMMENDATION_RULES[name] = (func, tuple(needs))
+        return func
+    return register
+
+def rule_statistics(df, profile, names):
+    """The named statistics and everything they depend on, each computed once"""
+    stats = {}
+    def resolve(name):
+        if name in stats:
+            return
+        if name in PROFILE_STATISTICS:
+            stats[name] = getattr(profile, name)
+            return
+        func, needs = RULE_STATISTICS[name]
+        for need in needs:
+            resolve(need)
+        stats[name] = func(df, profile, {need: stats[need] for need in needs})
+    for name in names:
+        resolve(name)
+    return stats
+
+def column_recommendation(flagged, details, **fields):
+    """Column-level recommendation for the flagged columns, or None when none are.
+
+    flagged is a boolean Series over columns and details a Series of
+    per-column explanations; the recommendation's 'columns' maps each
+    flagged column to its explanation.
+    """
+    columns = details[flagged.reindex(details.index, fill_value=False)]
+    if columns.empty:
+        return None
+    named = ', '.join(f'{col} ({detail})' for col, detail in columns.head(REASONING_COLUMNS).items())
+    more = f' and {len(columns) - REASONING_COLUMNS} more' if len(columns) > REASONING_COLUMNS else ''
+    return {
+        'score': f'{len(columns)} column{"s" if len(columns) > 1 else ""}',
+        'issue': f'{len(columns)} of {len(flagged)} columns flagged',
+        **fields,
+        'reasoning': f'{fields["reasoning"]}: {named}{more}.',
+        'columns': columns.to_dict(),
+    }
+
+def column_findings(recommendations):
+    """One row per flagged column of the column-level recommendations"""
+    rows = [(col, rec['title'], detail, rec['priority'].upper())
+            for rec in recommendations for col, detail in rec.get('columns', {}).items()]
+    return pd.DataFrame(rows, columns=['Column', 'Check', 'Detail', 'Priority'])
+
+@rule_statistic('kinds', needs=('dtypes',))
+def kinds_statistic(df, profile, stats):
+    return stats['dtypes'].map(column_kind)
+
+@rule_statistic('null_ratio', needs=('null_counts', 'n_rows'))
+def null_ratio_statistic(df, profile, stats):
+    return stats['null_counts'] / max(stats['n_rows'], 1)
+
+@rule_statistic('unique_ratio', needs=('unique_counts', 'non_null_counts'))
+def unique_ratio_statistic(df, profile, stats):
+    return stats['unique_counts'] / stats['non_null_counts'].clip(lower=1)
+
+@rule_statistic('numeric_share', needs=('kinds',))
+def numeric_share_statistic(df, profile, stats):
+    """Share of the non-null values of each text column that parse as numbers, from a sample of rows.
+
+    All text columns are factorized together, so each distinct value is
+    parsed once however many columns and rows it appears in.
+    """
+    cols = [col for col in stats['kinds'][stats['kinds'] == 'text'].index if col in df.columns]
+    if not cols or df.empty:
+        return pd.Series(dtype=np.float64)
+    sample = df.take(np.linspace(0, len(df) - 1, min(len(df), RULE_SAMPLE_ROWS)).astype(np.int64))[cols]
+    codes, uniques = pd.factorize(sample.to_numpy(dtype=object).ravel())
+    numeric = pd.to_numeric(pd.Series(uniques, dtype=object), errors='coerce').notna().to_numpy()
+    # Missing values factorize to -1, which picks this trailing False even when every value is missing
+    numeric = np.append(numeric, False)
+    codes = codes.reshape(sample.shape)
+    present = codes >= 0
+    numeric_values = numeric[codes].sum(axis=0)
+    return pd.Series(numeric_values / np.maximum(present.sum(axis=0), 1), index=cols)
+
+@rule_statistic('date_gaps', needs=('kinds',))
+def date_gaps_statistic(df, profile, stats):
+    """Largest gap between consecutive distinct dates of each datetime column, with the median spacing.
+
+    Needs every row, so it is empty for profiles that only keep a preview.
+    """
+    cols = [col for col in stats['kinds'][stats['kinds'] == 'datetime'].index if col in df.columns]
+    if not cols or profile.streaming or len(df) < 3:
+        return pd.DataFrame(columns=['largest', 'median'], dtype='timedelta64[ns]')
+    values = np.sort(np.column_stack([df[col].to_numpy(dtype='datetime64[ns]').view(np.int64) for col in cols]), axis=0)
+    gaps = np.diff(values, axis=0).astype(np.float64)
+    # NaT sorts first as the smallest int64; steps out of it and repeated dates are not gaps
+    gaps[(values[:-1] == np.iinfo(np.int64).min) | (gaps <= 0)] = np.nan
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        largest, median = np.nanmax(gaps, axis=0), np.nanmedian(gaps, axis=0)
+    return pd.DataFrame({'largest': pd.to_timedelta(largest), 'median': pd.to_timedelta(median)}, index=cols)
+
+@recommendation_rule('completeness', needs=('completeness', 'missing_total', 'total_cells'))
+def completeness_rule(stats):
+    completeness, missing = stats['completeness'], stats['missing_total']
+    if completeness >= 95:
+        return {
+            'priority': 'high',
+            'type': 'success',
+            'icon': '✅',
+            'title': 'Excellent Data Completeness',
+            'score': f'{completeness:.1f}%',
+            'issue': 'None detected',
+            'reasoning': f'Your dataset has {completeness:.1f}% completeness, which is excellent. This means {missing} out of {stats["total_cells"]} total cells are empty.',
+            'impact': 'High quality data enables accurate analysis and reliable insights',
+            'action': 'Continue with confidence - your data quality is excellent!',
+            'benefit': 'More reliable analytics, better decision-making'
+        }
+    if completeness >= 80:
+        return {
+            'priority': 'medium',
+            'type': 'warning',
+            'icon': '⚠️',
+            'title': 'Good Data Completeness',
+            'score': f'{completeness:.1f}%',
+            'issue': f'{missing} missing values detected',
+            'reasoning': f'Your dataset has {completeness:.1f}% completeness. {missing} cells are empty, which may affect analysis accuracy.',
+            'impact': 'Missing data can skew statistical results and reduce model accuracy',
+            'action': 'Consider these strategies: (1) Drop rows with missing values (2) Fill with mean/median (3) Use advanced imputation methods',
+            'benefit': 'Improved data quality leads to more accurate insights'
+        }
+    return {
+        'priority': 'critical',
+        'type': 'danger',
+        'icon': '🚨',
+        'title': 'Low Data Completeness',
+        'score': f'{completeness:.1f}%',
+        'issue': f'{missing} missing values ({100-completeness:.1f}%)',
+        'reasoning': f'Your dataset has only {completeness:.1f}% completeness. {missing} cells are empty, which significantly impacts analysis.',
+        'impact': 'Low completeness severely affects statistical reliability and model performance',
+        'action': '(1) Investigate why data is missing (2) Remove incomplete columns/rows (3) Use imputation if justified (4) Collect missing data if possible',
+        'benefit': 'Addressing data completeness is crucial for meaningful analysis'
+    }
+
+@recommendation_rule('duplicates', needs=('duplicate_count', 'duplicate_percent', 'n_rows'))
+def duplicates_rule(stats):
+    dup_count, dup_percent, n_rows = stats['duplicate_count'], stats['duplicate_percent'], stats['n_rows']
+    if dup_percent == 0:
+        return {
+            'priority': 'high',
+            'type': 'success',
+            'icon': '✅',
+            'title': 'No Duplicate Records Found',
+            'score': '0%',
+            'issue': 'None detected',
+            'reasoning': f'All {n_rows} records in your dataset are unique. No duplicate rows were found.',
+            'impact': 'Ensures each observation is counted only once, preventing bias',
+            'action': 'No action needed - your data is clean!',
+            'benefit': 'Accurate counts and reliable statistical analysis'
+        }
+    if dup_percent < 5:
+        return {
+            'priority': 'medium',
+            'type': 'warning',
+            'icon': '⚠️',
+            'title': 'Minor Duplicate Records',
+            'score': f'{dup_percent:.1f}%',
+            'issue': f'{dup_count} duplicate rows ({dup_percent:.1f}% of data)',
+            'reasoning': f'Found {dup_count} duplicate rows, which is {dup_percent:.1f}% of your {n_rows} total records.',
+            'impact': 'Small percentage of duplicates may slightly bias analysis results',
+            'action': 'Review duplicates: (1) Use df.duplicated() to identify (2) Decide if legitimate or errors (3) Remove if unneeded',
+            'benefit': 'Cleaner data improves accuracy of metrics and statistical tests'
+        }
+    return {
+        'priority': 'critical',
+        'type': 'danger',
+        'icon': '🚨',
+        'title': 'High Duplicate Rate',
+        'score': f'{dup_percent:.1f}%',
+        'issue': f'{dup_count} duplicate rows ({dup_percent:.1f}%)',
+        'reasoning': f'Your dataset contains {dup_count} duplicate rows, which is {dup_percent:.1f}% of total records.',
+        'impact': 'High duplication severely skews analysis - counts are inflated, statistics are unreliable',
+        'action': '(1) Investigate root cause (2) Remove obvious duplicates (3) Keep domain-specific duplicates if valid (4) Prevent future duplicates',
+        'benefit': 'Removing duplicates significantly improves data integrity'
+    }
+
+@recommendation_rule('size', needs=('n_rows',))
+def size_rule(stats):
+    n_rows = stats['n_rows']
+    if n_rows < 50:
+        return {
+            'priority': 'high',
+            'type': 'info',
+            'icon': 'ℹ️',
+            'title': 'Small Sample Size',
+            'score': f'{n_rows} rows',
+            'issue': 'Limited statistical power',
+            'reasoning': f'Your dataset has only {n_rows} rows, which is quite small for statistical analysis.',
+            'impact': 'Small samples have high sampling error and low statistical power',
+            'action': '(1) Collect more data if possible (2) Use methods suited for small samples (3) Increase precision of measurements',
+            'benefit': 'Larger samples provide more reliable and generalizable results'
+        }
+    if n_rows > 100000:
+        return {
+            'priority': 'medium',
+            'type': 'info',
+            'icon': 'ℹ️',
+            'title': 'Large Dataset Detected',
+            'score': f'{n_rows:,} rows',
+            'issue': 'May require optimization',
+            'reasoning': f'Your dataset contains {n_rows:,} rows, which is quite large.',
+            'impact': 'Large datasets need optimized processing and may have different characteristics',
+            'action': '(1) Use the duckdb compute backend to analyze the full dataset out-of-core (2) Use aggregation for visualization (3) Use "Explore a sample" for quick interactive exploration of large CSV files',
+            'benefit': 'Proper handling of large data enables powerful insights from scale'
+        }
+    return {
+        'priority': 'high',
+        'type': 'success',
+        'icon': '✅',
+        'title': 'Optimal Dataset Size',
+        'score': f'{n_rows:,} rows',
+        'issue': 'None',
+        'reasoning': f'Your dataset has {n_rows:,} rows, which is ideal for comprehensive analysis.',
+        'impact': 'Good balance between statistical power and practical manageability',
+        'action': 'Proceed with full analysis - your data size is ideal!',
+        'benefit': 'Sufficient data for reliable statistical inference and insights'
+    }
+
+@recommendation_rule('type_diversity', needs=('numeric_cols', 'categorical_cols'))
+def type_diversity_rule(stats):
+    numeric_cols, categorical_cols = len(stats['numeric_cols']), len(stats['categorical_cols'])
+    if numeric_cols == 0:
+        return {
+            'priority': 'critical',
+            'type': 'warning',
+            'icon': '⚠️',
+            'title': 'No Numeric Data Found',
+            'score': '0 numeric columns',
+            'issue': 'Limited quantitative analysis possible',
+            'reasoning': f'Your dataset contains only {categorical_cols} text/categorical columns and no numeric columns.',
+            'impact': 'Restricts ability to perform statistical analysis, correlation studies, or quantitative modeling',
+            'action': '(1) Convert categorical to numeric (2) Add numeric measurements (3) Create calculated fields (4) Use text analysis if appropriate',
+            'benefit': 'Adding numeric data enables statistical analysis, trends, and predictions'
+        }
+    if categorical_cols == 0:
+        return {
+            'priority': 'medium',
+            'type': 'info',
+            'icon': 'ℹ️',
+            'title': 'Purely Numeric Dataset',
+            'score': f'{numeric_cols} numeric columns',
+            'issue': 'No categorical context',
+            'reasoning': f'Your dataset has {numeric_cols} numeric columns but no categorical columns for grouping/segmentation.',
+            'impact': 'Good for quantitative analysis but lacks dimensions for segmentation or classification',
+            'action': '(1) Add categorical identifiers if available (2) Create categories from numeric ranges (3) Focus on correlation/trends',
+            'benefit': 'Numeric data enables powerful statistical and mathematical analysis'
+        }
+    return {
+        'priority': 'high',
+        'type': 'success',
+        'icon': '✅',
+        'title': 'Good Data Type Mix',
+        'score': f'{numeric_cols} numeric + {categorical_cols} categorical',
+        'issue': 'None',
+        'reasoning': f'Your dataset has {numeric_cols} numeric columns and {categorical_cols} categorical columns.',
+        'impact': 'Balanced mix enables both quantitative analysis and segmentation',
+        'action': 'Excellent mix - use numeric for analytics and categorical for grouping!',
+        'benefit': 'Enables comprehensive analysis including aggregation, comparison, and modeling'
+    }
+
+@recommendation_rule('outliers', needs=('outlier_counts', 'n_rows'))
+def outliers_rule(stats):
+    outliers = stats['outlier_counts']
+    outlier_cols = outliers[outliers > stats['n_rows'] * 0.05]
+    if len(outlier_cols):
+        return {
+            'priority': 'medium',
+            'type': 'info',
+            'icon': 'ℹ️',
+            'title': 'Outliers Detected',
+            'score': f'{len(outlier_cols)} columns with outliers',
+            'issue': f'Found outliers in {len(outlier_cols)} numeric columns',
+            'reasoning': f'Detected potential outliers (values > 1.5×IQR) in columns: {", ".join(map(str, outlier_cols.index[:3]))}',
+            'impact': 'Outliers can skew means, inflate standard deviations, and affect models',
+            'action': '(1) Visualize with box plots (2) Verify if valid or errors (3) Decide: keep, transform, or remove (4) Document decisions',
+            'benefit': 'Proper outlier handling improves statistical reliability and model performance',
+            'columns': {col: f'{count:,} outliers' for col, count in outlier_cols.items()},
+        }
+    return {
+        'priority': 'high',
+        'type': 'success',
+        'icon': '✅',
+        'title': 'No Significant Outliers',
+        'score': '0 columns flagged',
+        'issue': 'None detected',
+        'reasoning': 'No significant outliers detected in your numeric columns using IQR method.',
+        'impact': 'Clean data without extreme values enables more reliable statistical analysis',
+        'action': 'Continue analysis with confidence - data is well-behaved!',
+        'benefit': 'No outlier handling needed - focus on insights'
+    }
+
+@recommendation_rule('empty_columns', needs=('null_ratio',))
+def empty_columns_rule(stats):
+    null_ratio = stats['null_ratio']
+    return column_recommendation(
+        null_ratio >= MOSTLY_MISSING_RATIO, (null_ratio * 100).map('{:.0f}% missing'.format),
+        priority='critical' if (null_ratio == 1).any() else 'medium',
+        type='warning',
+        icon='🕳️',
+        title='Mostly Empty Columns',
+        reasoning=f'These columns are at least {MOSTLY_MISSING_RATIO:.0%} empty',
+        impact='Mostly empty columns add little information and distort completeness and correlations',
+        action='(1) Drop columns that are empty by design (2) Check the source for broken exports or renamed fields (3) Impute only when the gaps are random',
+        benefit='A narrower, denser dataset that is faster to analyze and easier to read'
+    )
+
+@recommendation_rule('constant_columns', needs=('unique_counts', 'non_null_counts'))
+def constant_columns_rule(stats):
+    unique, non_null = stats['unique_counts'], stats['non_null_counts']
+    return column_recommendation(
+        (unique == 1) & (non_null > 0), pd.Series('a single value', index=unique.index),
+        priority='medium',
+        type='warning',
+        icon='🧱',
+        title='Constant Columns',
+        reasoning='These columns hold the same value in every non-empty row',
+        impact='Constant columns carry no information and break correlations and models that divide by the variance',
+        action='(1) Drop them from the analysis (2) Keep the value as metadata if it describes the whole file (e.g. a region or batch)',
+        benefit='Fewer columns to scan, with no loss of information'
+    )
+
+@recommendation_rule('identifier_columns', needs=('unique_ratio', 'unique_counts', 'kinds', 'dtypes', 'n_rows'))
+def identifier_columns_rule(stats):
+    # Continuous measurements are all distinct too; only text and integer columns are taken for keys
+    keys = (stats['kinds'] == 'text') | stats['dtypes'].map(pd.api.types.is_integer_dtype).astype(bool)
+    flagged = (stats['unique_ratio'] >= IDENTIFIER_UNIQUE_RATIO) & keys & (stats['n_rows'] >= IDENTIFIER_MIN_ROWS)
+    return column_recommendation(
+        flagged, stats['unique_counts'].map('{:,} distinct values'.format),
+        priority='medium',
+        type='info',
+        icon='🆔',
+        title='Identifier-Like Columns',
+        reasoning='Nearly every value of these columns is distinct, as in IDs, keys or free text',
+        impact='Identifiers look numeric or categorical but their averages, correlations and category counts are meaningless',
+        action='(1) Exclude them from statistics and charts (2) Use them as keys to join or deduplicate (3) Check that keys expected to be unique really are',
+        benefit='Statistics and charts that describe measurements rather than labels'
+    )
+
+@recommendation_rule('high_cardinality', needs=('unique_ratio', 'unique_counts', 'kinds'))
+def high_cardinality_rule(stats):
+    unique, unique_ratio = stats['unique_counts'], stats['unique_ratio']
+    flagged = ((stats['kinds'] == 'text') & (unique >= HIGH_CARDINALITY_MIN_UNIQUE)
+               & (unique_ratio >= HIGH_CARDINALITY_RATIO) & (unique_ratio < IDENTIFIER_UNIQUE_RATIO))
+    return column_recommendation(
+        flagged, unique.map('{:,} distinct values'.format),
+        priority='medium',
+        type='info',
+        icon='🔠',
+        title='High-Cardinality Text Columns',
+        reasoning='These text columns have too many distinct values to group by',
+        impact='Category charts and group-by summaries over them show long tails of tiny groups',
+        action='(1) Normalize spelling, case and whitespace (2) Bucket rare values into "Other" (3) Extract a coarser category (e.g. domain, prefix, city)',
+        benefit='Categories that segment the data into meaningful groups'
+    )
+
+@recommendation_rule('mixed_types', needs=('numeric_share',))
+def mixed_types_rule(stats):
+    share = stats['numeric_share']
+    low, high = MIXED_TYPE_SHARE
+    return column_recommendation(
+        (share >= low) & (share <= high), (share * 100).map('{:.0f}% numeric'.format),
+        priority='medium',
+        type='warning',
+        icon='🔀',
+        title='Mixed-Type Columns',
+        reasoning='These text columns mix numbers with other text',
+        impact='Numbers stored among text are left out of every numeric statistic, and sorting and filtering treat them as text',
+        action='(1) Convert the column with pd.to_numeric(errors="coerce") if it should be numeric (2) Move notes and units into a separate column (3) Fix the placeholders used for missing values (e.g. "N/A", "-")',
+        benefit='Columns with one type that every statistic and chart can use'
+    )
+
+@recommendation_rule('numeric_text', needs=('numeric_share',))
+def numeric_text_rule(stats):
+    share = stats['numeric_share']
+    return column_recommendation(
+        share > MIXED_TYPE_SHARE[1], (share * 100).map('{:.0f}% numeric'.format),
+        priority='medium',
+        type='warning',
+        icon='🔢',
+        title='Numbers Stored as Text',
+        reasoning='Nearly all values of these text columns are numbers',
+        impact='They are left out of numeric statistics, charts and correlations, and sort as text (10 before 9)',
+        action='(1) Convert with pd.to_numeric(errors="coerce") (2) Set the cell format to Number in the source workbook (3) Strip thousands separators and currency symbols first',
+        benefit='The columns join the numeric analysis'
+    )
+
+@recommendation_rule('skewed_columns', needs=('skew',))
+def skewed_columns_rule(stats):
+    skew = stats['skew']
+    return column_recommendation(
+        skew.abs() > SKEW_THRESHOLD, skew.map('skewness {:.1f}'.format),
+        priority='medium',
+        type='info',
+        icon='📐',
+        title='Highly Skewed Columns',
+        reasoning=f'These numeric columns have a skewness beyond ±{SKEW_THRESHOLD:g}',
+        impact='Means and standard deviations of skewed columns are dominated by the tail and misdescribe typical values',
+        action='(1) Report medians and quartiles instead of means (2) Use a log or Box-Cox transform for modeling (3) Check whether the tail holds outliers or errors',
+        benefit='Summaries and models that reflect the typical row'
+    )
+
+@recommendation_rule('date_gaps', needs=('date_gaps',))
+def date_gaps_rule(stats):
+    gaps = stats['date_gaps']
+    if gaps.empty:
+        return None
+    return column_recommendation(
+        gaps['largest'] > gaps['median'] * DATE_GAP_FACTOR,
+        gaps.apply(lambda gap: f'{gap["largest"]} gap, usually {gap["median"]}', axis=1),
+        priority='medium',
+        type='warning',
+        icon='📅',
+        title='Gaps in Date Columns',
+        reasoning=f'The largest gap between consecutive dates in these columns is over {DATE_GAP_FACTOR} times their usual spacing',
+        impact='Missing periods show up as drops in totals and bias trends and period-over-period comparisons',
+        action='(1) Check whether the period is missing from the source (2) Mark the gap explicitly in charts (3) Compare only complete periods',
+        benefit='Trends and comparisons that are not distorted by missing periods'
+    )
+
+def generate_recommendations(df, profile=None, instrument=None, rules=None):
+    """Evaluate the recommendation rules against the profile's column statistics.
+
+    rules names the registered rules to run, all of them by default. The
+    statistics the rules declare are computed first, once each, then every
+    rule runs as an instrumented rule.<name> stage. Recommendations are
+    returned most urgent first.
+    """
+    if instrument is None:
+        instrument = Instrumentation()
+    with instrument.stage('recommendations'):
+        return _generate_recommendations(df, profile, instrument, rules)
+
+def _generate_recommendations(df, profile, instrument, rules):
+    if profile is None:
+        with instrument.stage('recommendations.profile'):
+            profile = DatasetProfile(df)
+    rules = [(name, *RECOMMENDATION_RULES[name]) for name in (rules or RECOMMENDATION_RULES)]
+    instrument.lap('rule.statistics')
+    stats = rule_statistics(df, profile, {need for _, _, needs in rules for need in needs})
+    recommendations = []
+    for name, func, needs in rules:
+        instrument.lap(f'rule.{name}')
+        recommendation = func({need: stats[need] for need in needs})
+        if recommendation is not None:
+            recommendations.append(recommendation)
+    instrument.lap()
+
+    return sorted(recommendations, key=lambda x: PRIORITY_ORDER.get(x['priority'], 3))
+
+# Batch analysis settings
+ANALYZE_EXTENSIONS = ('.xlsx', '.xls', '.csv')
+PARQUET_BATCH_ROWS = 256
+
+def options_for_path(path, engine=None, sheet=None, optimize_memory=False):
+    """Parse options for a file on disk, using the fastest available Excel reader by default"""
+    path = Path(path)
+    if path.suffix.lower() == '.csv':
+        return {'format': 'csv', 'optimize_memory': optimize_memory}
+    return {
+        'format': 'excel',
+        'engine': engine or available_excel_readers(path.name)[0],
+        'sheet': sheet,
+        'optimize_memory': optimize_memory,
+    }
+
+def analyze_file(path, engine=None, sheet=None, optimize_memory=False, approximate=False,
+                 stream=False, chunk_rows=STREAM_CHUNK_ROWS, backend='pandas'):
+    """Profile one file and evaluate the recommendation rules.
+
+    Returns a JSON-serializable dict with the dataset summary, the
+    recommendations and the seconds spent in each stage. Failures are
+    reported in the 'error' field rather than raised, so one bad file does
+    not abort a batch.
+    """
+    started = time.perf_counter()
+    result = {'file': str(path), 'error': None}
+    timings = {}
+    try:
+        options = options_for_path(path, engine, sheet, optimize_memory)
+        stage = time.perf_counter()
+        if backend == 'duckdb':
+            profile = out_of_core_profile(path, options, approximate)
+            df = profile.preview
+            timings['parse_profile_s'] = time.perf_counter() - stage
+        elif stream and options['format'] == 'csv':
+            profile = stream_csv_profile(path, chunk_rows, options)
+            df = profile.preview
+            timings['parse_profile_s'] = time.perf_counter() - stage
+        else:
+            df = parse_upload(Path(path).read_bytes(), options)
+            timings['parse_s'] = time.perf_counter() - stage
+            stage = time.perf_counter()
+            profile = DatasetProfile(df, approximate)
+            timings['profile_s'] = time.perf_counter() - stage
+        stage = time.perf_counter()
+        recommendations = generate_recommendations(df, profile)
+        timings['recommend_s'] = time.perf_counter() - stage
+        result.update({
+            'rows': int(profile.n_rows),
+            'columns': int(profile.n_cols),
+            'numeric_columns': len(profile.numeric_cols),
+            'text_columns': len(profile.categorical_cols),
+            'missing_values': int(profile.missing_total),
+            'completeness': round(float(profile.completeness), 3),
+            'duplicate_rows': int(profile.duplicate_count),
+            'recommendations': recommendations,
+        })
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+    timings['total_s'] = time.perf_counter() - started
+    result['timings'] = {stage: round(seconds, 4) for stage, seconds in timings.items()}
+    return result
+
+def analyze_files(paths, jobs=None, **kwargs):
+    """Analyze files across a process pool, yielding each result as soon as it is ready.
+
+    jobs=None uses every core; jobs=1 runs in this process. Results arrive
+    in completion order, not input order.
+    """
+    if jobs == 1:
+        for path in paths:
+            yield analyze_file(path, **kwargs)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(analyze_file, path, **kwargs) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+def find_files(inputs, recursive=False):
+    """Spreadsheet files named by inputs, expanding directories"""
+    files = []
+    for item in inputs:
+        item = Path(item)
+        if item.is_dir():
+            candidates = item.rglob('*') if recursive else item.iterdir()
+            files.extend(sorted(
+                path for path in candidates
+                if path.is_file() and path.suffix.lower() in ANALYZE_EXTENSIONS and not path.name.startswith('~$')
+            ))
+        else:
+            files.append(item)
+    return files
+
+class JsonLinesWriter:
+    """Writes one JSON object per line, flushing after every result"""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+
+    def write(self, result):
+        self.fileobj.write(json.dumps(result, default=str) + '\n')
+        self.fileobj.flush()
+
+    def close(self):
+        if self.fileobj is not sys.stdout:
+            self.fileobj.close()
+
+class ParquetWriter:
+    """Writes results to Parquet in row groups of PARQUET_BATCH_ROWS results.
+
+    Nested fields (recommendations, timings) are stored as JSON strings so
+    every row group shares one flat schema.
+    """
+
+    COLUMNS = OrderedDict([
+        ('file', 'string'), ('error', 'string'), ('rows', 'int64'), ('columns', 'int64'),
+        ('numeric_columns', 'int64'), ('text_columns', 'int64'), ('missing_values', 'int64'),
+        ('completeness', 'float64'), ('duplicate_rows', 'int64'),
+        ('recommendations', 'string'), ('timings', 'string'),
+    ])
+
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self.schema = pa.schema([(name, pa.type_for_alias(dtype)) for name, dtype in self.COLUMNS.items()])
+        self._writer = pq.ParquetWriter(path, self.schema)
+        self._rows = []
+
+    def write(self, result):
+        row = dict(result)
+        for field in ('recommendations', 'timings'):
+            if row.get(field) is not None:
+                row[field] = json.dumps(row[field], default=str)
+        self._rows.append(row)
+        if len(self._rows) >= PARQUET_BATCH_ROWS:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        columns = {name: [row.get(name) for row in self._rows] for name in self.COLUMNS}
+        self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self.schema))
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+def open_result_writer(output):
+    """JSON Lines to stdout or a file, or Parquet when output ends in .parquet"""
+    if output is None or output == '-':
+        return JsonLinesWriter(sys.stdout)
+    if output.lower().endswith('.parquet'):
+        return ParquetWriter(output)
+    return JsonLinesWriter(open(output, 'w', encoding='utf-8'))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='excel-analyzer', description="Excel Analyzer Pro batch analysis")
+    commands = parser.add_subparsers(dest='command', required=True)
+    analyze = commands.add_parser('analyze', help="profile spreadsheets and evaluate the recommendation rules")
+    analyze.add_argument('inputs', nargs='+', help="files or directories of .xlsx/.xls/.csv files")
+    analyze.add_argument('--jobs', '-j', type=int, default=None, help="worker processes (default: all cores)")
+    analyze.add_argument('--output', '-o', default=None,
+                         help="results file; .parquet writes Parquet, anything else JSON Lines (default: stdout)")
+    analyze.add_argument('--recursive', '-r', action='store_true', help="descend into subdirectories")
+    analyze.add_argument('--engine', choices=list(EXCEL_READERS), default=None, help="Excel reader backend")
+    analyze.add_argument('--sheet', default=None, help="sheet to analyze (default: first)")
+    analyze.add_argument('--approximate', action='store_true', help="sketch-based quartiles and unique counts")
+    analyze.add_argument('--optimize-memory', action='store_true', help="compact dtypes after parsing")
+    analyze.add_argument('--stream', action='store_true', help="profile CSV files in chunks")
+    analyze.add_argument('--chunk-rows', type=int, default=STREAM_CHUNK_ROWS, help="rows per chunk with --stream")
+    analyze.add_argument('--backend', choices=COMPUTE_BACKENDS, default='pandas',
+                         help="duckdb profiles files larger than memory out-of-core")
+    args = parser.parse_args(argv)
+
+    files = find_files(args.inputs, args.recursive)
+    writer = open_result_writer(args.output)
+    started = time.perf_counter()
+    failures = 0
+    try:
+        for result in analyze_files(
+            files, jobs=args.jobs, engine=args.engine, sheet=args.sheet, optimize_memory=args.optimize_memory,
+            approximate=args.approximate, stream=args.stream, chunk_rows=args.chunk_rows, backend=args.backend
+        ):
+            failures += result['error'] is not None
+            writer.write(result)
+    finally:
+        writer.close()
+    print(f"Analyzed {len(files)} files ({failures} failed) in {time.perf_counter() - started:.1f}s",
+          file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,75 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from io import StringIO, BytesIO
+import os
+import uuid
+from datetime import timedelta
 import warnings
+from analyzer import (
+    BOX_OUTLIER_SAMPLE,
+    COLUMN_EXECUTORS,
+    CUBE_MAX_CARDINALITY,
+    CUBE_MISSING,
+    CUBE_STATISTICS,
+    CORRELATION_HEATMAP_MAX,
+    CORRELATION_SAMPLE_ROWS,
+    EXPORT_FORMATS,
+    GRID_PAGE_SIZES,
+    HISTOGRAM_BINS,
+    INSTRUMENT_LOG_ENV,
+    PARSE_CACHE_MAX_ENTRIES,
+    SAMPLE_CONFIDENCE,
+    SAMPLE_ROWS,
+    STREAM_CHUNK_ROWS,
+    TOP_CATEGORIES,
+    TOP_CORRELATION_PAIRS,
+    TIMESERIES_LEVELS,
+    TIMESERIES_POINTS,
+    TOP_DUPLICATE_GROUPS,
+    DuplicateIndex,
+    Instrumentation,
+    JobManager,
+    build_profile,
+    available_backends,
+    available_excel_readers,
+    available_export_formats,
+    box_summary,
+    clustered_correlation,
+    column_findings,
+    column_histogram,
+    correlation_matrix,
+    cube_dimensions,
+    data_grid,
+    dataset_cache_key,
+    datetime_columns,
+    exact_profile,
+    export_bytes,
+    generate_recommendations,
+    grid_filter_kind,
+    group_cube,
+    analyze_sheets,
+    ingest_upload,
+    list_sheets,
+    lttb,
+    read_header,
+    schema_groups,
+    time_rollup,
+    top_correlated_pairs,
+    union_profile,
+    value_counts,
+    workbook_summary,
+)
 warnings.filterwarnings('ignore')
 
+# Detailed analysis views, and the widget keys inside them whose selections survive switching views
+VIEWS = ["📋 Overview", "🔍 Quality", "📊 Visualize", "🧮 Breakdown", "📈 Time Series", "💡 All Insights", "⚙️ Advanced"]
+VIEW_WIDGET_KEYS = ['dup_subset', 'dup_normalize', 'dup_group', 'dist_col', 'cat_col', 'corr_sample', 'corr_view',
+                    'cube_measure', 'cube_stat', 'cube_rows', 'cube_cols', 'cube_drill', 'cube_drill_value',
+                    'ts_col', 'ts_measure', 'ts_stat', 'ts_window',
+                    'grid_filters', 'grid_sort', 'grid_descending', 'grid_page_size', 'grid_page',
+                    'outlier_col', 'stat_col', 'export_format']
+VIEW_WIDGET_PREFIXES = ('grid_filter_',)  # widgets created per column
+
 # Page configuration
 st.set_page_config(
     page_title="Excel Analyzer Pro",
@@ -22,7 +85,7 @@ st.markdown("""
         padding: 20px;
         background-color: #f8f9fa;
     }
-    .stTabs [data-baseweb="tab-list"] {
+    div[role="radiogroup"] {
         gap: 24px;
     }
     .stMetric {
@@ -68,251 +131,322 @@ if 'df' not in st.session_state:
     st.session_state.df = None
 if 'filename' not in st.session_state:
     st.session_state.filename = None
+if 'upload_id' not in st.session_state:
+    st.session_state.upload_id = None
+if 'dataset_key' not in st.session_state:
+    st.session_state.dataset_key = None
+if 'stream_profile' not in st.session_state:
+    st.session_state.stream_profile = None
+if 'session_id' not in st.session_state:
+    # Streamlit's own session id, so the job manager can tell when the session has closed
+    ctx = get_script_run_ctx()
+    st.session_state.session_id = ctx.session_id if ctx is not None else uuid.uuid4().hex
+if 'exact_job' not in st.session_state:
+    st.session_state.exact_job = None
+if 'parse_job' not in st.session_state:
+    st.session_state.parse_job = None
+# Widgets of the views not shown aren't rendered, and Streamlit drops the state of unrendered widgets.
+# Since their keys are assigned here, those widgets get their defaults from st.session_state.setdefault
+# rather than value= or index=, which Streamlit warns about for keys set through session state.
+for key in list(st.session_state.keys()):
+    if key in VIEW_WIDGET_KEYS or key.startswith(VIEW_WIDGET_PREFIXES):
+        st.session_state[key] = st.session_state[key]
 
-# Function to generate detailed recommendations with reasoning
-def generate_recommendations(df):
-    """Generate detailed recommendations with reasoning and actionable insights"""
-    recommendations = []
-    
-    # Rule 1: Data Completeness
-    missing_data = df.isnull().sum()
-    completeness = (1 - missing_data.sum() / (len(df) * len(df.columns))) * 100
-    
-    if completeness >= 95:
-        recommendations.append({
-            'priority': 'high',
-            'type': 'success',
-            'icon': '✅',
-            'title': 'Excellent Data Completeness',
-            'score': f'{completeness:.1f}%',
-            'issue': 'None detected',
-            'reasoning': f'Your dataset has {completeness:.1f}% completeness, which is excellent. This means {missing_data.sum()} out of {len(df) * len(df.columns)} total cells are empty.',
-            'impact': 'High quality data enables accurate analysis and reliable insights',
-            'action': 'Continue with confidence - your data quality is excellent!',
-            'benefit': 'More reliable analytics, better decision-making'
-        })
-    elif completeness >= 80:
-        recommendations.append({
-            'priority': 'medium',
-            'type': 'warning',
-            'icon': '⚠️',
-            'title': 'Good Data Completeness',
-            'score': f'{completeness:.1f}%',
-            'issue': f'{missing_data.sum()} missing values detected',
-            'reasoning': f'Your dataset has {completeness:.1f}% completeness. {missing_data.sum()} cells are empty, which may affect analysis accuracy.',
-            'impact': 'Missing data can skew statistical results and reduce model accuracy',
-            'action': 'Consider these strategies: (1) Drop rows with missing values (2) Fill with mean/median (3) Use advanced imputation methods',
-            'benefit': 'Improved data quality leads to more accurate insights'
-        })
-    else:
-        recommendations.append({
-            'priority': 'critical',
-            'type': 'danger',
-            'icon': '🚨',
-            'title': 'Low Data Completeness',
-            'score': f'{completeness:.1f}%',
-            'issue': f'{missing_data.sum()} missing values ({100-completeness:.1f}%)',
-            'reasoning': f'Your dataset has only {completeness:.1f}% completeness. {missing_data.sum()} cells are empty, which significantly impacts analysis.',
-            'impact': 'Low completeness severely affects statistical reliability and model performance',
-            'action': '(1) Investigate why data is missing (2) Remove incomplete columns/rows (3) Use imputation if justified (4) Collect missing data if possible',
-            'benefit': 'Addressing data completeness is crucial for meaningful analysis'
-        })
-    
-    # Rule 2: Duplicate Detection
-    dup_count = df.duplicated().sum()
-    dup_percent = (dup_count / len(df)) * 100
-    
-    if dup_percent == 0:
-        recommendations.append({
-            'priority': 'high',
-            'type': 'success',
-            'icon': '✅',
-            'title': 'No Duplicate Records Found',
-            'score': '0%',
-            'issue': 'None detected',
-            'reasoning': f'All {len(df)} records in your dataset are unique. No duplicate rows were found.',
-            'impact': 'Ensures each observation is counted only once, preventing bias',
-            'action': 'No action needed - your data is clean!',
-            'benefit': 'Accurate counts and reliable statistical analysis'
-        })
-    elif dup_percent < 5:
-        recommendations.append({
-            'priority': 'medium',
-            'type': 'warning',
-            'icon': '⚠️',
-            'title': 'Minor Duplicate Records',
-            'score': f'{dup_percent:.1f}%',
-            'issue': f'{dup_count} duplicate rows ({dup_percent:.1f}% of data)',
-            'reasoning': f'Found {dup_count} duplicate rows, which is {dup_percent:.1f}% of your {len(df)} total records.',
-            'impact': 'Small percentage of duplicates may slightly bias analysis results',
-            'action': 'Review duplicates: (1) Use df.duplicated() to identify (2) Decide if legitimate or errors (3) Remove if unneeded',
-            'benefit': 'Cleaner data improves accuracy of metrics and statistical tests'
-        })
-    else:
-        recommendations.append({
-            'priority': 'critical',
-            'type': 'danger',
-            'icon': '🚨',
-            'title': 'High Duplicate Rate',
-            'score': f'{dup_percent:.1f}%',
-            'issue': f'{dup_count} duplicate rows ({dup_percent:.1f}%)',
-            'reasoning': f'Your dataset contains {dup_count} duplicate rows, which is {dup_percent:.1f}% of total records.',
-            'impact': 'High duplication severely skews analysis - counts are inflated, statistics are unreliable',
-            'action': '(1) Investigate root cause (2) Remove obvious duplicates (3) Keep domain-specific duplicates if valid (4) Prevent future duplicates',
-            'benefit': 'Removing duplicates significantly improves data integrity'
-        })
-    
-    # Rule 3: Dataset Size
-    if len(df) < 50:
-        recommendations.append({
-            'priority': 'high',
-            'type': 'info',
-            'icon': 'ℹ️',
-            'title': 'Small Sample Size',
-            'score': f'{len(df)} rows',
-            'issue': 'Limited statistical power',
-            'reasoning': f'Your dataset has only {len(df)} rows, which is quite small for statistical analysis.',
-            'impact': 'Small samples have high sampling error and low statistical power',
-            'action': '(1) Collect more data if possible (2) Use methods suited for small samples (3) Increase precision of measurements',
-            'benefit': 'Larger samples provide more reliable and generalizable results'
-        })
-    elif len(df) > 100000:
-        recommendations.append({
-            'priority': 'medium',
-            'type': 'info',
-            'icon': 'ℹ️',
-            'title': 'Large Dataset Detected',
-            'score': f'{len(df):,} rows',
-            'issue': 'May require optimization',
-            'reasoning': f'Your dataset contains {len(df):,} rows, which is quite large.',
-            'impact': 'Large datasets need optimized processing and may have different characteristics',
-            'action': '(1) Consider sampling for exploratory analysis (2) Use aggregation for visualization (3) Profile data performance',
-            'benefit': 'Proper handling of large data enables powerful insights from scale'
-        })
-    else:
-        recommendations.append({
-            'priority': 'high',
-            'type': 'success',
-            'icon': '✅',
-            'title': 'Optimal Dataset Size',
-            'score': f'{len(df):,} rows',
-            'issue': 'None',
-            'reasoning': f'Your dataset has {len(df):,} rows, which is ideal for comprehensive analysis.',
-            'impact': 'Good balance between statistical power and practical manageability',
-            'action': 'Proceed with full analysis - your data size is ideal!',
-            'benefit': 'Sufficient data for reliable statistical inference and insights'
-        })
-    
-    # Rule 4: Data Type Diversity
-    numeric_cols_list = df.select_dtypes(include=[np.number]).columns.tolist()
-    categorical_cols_list = df.select_dtypes(include=['object']).columns.tolist()
-    numeric_cols = len(numeric_cols_list)
-    categorical_cols = len(categorical_cols_list)
-    
-    if numeric_cols == 0:
-        recommendations.append({
-            'priority': 'critical',
-            'type': 'warning',
-            'icon': '⚠️',
-            'title': 'No Numeric Data Found',
-            'score': '0 numeric columns',
-            'issue': 'Limited quantitative analysis possible',
-            'reasoning': f'Your dataset contains only {categorical_cols} text/categorical columns and no numeric columns.',
-            'impact': 'Restricts ability to perform statistical analysis, correlation studies, or quantitative modeling',
-            'action': '(1) Convert categorical to numeric (2) Add numeric measurements (3) Create calculated fields (4) Use text analysis if appropriate',
-            'benefit': 'Adding numeric data enables statistical analysis, trends, and predictions'
-        })
-    elif numeric_cols > 0 and categorical_cols == 0:
-        recommendations.append({
-            'priority': 'medium',
-            'type': 'info',
-            'icon': 'ℹ️',
-            'title': 'Purely Numeric Dataset',
-            'score': f'{numeric_cols} numeric columns',
-            'issue': 'No categorical context',
-            'reasoning': f'Your dataset has {numeric_cols} numeric columns but no categorical columns for grouping/segmentation.',
-            'impact': 'Good for quantitative analysis but lacks dimensions for segmentation or classification',
-            'action': '(1) Add categorical identifiers if available (2) Create categories from numeric ranges (3) Focus on correlation/trends',
-            'benefit': 'Numeric data enables powerful statistical and mathematical analysis'
-        })
-    else:
-        recommendations.append({
-            'priority': 'high',
-            'type': 'success',
-            'icon': '✅',
-            'title': 'Good Data Type Mix',
-            'score': f'{numeric_cols} numeric + {categorical_cols} categorical',
-            'issue': 'None',
-            'reasoning': f'Your dataset has {numeric_cols} numeric columns and {categorical_cols} categorical columns.',
-            'impact': 'Balanced mix enables both quantitative analysis and segmentation',
-            'action': 'Excellent mix - use numeric for analytics and categorical for grouping!',
-            'benefit': 'Enables comprehensive analysis including aggregation, comparison, and modeling'
-        })
-    
-    # Rule 5: Outliers Detection
-    outlier_cols = []
-    for col_name in numeric_cols_list:
-        try:
-            Q1 = df[col_name].quantile(0.25)
-            Q3 = df[col_name].quantile(0.75)
-            IQR = Q3 - Q1
-            outliers = df[(df[col_name] < Q1 - 1.5*IQR) | (df[col_name] > Q3 + 1.5*IQR)]
-            if len(outliers) > len(df) * 0.05:
-                outlier_cols.append((col_name, len(outliers)))
-        except:
-            pass
-    
-    if outlier_cols:
-        recommendations.append({
-            'priority': 'medium',
-            'type': 'info',
-            'icon': 'ℹ️',
-            'title': 'Outliers Detected',
-            'score': f'{len(outlier_cols)} columns with outliers',
-            'issue': f'Found outliers in {len(outlier_cols)} numeric columns',
-            'reasoning': f'Detected potential outliers (values > 1.5×IQR) in columns: {", ".join([col[0] for col in outlier_cols[:3]])}',
-            'impact': 'Outliers can skew means, inflate standard deviations, and affect models',
-            'action': '(1) Visualize with box plots (2) Verify if valid or errors (3) Decide: keep, transform, or remove (4) Document decisions',
-            'benefit': 'Proper outlier handling improves statistical reliability and model performance'
-        })
-    else:
-        recommendations.append({
-            'priority': 'high',
-            'type': 'success',
-            'icon': '✅',
-            'title': 'No Significant Outliers',
-            'score': '0 columns flagged',
-            'issue': 'None detected',
-            'reasoning': 'No significant outliers detected in your numeric columns using IQR method.',
-            'impact': 'Clean data without extreme values enables more reliable statistical analysis',
-            'action': 'Continue analysis with confidence - data is well-behaved!',
-            'benefit': 'No outlier handling needed - focus on insights'
-        })
-    
-    return sorted(recommendations, key=lambda x: {'critical': 0, 'high': 1, 'medium': 2}.get(x['priority'], 3))
+# Stage timings for this run; always written to the log file when one is configured
+instrument = Instrumentation(
+    trace_memory=st.session_state.get('trace_memory', False),
+    log_path=os.environ.get(INSTRUMENT_LOG_ENV) or None,
+    session=st.session_state.session_id,
+    run=uuid.uuid4().hex,
+    filename=st.session_state.filename,
+)
+
+@st.cache_resource(max_entries=PARSE_CACHE_MAX_ENTRIES)
+def get_sheet_names(file_id, _upload, engine):
+    """Sheet names memoized per uploaded file"""
+    return list_sheets(_upload.getvalue(), engine)
+
+@st.cache_resource(max_entries=PARSE_CACHE_MAX_ENTRIES)
+def get_header(file_id, _upload, file_format, engine, sheet):
+    """Header row memoized per uploaded file and sheet"""
+    return read_header(_upload.getvalue(), {'format': file_format, 'engine': engine, 'sheet': sheet})
+
+def session_active(session_id):
+    """Whether a browser session is still open; results of closed sessions become evictable"""
+    from streamlit.runtime import Runtime
+    return not Runtime.exists() or Runtime.instance().is_active_session(session_id)
+
+@st.cache_resource
+def get_job_manager():
+    """Background jobs shared by all sessions, so a dataset version is parsed and profiled once"""
+    return JobManager(is_active=session_active)
+
+def submit_job(name, key, func, *args):
+    """Submit func(*args) as this session's name job; a different key supersedes the session's previous one"""
+    return get_job_manager().submit(
+        (st.session_state.session_id, name), name, key, func, *args,
+        log_path=instrument.log_path, **instrument.context
+    )
+
+@st.fragment(run_every=1)
+def job_status(job, message):
+    """Placeholder for a running job that reruns the page once the job has finished"""
+    if job.done():
+        st.rerun()
+    st.caption(f"⏳ {message}")
+
+def analyze_uploads(files, options):
+    """Job body for the all-sheets summary; the uploads are read in the job thread"""
+    return analyze_sheets([(f.name, f.getvalue()) for f in files], options)
+
+def sheet_label(sheet):
+    return f"{sheet['file']} / {sheet['sheet']}" if sheet['sheet'] is not None else sheet['file']
+
+def show_stage_timings():
+    """Stage timings of this run and the state of this session's background jobs, when enabled"""
+    if not st.session_state.get('show_diagnostics'):
+        return
+    with st.sidebar:
+        st.markdown("#### 🩺 Stage Timings")
+        timings = instrument.summary()
+        top_level = [r['seconds'] for r in instrument.records if r['depth'] == 0 and r['seconds'] is not None]
+        st.metric("Instrumented time", f"{sum(top_level):.2f} s")
+        st.dataframe(timings, use_container_width=True, hide_index=True)
+        if not instrument.trace_memory:
+            st.caption("Enable \"Trace peak memory\" to record peak allocation")
+        jobs = get_job_manager().slot_jobs(st.session_state.session_id)
+        if jobs:
+            st.markdown("#### ⏱️ Background Jobs")
+            st.dataframe(pd.DataFrame({
+                'Job': [name for name, _ in jobs],
+                'State': [job.state for _, job in jobs],
+                'Wall (s)': [job.seconds for _, job in jobs],
+            }), use_container_width=True, hide_index=True)
+
+def job_result(job, message):
+    """The job's result once finished; until then a job_status placeholder and None"""
+    if not job.wait():
+        job_status(job, message)
+        return None
+    return job.result()
+
+@st.cache_resource(max_entries=PARSE_CACHE_MAX_ENTRIES)
+def get_duplicate_index(dataset_key, _df, subset, normalize):
+    """Row-hash duplicate index per dataset and key columns"""
+    return DuplicateIndex(_df, subset, normalize)
+
+@st.cache_resource(max_entries=PARSE_CACHE_MAX_ENTRIES)
+def get_data_grid(dataset_key, _df, _profile):
+    """Paged grid per dataset; its sort orders and value indexes are shared between sessions"""
+    return data_grid(_df, _profile)
+
+@st.cache_data(max_entries=256)
+def histogram_aggregate(dataset_key, _df, _profile, col, nbins=HISTOGRAM_BINS):
+    """Histogram bins per dataset and column; only nbins values ever reach the browser"""
+    return column_histogram(_df, _profile, col, nbins)
+
+@st.cache_data(max_entries=256)
+def box_aggregate(dataset_key, _df, _profile, col, approximate):
+    """Box plot summary per dataset and column"""
+    return box_summary(_df, _profile, col)
+
+@st.cache_data(max_entries=256)
+def get_datetime_columns(dataset_key, _df, _profile):
+    """Date columns per dataset, including text columns that parse as dates"""
+    return datetime_columns(_df, _profile)
+
+@st.cache_data(max_entries=256)
+def value_counts_aggregate(dataset_key, _df, _profile, col, top=TOP_CATEGORIES):
+    """Most frequent values of a column, per dataset and column"""
+    return value_counts(_df, _profile, col, top)
+
+def histogram_figure(edges, counts, col, margins=None):
+    import plotly.graph_objects as go
+    widths = edges[1:] - edges[:-1]
+    error_y = dict(type='data', array=margins) if margins is not None else None
+    fig = go.Figure(go.Bar(x=edges[:-1] + widths / 2, y=counts, width=widths, name=col, error_y=error_y))
+    fig.update_layout(title=f"Distribution of {col}", xaxis_title=col, yaxis_title="count", bargap=0)
+    return fig
+
+def box_figure(summary, col):
+    import plotly.graph_objects as go
+    fig = go.Figure(go.Box(
+        x=[col], q1=[summary['q1']], median=[summary['median']], q3=[summary['q3']],
+        lowerfence=[summary['lowerfence']], upperfence=[summary['upperfence']],
+        mean=[summary['mean']], name=col, boxpoints=False
+    ))
+    if len(summary['outliers']):
+        fig.add_trace(go.Scatter(
+            x=[col] * len(summary['outliers']), y=summary['outliers'], mode='markers',
+            name='outliers (sampled)' if len(summary['outliers']) == BOX_OUTLIER_SAMPLE else 'outliers'
+        ))
+    fig.update_layout(title=f"Box Plot: {col}", showlegend=False)
+    return fig
 
 # Sidebar
 with st.sidebar:
     st.header("📁 File Upload")
-    uploaded_file = st.file_uploader(
-        "Upload your Excel file",
+    uploaded_files = st.file_uploader(
+        "Upload your Excel files",
         type=['xlsx', 'xls', 'csv'],
-        help="Supported formats: Excel (.xlsx, .xls) and CSV"
+        accept_multiple_files=True,
+        help="Supported formats: Excel (.xlsx, .xls) and CSV. Upload several files to summarize them together."
     )
+    uploaded_file = None
+    workbook = None
+    if len(uploaded_files) > 1:
+        selected = st.selectbox("File to analyze:", range(len(uploaded_files)),
+                                format_func=lambda i: uploaded_files[i].name)
+        uploaded_file = uploaded_files[selected]
+    elif uploaded_files:
+        uploaded_file = uploaded_files[0]
     
     if uploaded_file is not None:
+        is_csv = uploaded_file.name.endswith('.csv')
+        sheets = []
+        stream_csv = is_csv and st.checkbox(
+            "Stream CSV in chunks",
+            help="Profile the file chunk by chunk so memory stays bounded by the chunk size. "
+                 "Charts and exports need the full dataset and are disabled in this mode."
+        )
+        sample_csv = is_csv and st.checkbox(
+            "Explore a sample",
+            help="Read the file once in chunks, profiling every row and keeping a random sample of rows. "
+                 "Charts are estimated from the sample with confidence intervals; the exact results "
+                 "can be recomputed in the background."
+        )
         try:
-            if uploaded_file.name.endswith('.csv'):
-                st.session_state.df = pd.read_csv(uploaded_file)
-            else:
-                st.session_state.df = pd.read_excel(uploaded_file)
+            options = {'format': 'csv' if is_csv else 'excel'}
+            with st.expander("⚙️ Reader Options"):
+                if not is_csv:
+                    options['engine'] = st.selectbox(
+                        "Excel reader:",
+                        available_excel_readers(uploaded_file.name),
+                        help="calamine and openpyxl-stream read the workbook much faster than the default pandas reader"
+                    )
+                    sheets = get_sheet_names(uploaded_file.file_id, uploaded_file, options['engine'])
+                    options['sheet'] = st.selectbox("Sheet:", sheets)
+                header = get_header(uploaded_file.file_id, uploaded_file, options['format'],
+                                    options.get('engine'), options.get('sheet'))
+                options['columns'] = tuple(st.multiselect("Columns (all if empty):", header))
+                options['skip_rows'] = int(st.number_input("Skip first data rows:", min_value=0, value=0, step=1000))
+                options['n_rows'] = int(st.number_input("Max rows (0 = all):", min_value=0, value=0, step=1000))
+                options['optimize_memory'] = st.checkbox(
+                    "Optimize memory",
+                    help="Store low-cardinality text as categories, downcast numbers and use Arrow-backed strings"
+                )
+                backends = available_backends()
+                if len(backends) > 1:
+                    options['backend'] = st.selectbox(
+                        "Compute backend:",
+                        backends,
+                        help="duckdb converts the file to Parquet and computes every statistic as a query over it, "
+                             "spilling to disk, so datasets larger than memory can be analyzed"
+                    )
+            if sample_csv:
+                with st.expander("🎯 Sample Options", expanded=True):
+                    options['sample_rows'] = int(st.number_input(
+                        "Sample rows:", min_value=1000, value=SAMPLE_ROWS, step=10_000
+                    ))
+                    stratify = st.selectbox(
+                        "Stratify by:", [None] + list(options['columns'] or header),
+                        format_func=lambda col: "(none)" if col is None else col,
+                        help="Sample rows proportionally within each value of this column, keeping "
+                             "at least a minimum per value so rare categories are represented"
+                    )
+                    options['stratify'] = stratify
+            out_of_core = options.get('backend') == 'duckdb'
+            if out_of_core:
+                options['approximate'] = st.session_state.get('approximate_stats', False)
+            elif stream_csv or sample_csv:
+                options['stream_chunk_rows'] = STREAM_CHUNK_ROWS
+            upload_id = (uploaded_file.file_id,) + tuple(sorted(options.items()))
+            # Only touch the bytes when a different file or option was chosen; plain reruns reuse the loaded data
+            if st.session_state.upload_id != upload_id:
+                if st.session_state.parse_job is None or st.session_state.parse_job[0] != upload_id:
+                    with instrument.stage('parse'):
+                        with uploaded_file.getbuffer() as buffer:
+                            key = dataset_cache_key(buffer, options)
+                        job = submit_job('parse', ('parse', key), ingest_upload, uploaded_file.getvalue(), options, key)
+                    st.session_state.parse_job = (upload_id, job)
+                    # Jobs for the previous dataset are superseded
+                    for name in ('profile', 'correlation', 'cube', 'timeseries', 'export', 'exact'):
+                        get_job_manager().release((st.session_state.session_id, name))
+                pending_id, job = st.session_state.parse_job
+                if job.wait():
+                    st.session_state.parse_job = None
+                    st.session_state.df, st.session_state.stream_profile, st.session_state.dataset_key = job.result()
+                    st.session_state.upload_id = pending_id
+                    st.session_state.upload_options = options
             st.session_state.filename = uploaded_file.name
-            st.success("✅ File loaded successfully!")
+            instrument.context['filename'] = uploaded_file.name
+            if st.session_state.parse_job is None:
+                st.success("✅ File loaded successfully!")
+            else:
+                job_status(st.session_state.parse_job[1], f"Reading {uploaded_file.name}...")
         except Exception as e:
+            st.session_state.parse_job = None
             st.error(f"❌ Error loading file: {str(e)}")
+        
+        if len(uploaded_files) > 1 or (not is_csv and len(sheets) > 1):
+            if st.checkbox(
+                "Analyze all sheets and files",
+                help="Read every sheet of every uploaded file concurrently and profile each one, with a summary "
+                     "of each sheet's recommendations. Sheets with the same columns can be analyzed together."
+            ):
+                try:
+                    workbook_key = ('workbook', tuple(f.file_id for f in uploaded_files),
+                                    options.get('engine'), options.get('optimize_memory'))
+                    workbook = job_result(submit_job('workbook', workbook_key, analyze_uploads, list(uploaded_files), options),
+                                          f"Reading all sheets of {len(uploaded_files)} file(s)...")
+                except Exception as e:
+                    st.error(f"❌ Error reading all sheets: {str(e)}")
+            if workbook:
+                groups = schema_groups(workbook)
+                union = st.selectbox(
+                    "Analyze:", [None] + list(range(len(groups))),
+                    format_func=lambda i: "Selected sheet" if i is None else
+                        f"Union of {len(groups[i])} sheets: " + ", ".join(sheet_label(workbook[j]) for j in groups[i]),
+                    help="Sheets with the same columns and column types can be analyzed as one dataset, "
+                         "without copying them into a combined table"
+                )
+                if union is not None:
+                    union_key = ('union',) + tuple(workbook[i]['key'] for i in groups[union])
+                    if st.session_state.dataset_key != union_key:
+                        profile = union_profile(workbook, groups[union])
+                        st.session_state.df, st.session_state.stream_profile = profile.preview, profile
+                        st.session_state.dataset_key = union_key
+                elif st.session_state.dataset_key and st.session_state.dataset_key[0] == 'union':
+                    # Back to the selected sheet, which is read again from the parse caches
+                    st.session_state.upload_id = None
+                    st.rerun()
+    
+    st.checkbox(
+        "Approximate statistics",
+        key='approximate_stats',
+        help="Estimate quartiles with KLL sketches (about 0.5% rank error) and unique counts with "
+             "HyperLogLog (about 0.8% relative error) instead of exact sorts and hashes. "
+             "Much faster on tens of millions of rows."
+    )
+    
+    with st.expander("🩺 Diagnostics"):
+        st.checkbox("Show stage timings", key='show_diagnostics',
+                    help="Wall time, CPU time and peak allocation of each stage of this page load")
+        st.checkbox("Trace peak memory", key='trace_memory',
+                    help="Measure peak allocation per stage with tracemalloc. Slows the app down while enabled.")
+        st.selectbox(
+            "Column statistics:", COLUMN_EXECUTORS, key='column_executor',
+            help="Compute exact per-column statistics serially or on a thread or process pool. "
+                 "Results are identical; compare the profile stage timings."
+        )
+        if os.environ.get(INSTRUMENT_LOG_ENV):
+            st.caption(f"Stage timings are appended to `{os.environ[INSTRUMENT_LOG_ENV]}`")
 
 # Main content
-if st.session_state.df is None:
+if st.session_state.parse_job is not None and uploaded_file is not None:
+    st.info(f"⏳ Reading {uploaded_file.name}... the analysis appears here as soon as it is ready.")
+    show_stage_timings()
+elif st.session_state.df is None:
     st.info("👈 Please upload an Excel or CSV file to get started!")
     st.markdown("""
     ### Features:
@@ -323,10 +457,66 @@ if st.session_state.df is None:
     - 🎯 **Column Analysis** - Detailed column-by-column breakdown
     """)
 else:
+    if st.session_state.exact_job is not None and st.session_state.exact_job[1].done():
+        # Swap the full-data result in for the sample, unless another file or option was chosen meanwhile
+        upload_id, job = st.session_state.exact_job
+        st.session_state.exact_job = None
+        if upload_id == st.session_state.upload_id:
+            try:
+                st.session_state.df, st.session_state.dataset_key, st.session_state.stream_profile = job.result()
+            except Exception as e:
+                st.error(f"❌ Error recomputing exactly: {str(e)}")
+    
     df = st.session_state.df
+    if st.session_state.stream_profile is not None:
+        # Profile built during ingestion; in streaming mode df only holds a preview of the first rows
+        profile = st.session_state.stream_profile
+    else:
+        with instrument.stage('profile'):
+            approximate = st.session_state.approximate_stats
+            executor = st.session_state.get('column_executor', 'serial')
+            profile_job = submit_job('profile', ('profile', st.session_state.dataset_key, approximate, executor),
+                                     build_profile, df, approximate, executor)
+            profile = job_result(profile_job, "Profiling the dataset...")
+        if profile is None:
+            # Render what needs no statistics while the profile is computed
+            st.subheader("📊 Data Preview")
+            st.dataframe(df.head(10), use_container_width=True)
+            show_stage_timings()
+            st.stop()
+    
+    if profile.sampled:
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            st.info(f"🎯 Exploring a {len(profile.sample):,}-row {'stratified ' if profile.stratify else ''}sample "
+                    f"of {profile.n_rows:,} rows. Counts, missing values and duplicates cover every row; charts "
+                    f"are estimated from the sample with {SAMPLE_CONFIDENCE:.0%} confidence intervals.")
+        with col2:
+            if st.session_state.exact_job is not None:
+                job_status(st.session_state.exact_job[1], "Computing exact statistics on the full file...")
+            elif uploaded_file is not None and st.button(
+                "🎯 Recompute exactly",
+                help="Parse and profile the full file in the background; the page switches over when it is done"
+            ):
+                st.session_state.exact_job = (st.session_state.upload_id, submit_job(
+                    'exact', ('exact', st.session_state.dataset_key),
+                    exact_profile, uploaded_file.getvalue(), st.session_state.upload_options
+                ))
+                st.rerun()
+    
+    if workbook:
+        with st.expander(f"📚 Workbook Summary ({len(workbook)} sheets)", expanded=True):
+            st.dataframe(workbook_summary(workbook), use_container_width=True, hide_index=True)
+            sheet = workbook[st.selectbox("Recommendations for:", range(len(workbook)),
+                                          format_func=lambda i: sheet_label(workbook[i]), key='summary_sheet')]
+            st.dataframe(pd.DataFrame({
+                'Priority': [r['priority'].upper() for r in sheet['recommendations']],
+                'Recommendation': [f"{r['icon']} {r['title']}" for r in sheet['recommendations']],
+                'Action': [r['action'] for r in sheet['recommendations']],
+            }), use_container_width=True, hide_index=True)
     
     # Generate recommendations
-    recommendations = generate_recommendations(df)
+    recommendations = generate_recommendations(df, profile, instrument)
     
     # Display top recommendations on main screen
     st.markdown("## 🎯 **KEY RECOMMENDATIONS**")
@@ -364,229 +554,503 @@ else:
             st.markdown(f"**Benefit:** {rec['benefit']}")
             st.divider()
     
-    # Create tabs for detailed analysis
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(
-        ["📋 Overview", "🔍 Quality", "📊 Visualize", "💡 All Insights", "⚙️ Advanced"]
-    )
+    # Detailed analysis; only the selected view is computed on each run
+    numeric_cols = profile.numeric_cols
+    categorical_cols = profile.categorical_cols
+    view = st.radio("View:", VIEWS, horizontal=True, key='view', label_visibility='collapsed')
     
     # ==================== TAB 1: OVERVIEW ====================
-    with tab1:
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("📄 Total Rows", f"{len(df):,}")
-        with col2:
-            st.metric("📋 Total Columns", f"{len(df.columns)}")
-        with col3:
-            st.metric("🔢 Numeric Columns", f"{len(df.select_dtypes(include=[np.number]).columns)}")
-        with col4:
-            st.metric("🔤 Text Columns", f"{len(df.select_dtypes(include=['object']).columns)}")
-        
-        st.divider()
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("📊 Data Preview")
-            st.dataframe(df.head(10), use_container_width=True)
-        
-        with col2:
+    if view == VIEWS[0]:
+        with instrument.stage('tab.overview'):
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("📄 Total Rows", f"{profile.n_rows:,}")
+            with col2:
+                st.metric("📋 Total Columns", f"{profile.n_cols}")
+            with col3:
+                st.metric("🔢 Numeric Columns", f"{len(profile.numeric_cols)}")
+            with col4:
+                st.metric("🔤 Text Columns", f"{len(profile.categorical_cols)}")
+            
+            if getattr(profile, 'reused_rows', 0):
+                st.caption(f"♻️ {profile.reused_rows:,} of {profile.n_rows:,} rows matched a previous upload; "
+                           "only the changed rows were profiled")
+            
+            st.divider()
+            
+            st.subheader("📊 Data Browser")
+            grid = get_data_grid(st.session_state.dataset_key, df, profile)
+            if grid is None:
+                st.caption(f"Browsing needs the rows in memory or on disk; showing the first {len(df):,} rows read")
+                st.dataframe(df, use_container_width=True)
+            else:
+                if profile.sampled:
+                    st.caption(f"Browsing the {grid.n_rows:,} sampled rows")
+                col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+                with col1:
+                    filter_cols = st.multiselect("Filter by:", grid.columns, key='grid_filters')
+                with col2:
+                    sort_col = st.selectbox("Sort by:", [None] + grid.columns, key='grid_sort',
+                                            format_func=lambda col: "(file order)" if col is None else col)
+                with col3:
+                    descending = st.toggle("Descending", key='grid_descending', disabled=sort_col is None)
+                with col4:
+                    st.session_state.setdefault('grid_page_size', GRID_PAGE_SIZES[1])
+                    page_size = st.selectbox("Rows per page:", GRID_PAGE_SIZES, key='grid_page_size')
+                
+                filters = {}
+                for col in filter_cols:
+                    key = f'grid_filter_{col}'
+                    kind = grid_filter_kind(profile, col)
+                    if kind == 'values':
+                        picked = st.multiselect(f"{col}:", [None] + grid.values(col), key=key,
+                                                format_func=lambda value: CUBE_MISSING if value is None else str(value))
+                        if picked:
+                            filters[col] = ('values', tuple(picked))
+                    elif kind == 'contains':
+                        text = st.text_input(f"{col} contains:", key=key)
+                        if text:
+                            filters[col] = ('contains', text)
+                    else:
+                        bounds = grid.bounds(col)
+                        if bounds is None or bounds[0] == bounds[1]:
+                            st.caption(f"{col} holds a single value")
+                            continue
+                        low, high = (bound.to_pydatetime() if isinstance(bound, pd.Timestamp) else bound.item()
+                                     if hasattr(bound, 'item') else bound for bound in bounds)
+                        window = st.session_state.get(key)
+                        if window is None or not low <= window[0] <= window[1] <= high:
+                            st.session_state[key] = (low, high)
+                        window = st.slider(f"{col}:", min_value=low, max_value=high, key=key)
+                        if window != (low, high):
+                            filters[col] = ('range', window)
+                
+                # Sorted and filtered row orders are cached by the grid; a page only copies its own rows
+                page = st.session_state.get('grid_page', 1)
+                with instrument.stage('grid.page'):
+                    rows, matching = grid.page((page - 1) * page_size, page * page_size, filters, sort_col, descending)
+                pages = max(1, -(-matching // page_size))
+                if page > pages:
+                    page = st.session_state.grid_page = pages
+                    with instrument.stage('grid.page'):
+                        rows, matching = grid.page((page - 1) * page_size, page * page_size, filters, sort_col, descending)
+                st.dataframe(rows, use_container_width=True)
+                col1, col2 = st.columns([1, 4])
+                with col1:
+                    st.number_input("Page:", min_value=1, max_value=pages, step=1, key='grid_page')
+                with col2:
+                    first = (page - 1) * page_size
+                    caption = f"Rows {first + 1:,}–{first + len(rows):,} of {matching:,}" if matching else "No rows match"
+                    if filters:
+                        caption += f" matching the filters ({grid.n_rows:,} in total)"
+                    st.caption(f"{caption}, page {page:,} of {pages:,}")
+            
+            st.divider()
             st.subheader("📈 Statistical Summary")
-            st.dataframe(df.describe(), use_container_width=True)
-        
-        st.divider()
-        st.subheader("📋 Column Information")
-        col_info = pd.DataFrame({
-            'Column Name': df.columns,
-            'Data Type': df.dtypes.values,
-            'Non-Null Count': df.count().values,
-            'Null Count': df.isnull().sum().values,
-            'Unique Values': [df[col].nunique() for col in df.columns]
-        })
-        st.dataframe(col_info, use_container_width=True)
+            st.dataframe(profile.describe, use_container_width=True)
+            
+            st.divider()
+            st.subheader("📋 Column Information")
+            st.dataframe(profile.column_info, use_container_width=True)
+            
+            if 'memory_report' in df.attrs:
+                memory_report = pd.DataFrame(df.attrs['memory_report'])
+                st.divider()
+                st.subheader("💾 Memory Footprint")
+                before_mb = memory_report['Before (bytes)'].sum() / 1024 ** 2
+                after_mb = memory_report['After (bytes)'].sum() / 1024 ** 2
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("Before Optimization", f"{before_mb:,.1f} MB")
+                with col2:
+                    st.metric("After Optimization", f"{after_mb:,.1f} MB")
+                with col3:
+                    st.metric("Saved", f"{(1 - after_mb / before_mb) * 100 if before_mb else 0:.1f}%")
+                st.dataframe(memory_report, use_container_width=True)
     
     # ==================== TAB 2: DATA QUALITY ====================
-    with tab2:
-        st.subheader("🔍 Data Quality Analysis")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        missing_data = df.isnull().sum()
-        missing_percent = (missing_data / len(df)) * 100
-        
-        with col1:
-            st.metric("⚠️ Missing Values", missing_data.sum())
-        with col2:
-            st.metric("👥 Duplicate Rows", df.duplicated().sum())
-        with col3:
-            st.metric("✅ Data Completeness", f"{(1 - missing_data.sum() / (len(df) * len(df.columns))) * 100:.1f}%")
-        
-        st.divider()
-        
-        # Missing values analysis
-        if missing_data.sum() > 0:
-            st.markdown('<div class="warning-box">⚠️ <b>Missing Values Detected</b></div>', unsafe_allow_html=True)
-            missing_df = pd.DataFrame({
-                'Column': missing_data.index,
-                'Missing Count': missing_data.values,
-                'Missing Percentage': missing_percent.values
-            }).sort_values('Missing Count', ascending=False)
-            missing_df = missing_df[missing_df['Missing Count'] > 0]
-            
-            fig = px.bar(missing_df, x='Column', y='Missing Percentage', 
-                         title='Missing Data Distribution', color='Missing Percentage')
-            st.plotly_chart(fig, use_container_width=True)
-            st.dataframe(missing_df, use_container_width=True)
-        else:
-            st.markdown('<div class="success-box">✅ <b>No Missing Values Found</b></div>', unsafe_allow_html=True)
-        
-        st.divider()
-        
-        # Duplicate analysis
-        if df.duplicated().sum() > 0:
-            st.markdown('<div class="warning-box">⚠️ <b>Duplicate Rows Detected</b></div>', unsafe_allow_html=True)
-            st.write(f"Found {df.duplicated().sum()} duplicate rows")
-        else:
-            st.markdown('<div class="success-box">✅ <b>No Duplicate Rows Found</b></div>', unsafe_allow_html=True)
+    elif view == VIEWS[1]:
+        with instrument.stage('tab.quality'):
+            import plotly.express as px  # deferred until a view draws a chart
+            st.subheader("🔍 Data Quality Analysis")
+            
+            col1, col2, col3 = st.columns(3)
+            
+            missing_data = profile.null_counts
+            missing_percent = (missing_data / profile.n_rows) * 100
+            
+            with col1:
+                st.metric("⚠️ Missing Values", profile.missing_total)
+            with col2:
+                st.metric("👥 Duplicate Rows", profile.duplicate_count)
+            with col3:
+                st.metric("✅ Data Completeness", f"{profile.completeness:.1f}%")
+            
+            st.divider()
+            
+            # Missing values analysis
+            if profile.missing_total > 0:
+                st.markdown('<div class="warning-box">⚠️ <b>Missing Values Detected</b></div>', unsafe_allow_html=True)
+                missing_df = pd.DataFrame({
+                    'Column': missing_data.index,
+                    'Missing Count': missing_data.values,
+                    'Missing Percentage': missing_percent.values
+                }).sort_values('Missing Count', ascending=False)
+                missing_df = missing_df[missing_df['Missing Count'] > 0]
+                
+                with instrument.stage('chart.missing'):
+                    fig = px.bar(missing_df, x='Column', y='Missing Percentage', 
+                                 title='Missing Data Distribution', color='Missing Percentage')
+                    st.plotly_chart(fig, use_container_width=True)
+                st.dataframe(missing_df, use_container_width=True)
+            else:
+                st.markdown('<div class="success-box">✅ <b>No Missing Values Found</b></div>', unsafe_allow_html=True)
+            
+            st.divider()
+            
+            # Duplicate analysis
+            if profile.duplicate_count > 0:
+                st.markdown('<div class="warning-box">⚠️ <b>Duplicate Rows Detected</b></div>', unsafe_allow_html=True)
+                st.write(f"Found {profile.duplicate_count} duplicate rows")
+            else:
+                st.markdown('<div class="success-box">✅ <b>No Duplicate Rows Found</b></div>', unsafe_allow_html=True)
+            
+            st.divider()
+            
+            # Duplicate groups explorer
+            st.markdown("#### 🧬 Duplicate Groups")
+            if profile.streaming:
+                st.info("ℹ️ Duplicate groups need the full dataset in memory and are not available in streaming or out-of-core mode.")
+            else:
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    key_cols = st.multiselect("Match on columns (all if empty):", list(df.columns), key="dup_subset")
+                with col2:
+                    normalize = st.checkbox(
+                        "Near-duplicates", key="dup_normalize",
+                        help="Compare text after lowercasing and collapsing punctuation and whitespace"
+                    )
+                with instrument.stage('duplicates.index'):
+                    if key_cols or normalize or not hasattr(profile, 'duplicates'):
+                        dup_index = get_duplicate_index(st.session_state.dataset_key, df, tuple(key_cols), normalize)
+                    else:
+                        dup_index = profile.duplicates
+                st.write(f"**{dup_index.duplicate_count:,}** duplicate rows in **{dup_index.group_count:,}** groups")
+                if dup_index.group_count:
+                    groups = dup_index.groups(TOP_DUPLICATE_GROUPS)
+                    groups_df = df.iloc[groups['first_row']][dup_index.subset].reset_index(drop=True)
+                    groups_df.insert(0, 'Rows', groups['size'].values)
+                    if dup_index.group_count > TOP_DUPLICATE_GROUPS:
+                        st.caption(f"Showing the {TOP_DUPLICATE_GROUPS} largest groups")
+                    st.dataframe(groups_df, use_container_width=True)
+                    group = st.selectbox(
+                        "Show rows of group:", range(len(groups)), key="dup_group",
+                        format_func=lambda i: f"#{i + 1} ({groups['size'][i]:,} rows)"
+                    )
+                    st.dataframe(df.iloc[dup_index.group_rows(groups['group'][group])], use_container_width=True)
     
     # ==================== TAB 3: VISUALIZATION ====================
-    with tab3:
-        st.subheader("📊 Data Visualization")
-        
-        numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-        categorical_cols = df.select_dtypes(include=['object']).columns.tolist()
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### Distribution Analysis")
-            if numeric_cols:
-                selected_col = st.selectbox("Select numeric column:", numeric_cols, key="dist_col")
-                fig = px.histogram(df, x=selected_col, nbins=30, title=f"Distribution of {selected_col}")
-                st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.markdown("#### Category Counts")
-            if categorical_cols:
-                selected_cat = st.selectbox("Select categorical column:", categorical_cols, key="cat_col")
-                cat_counts = df[selected_cat].value_counts().head(10)
-                fig = px.bar(x=cat_counts.index, y=cat_counts.values, 
-                            title=f"Top 10 {selected_cat} Values")
-                st.plotly_chart(fig, use_container_width=True)
-        
-        st.divider()
-        
-        # Correlation heatmap
-        if len(numeric_cols) > 1:
-            st.markdown("#### Correlation Matrix")
-            corr_matrix = df[numeric_cols].corr()
-            fig = px.imshow(corr_matrix, text_auto=True, aspect="auto", 
-                           title="Correlation Heatmap", color_continuous_scale="RdBu")
-            st.plotly_chart(fig, use_container_width=True)
+    elif view == VIEWS[2]:
+        with instrument.stage('tab.visualize'):
+            import plotly.express as px
+            st.subheader("📊 Data Visualization")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown("#### Distribution Analysis")
+                if numeric_cols:
+                    selected_col = st.selectbox("Select numeric column:", numeric_cols, key="dist_col")
+                    with instrument.stage('chart.histogram'):
+                        edges, counts, *margins = histogram_aggregate(st.session_state.dataset_key, df, profile, selected_col)
+                        fig = histogram_figure(edges, counts, selected_col, *margins)
+                        st.plotly_chart(fig, use_container_width=True)
+                    if profile.sampled:
+                        st.caption(f"Bin counts estimated from the sample; error bars show {SAMPLE_CONFIDENCE:.0%} confidence intervals")
+                    elif profile.streaming and not profile.out_of_core and not profile.union:
+                        st.caption("Bin counts estimated from the column's quantile sketch")
+            
+            with col2:
+                st.markdown("#### Category Counts")
+                if profile.streaming and not (profile.out_of_core or profile.sampled or profile.union):
+                    st.info("ℹ️ Category counts need the full dataset and are not available in streaming mode.")
+                elif categorical_cols:
+                    selected_cat = st.selectbox("Select categorical column:", categorical_cols, key="cat_col")
+                    with instrument.stage('chart.category_counts'):
+                        cat_counts = value_counts_aggregate(st.session_state.dataset_key, df, profile, selected_cat)
+                        if profile.sampled:
+                            fig = px.bar(x=cat_counts.index, y=cat_counts['count'], error_y=cat_counts['margin'],
+                                        title=f"Top 10 {selected_cat} Values (estimated)")
+                        else:
+                            fig = px.bar(x=cat_counts.index, y=cat_counts.values, 
+                                        title=f"Top 10 {selected_cat} Values")
+                        st.plotly_chart(fig, use_container_width=True)
+            
+            st.divider()
+            
+            # Correlation heatmap
+            if len(numeric_cols) > 1 and (profile.out_of_core or profile.sampled or profile.union or not profile.streaming):
+                st.markdown("#### Correlation Matrix")
+                sample_rows = None
+                if not profile.streaming and profile.n_rows > CORRELATION_SAMPLE_ROWS:
+                    st.session_state.setdefault('corr_sample', True)
+                    if st.checkbox(f"Approximate from a {CORRELATION_SAMPLE_ROWS:,}-row sample", key='corr_sample'):
+                        sample_rows = CORRELATION_SAMPLE_ROWS
+                wide = len(numeric_cols) > CORRELATION_HEATMAP_MAX
+                st.session_state.setdefault('corr_view', "Top pairs" if wide else "Heatmap")
+                corr_view = st.radio("View:", ["Heatmap", "Top pairs"], horizontal=True, key='corr_view')
+                with instrument.stage('chart.correlation'):
+                    corr_job = submit_job('correlation', ('correlation', st.session_state.dataset_key, tuple(numeric_cols), sample_rows),
+                                          correlation_matrix, df, profile, list(numeric_cols), sample_rows)
+                    corr_matrix = job_result(corr_job, "Computing correlations...")
+                    if corr_matrix is not None and corr_view == "Top pairs":
+                        pairs = top_correlated_pairs(corr_matrix, TOP_CORRELATION_PAIRS)
+                        if profile.sampled:
+                            pairs = pd.concat([pairs, profile.correlation_intervals(pairs)], axis=1)
+                            st.caption(f"Low and High bound the {SAMPLE_CONFIDENCE:.0%} confidence interval of each sample estimate")
+                        st.dataframe(pairs, use_container_width=True, hide_index=True)
+                    elif corr_matrix is not None:
+                        heatmap = clustered_correlation(corr_matrix)
+                        fig = px.imshow(heatmap, text_auto='.2f' if len(heatmap) <= 15 else False, aspect="auto",
+                                       title="Correlation Heatmap (clustered)", color_continuous_scale="RdBu",
+                                       zmin=-1, zmax=1)
+                        st.plotly_chart(fig, use_container_width=True)
+                        if wide:
+                            st.caption(f"{len(numeric_cols)} columns averaged into {len(heatmap)} blocks of similar columns")
     
-    # ==================== TAB 4: ALL INSIGHTS & DETAILED RECOMMENDATIONS ====================
-    with tab4:
-        st.subheader("💡 All Recommendations (Detailed)")
-        st.write("Below are all recommendations for your dataset, sorted by priority:")
-        st.divider()
-        
-        # Display all recommendations with detailed reasoning
-        for i, rec in enumerate(recommendations, 1):
-            priority_color = {
-                'critical': '🔴',
-                'high': '🟢',
-                'medium': '🟡',
-            }
-            
-            with st.container():
-                st.markdown(f"### {i}. {priority_color.get(rec['priority'], 'ℹ️')} {rec['title']}")
-                
+    # ==================== TAB 4: BREAKDOWN ====================
+    elif view == VIEWS[3]:
+        with instrument.stage('tab.breakdown'):
+            import plotly.express as px
+            st.subheader("🧮 Breakdown")
+            
+            if profile.streaming and not (profile.out_of_core or profile.sampled or profile.union):
+                st.info("ℹ️ Breakdowns need the full dataset and are not available in streaming mode.")
+            elif not numeric_cols or not cube_dimensions(profile):
+                st.info(f"ℹ️ Breakdowns need a numeric column and a text column with at most "
+                        f"{CUBE_MAX_CARDINALITY} distinct values.")
+            else:
+                # Aggregated once per dataset; every slice below is rolled up from the cube
+                with instrument.stage('cube.build'):
+                    cube_job = submit_job('cube', ('cube', st.session_state.dataset_key), group_cube, df, profile)
+                    cube = job_result(cube_job, "Aggregating the breakdown cube...")
+                if cube is not None:
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        measure = st.selectbox("Measure:", cube.measures, key='cube_measure')
+                    with col2:
+                        statistic = st.selectbox("Statistic:", CUBE_STATISTICS, key='cube_stat', format_func=str.title)
+                    with col3:
+                        rows_dim = st.selectbox("Rows:", cube.dimensions, key='cube_rows')
+                    with col4:
+                        columns_dim = st.selectbox(
+                            "Columns:", [None] + [dim for dim in cube.dimensions if dim != rows_dim], key='cube_cols',
+                            format_func=lambda dim: "(none)" if dim is None else dim
+                        )
+                    by = [rows_dim] + ([columns_dim] if columns_dim else [])
+                    filters = {}
+                    drill_dims = [dim for dim in cube.dimensions if dim not in by]
+                    if drill_dims:
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            drill = st.selectbox("Drill into:", [None] + drill_dims, key='cube_drill',
+                                                 format_func=lambda dim: "(all rows)" if dim is None else dim)
+                        if drill is not None:
+                            with col2:
+                                filters[drill] = st.selectbox(f"{drill}:", cube.values(drill), key='cube_drill_value')
+                    
+                    with instrument.stage('cube.slice'):
+                        table = cube.breakdown(measure, by, filters)
+                    title = f"{statistic.title()} of {measure} by {' × '.join(by)}"
+                    if filters:
+                        title += " (" + ", ".join(f"{dim} = {value}" for dim, value in filters.items()) + ")"
+                    with instrument.stage('chart.breakdown'):
+                        fig = px.bar(table.reset_index(), x=rows_dim, y=statistic, color=columns_dim,
+                                     barmode='group', title=title)
+                        st.plotly_chart(fig, use_container_width=True)
+                    if columns_dim:
+                        st.dataframe(table[statistic].unstack(columns_dim), use_container_width=True)
+                    else:
+                        st.dataframe(table, use_container_width=True)
+                    if profile.sampled:
+                        st.caption("Rows, sums, counts and means are estimated from the sample; "
+                                   "minimums and maximums are those of the sample")
+    
+    # ==================== TAB 5: TIME SERIES ====================
+    elif view == VIEWS[4]:
+        with instrument.stage('tab.timeseries'):
+            import plotly.express as px
+            st.subheader("📈 Time Series")
+            
+            date_cols = get_datetime_columns(st.session_state.dataset_key, df, profile)
+            if profile.streaming and not (profile.out_of_core or profile.sampled or profile.union):
+                st.info("ℹ️ Time series need the full dataset and are not available in streaming mode.")
+            elif not date_cols:
+                st.info("ℹ️ No date or time columns found. Columns are recognized when they hold dates "
+                        "or text that parses as dates.")
+            else:
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.metric("Priority", rec['priority'].upper(), delta_color="off")
+                    time_col = st.selectbox("Date column:", date_cols, key='ts_col')
                 with col2:
-                    st.metric("Score", rec['score'], delta_color="off")
+                    measure = st.selectbox("Measure:", [None] + numeric_cols, key='ts_measure',
+                                           format_func=lambda col: "(row count)" if col is None else col)
                 with col3:
-                    if rec.get('issue'):
-                        st.metric("Issue", rec['issue'], delta_color="off")
-                
-                st.markdown(f"**📝 Reasoning:**")
-                st.write(rec['reasoning'])
-                
-                st.markdown(f"**⚡ Impact:**")
-                st.write(rec['impact'])
-                
-                st.markdown(f"**✅ Recommended Actions:**")
-                st.write(rec['action'])
-                
-                st.markdown(f"**💰 Expected Benefit:**")
-                st.write(rec['benefit'])
-                
-                st.divider()
+                    statistic = st.selectbox("Statistic:", CUBE_STATISTICS, key='ts_stat', format_func=str.title,
+                                             disabled=measure is None)
+                # The hour/day/week/month rollups are built once per column; zooming only reads them
+                with instrument.stage('timeseries.rollup'):
+                    rollup_job = submit_job('timeseries', ('timeseries', st.session_state.dataset_key, time_col),
+                                            time_rollup, df, profile, time_col)
+                    rollup = job_result(rollup_job, f"Rolling up {time_col} by hour, day, week and month...")
+                if rollup is not None and rollup.empty:
+                    st.info(f"ℹ️ No value of {time_col} could be read as a date.")
+                elif rollup is not None:
+                    first, last = rollup.start.to_pydatetime(), rollup.end.to_pydatetime()
+                    window = st.session_state.get('ts_window')
+                    if window is None or not first <= window[0] <= window[1] <= last:
+                        st.session_state.ts_window = (first, last)
+                    if last - first > timedelta(hours=1):
+                        st.slider("Zoom:", min_value=first, max_value=last, key='ts_window', format="YYYY-MM-DD HH:mm",
+                                  step=max(timedelta(hours=1), (last - first) // 1000))
+                    start, end = st.session_state.ts_window
+                    with instrument.stage('timeseries.series'):
+                        level = rollup.level_for(start, end)
+                        series = rollup.series(level, measure, statistic, start, end).dropna()
+                        points = series.iloc[lttb(series.index.asi8, series.to_numpy(), TIMESERIES_POINTS)]
+                    label = "Rows" if measure is None else f"{statistic.title()} of {measure}"
+                    with instrument.stage('chart.timeseries'):
+                        fig = px.line(x=points.index, y=points.to_numpy(), title=f"{label} per {level}",
+                                      labels={'x': time_col, 'y': label})
+                        st.plotly_chart(fig, use_container_width=True)
+                    caption = f"{len(series):,} {level}s in view"
+                    if len(points) < len(series):
+                        caption += f", downsampled to {len(points):,} points with LTTB"
+                    if level != TIMESERIES_LEVELS[0]:
+                        caption += ". Zoom in for finer time steps"
+                    st.caption(caption)
+                    if profile.sampled:
+                        st.caption("Rows, sums, counts and means are estimated from the sample; "
+                                   "minimums and maximums are those of the sample")
     
-    # ==================== TAB 5: ADVANCED ANALYSIS ====================
-    with tab5:
-        st.subheader("⚙️ Advanced Analysis")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("#### Outlier Detection")
-            if numeric_cols:
-                col = st.selectbox("Select column for outlier detection:", numeric_cols)
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                outliers_mask = (df[col] < Q1 - 1.5*IQR) | (df[col] > Q3 + 1.5*IQR)
-                outlier_count = outliers_mask.sum()
-                
-                fig = px.box(df, y=col, title=f"Box Plot: {col}")
-                st.plotly_chart(fig, use_container_width=True)
-                st.write(f"**Outliers detected:** {outlier_count} ({outlier_count/len(df)*100:.2f}%)")
-        
-        with col2:
-            st.markdown("#### Statistical Tests")
-            if numeric_cols:
-                col = st.selectbox("Select column for statistics:", numeric_cols, key="stat_col")
-                stats = {
-                    'Mean': df[col].mean(),
-                    'Median': df[col].median(),
-                    'Std Dev': df[col].std(),
-                    'Skewness': df[col].skew(),
-                    'Kurtosis': df[col].kurtosis()
+    # ==================== TAB 6: ALL INSIGHTS & DETAILED RECOMMENDATIONS ====================
+    elif view == VIEWS[5]:
+        with instrument.stage('tab.insights'):
+            st.subheader("💡 All Recommendations (Detailed)")
+            st.write("Below are all recommendations for your dataset, sorted by priority:")
+            st.divider()
+            
+            findings = column_findings(recommendations)
+            if not findings.empty:
+                st.markdown("#### 🧪 Column Checks")
+                st.dataframe(findings, use_container_width=True, hide_index=True)
+                st.divider()
+            
+            # Display all recommendations with detailed reasoning
+            for i, rec in enumerate(recommendations, 1):
+                priority_color = {
+                    'critical': '🔴',
+                    'high': '🟢',
+                    'medium': '🟡',
                 }
-                stats_df = pd.DataFrame(list(stats.items()), columns=['Metric', 'Value'])
-                st.dataframe(stats_df, use_container_width=True)
-        
-        st.divider()
-        
-        # Export options
-        st.markdown("#### 📥 Export Analysis")
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            csv = df.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="📥 Download as CSV",
-                data=csv,
-                file_name=f"analysis_{st.session_state.filename}.csv",
-                mime="text/csv"
-            )
-        
-        with col2:
-            xlsx_io = BytesIO()
-            with pd.ExcelWriter(xlsx_io, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='Data', index=False)
-            xlsx_io.seek(0)
-            st.download_button(
-                label="📥 Download as Excel",
-                data=xlsx_io.getvalue(),
-                file_name=f"analysis_{st.session_state.filename}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-        
-        with col3:
-            st.write("✅ Analysis Complete")
+                
+                with st.container():
+                    st.markdown(f"### {i}. {priority_color.get(rec['priority'], 'ℹ️')} {rec['title']}")
+                    
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("Priority", rec['priority'].upper(), delta_color="off")
+                    with col2:
+                        st.metric("Score", rec['score'], delta_color="off")
+                    with col3:
+                        if rec.get('issue'):
+                            st.metric("Issue", rec['issue'], delta_color="off")
+                    
+                    st.markdown(f"**📝 Reasoning:**")
+                    st.write(rec['reasoning'])
+                    
+                    st.markdown(f"**⚡ Impact:**")
+                    st.write(rec['impact'])
+                    
+                    st.markdown(f"**✅ Recommended Actions:**")
+                    st.write(rec['action'])
+                    
+                    st.markdown(f"**💰 Expected Benefit:**")
+                    st.write(rec['benefit'])
+                    
+                    st.divider()
+    
+    # ==================== TAB 7: ADVANCED ANALYSIS ====================
+    elif view == VIEWS[6]:
+        with instrument.stage('tab.advanced'):
+            st.subheader("⚙️ Advanced Analysis")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown("#### Outlier Detection")
+                if numeric_cols:
+                    col = st.selectbox("Select column for outlier detection:", numeric_cols, key="outlier_col")
+                    outlier_count = int(profile.outlier_counts[col])
+                    
+                    with instrument.stage('chart.box'):
+                        summary = box_aggregate(st.session_state.dataset_key, df, profile, col, profile.approximate)
+                        fig = box_figure(summary, col)
+                        st.plotly_chart(fig, use_container_width=True)
+                    st.write(f"**Outliers detected:** {outlier_count} ({outlier_count/profile.n_rows*100:.2f}%)")
+                    if profile.sampled:
+                        st.caption(f"Box plot estimated from the sample, with {SAMPLE_CONFIDENCE:.0%} confidence intervals:")
+                        st.dataframe(pd.DataFrame(summary['intervals'], index=['Estimate', 'Low', 'High']).T,
+                                     use_container_width=True)
+                    elif profile.approximate:
+                        st.caption("IQR fences estimated from quantile sketches")
+            
+            with col2:
+                st.markdown("#### Statistical Tests")
+                if numeric_cols:
+                    col = st.selectbox("Select column for statistics:", numeric_cols, key="stat_col")
+                    stats = profile.column_stats(col)
+                    stats_df = pd.DataFrame(list(stats.items()), columns=['Metric', 'Value'])
+                    st.dataframe(stats_df, use_container_width=True)
+            
+            st.divider()
+            
+            # Export options
+            st.markdown("#### 📥 Export Analysis")
+            if profile.streaming:
+                st.info("ℹ️ Exports need the full dataset in memory and are not available in streaming or out-of-core mode.")
+            else:
+                col1, col2, col3 = st.columns(3)
+            
+                with col1:
+                    export_format = st.selectbox("Export format:", available_export_formats(profile.n_rows), key="export_format")
+            
+                with col2:
+                    extension, mime = EXPORT_FORMATS[export_format]
+                    # The file is built in the background on request, then kept for repeat downloads
+                    export_key = ('export', st.session_state.dataset_key, export_format)
+                    if get_job_manager().get(export_key) is None:
+                        # Stop building an export of a previously selected format
+                        get_job_manager().release((st.session_state.session_id, 'export'))
+                        if st.button(f"⚙️ Prepare {export_format} export", key="prepare_export"):
+                            submit_job('export', export_key, export_bytes, df, export_format)
+                            st.rerun()
+                    else:
+                        export_job = submit_job('export', export_key, export_bytes, df, export_format)
+                        if job_result(export_job, f"Building the {export_format} export...") is not None:
+                            st.download_button(
+                                label=f"📥 Download as {export_format}",
+                                data=export_job.result,
+                                file_name=f"analysis_{st.session_state.filename}.{extension}",
+                                mime=mime,
+                                on_click='ignore'
+                            )
+            
+                with col3:
+                    st.write("✅ Analysis Complete")
+
+show_stage_timings()
 
 # Footerst.divider()st.divider()
 st.markdown("""
@@ -0,0 +1,190 @@
+"""Benchmark suite for Excel Analyzer Pro.
+
+Generates synthetic datasets with create_sample.generate_dataset, then times
+every stage of the analysis at each scale: ingestion per file format,
+profiling, the recommendation rules, the per-tab computations and the
+exports. Each measurement is written as one JSON line with wall time and
+peak traced allocation, so runs can be diffed with --compare:
+
+    python benchmark.py --rows 10000 1000000 --output bench.jsonl
+    python benchmark.py --rows 10000 1000000 --compare bench.jsonl
+"""
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import analyzer
+from create_sample import XLSX_MAX_ROWS, generate_dataset, save_dataset
+
+DEFAULT_ROWS = [10_000, 1_000_000, 10_000_000]
+
+def measure(stage, func, *args, **kwargs):
+    """Run func once and return (result, record) with wall time, CPU time and peak traced memory"""
+    tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        result = func(*args, **kwargs)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, {'stage': stage, 'seconds': round(wall, 4), 'cpu_seconds': round(cpu, 4),
+                    'peak_mb': round(peak / 1024 ** 2, 2)}
+
+def benchmark_ingestion(df, workdir, formats, xlsx_max_rows):
+    """Time parsing the dataset back from each file format"""
+    for file_format in formats:
+        if file_format == 'xlsx' and len(df) > min(xlsx_max_rows, XLSX_MAX_ROWS):
+            continue
+        path = Path(workdir) / f'bench.{file_format}'
+        save_dataset(df, str(path))
+        data = path.read_bytes()
+        if file_format == 'csv':
+            yield measure('ingest.csv', analyzer.parse_upload, data, {'format': 'csv'})[1]
+            yield measure('ingest.csv_stream', analyzer.stream_csv_profile, str(path))[1]
+        elif file_format == 'parquet':
+            yield measure('ingest.parquet', pd.read_parquet, str(path))[1]
+        else:
+            for engine in analyzer.available_excel_readers(path.name):
+                yield measure(f'ingest.xlsx_{engine}', analyzer.parse_upload, data,
+                              {'format': 'excel', 'engine': engine})[1]
+
+def benchmark_analysis(df):
+    """Time profiling, the recommendation rules and the computations behind each tab"""
+    profile, record = measure('profile.exact', analyzer.DatasetProfile, df)
+    yield record
+    yield measure('profile.approximate', analyzer.DatasetProfile, df, True)[1]
+    for executor in analyzer.COLUMN_EXECUTORS[1:]:
+        analyzer.DatasetProfile(df.head(100), executor=executor)  # start the pool outside the timing
+        yield measure(f'profile.exact.{executor}', analyzer.DatasetProfile, df, executor=executor)[1]
+    yield measure('recommendations', analyzer.generate_recommendations, df, profile)[1]
+    yield measure('optimize_dtypes', analyzer.optimize_dtypes, df)[1]
+
+    numeric_col = profile.numeric_cols[0] if profile.numeric_cols else None
+    text_col = profile.categorical_cols[0] if profile.categorical_cols else None
+
+    # Overview and Quality tabs
+    yield measure('tab.overview', lambda: profile.column_info)[1]
+    grid = analyzer.data_grid(df, profile)
+    size = analyzer.GRID_PAGE_SIZES[1]
+    yield measure('tab.overview.grid.page', grid.page, len(df) // 2, len(df) // 2 + size)[1]
+    if numeric_col is not None:
+        yield measure('tab.overview.grid.sort', grid.page, 0, size, sort=numeric_col)[1]
+        yield measure('tab.overview.grid.sort.page', grid.page, len(df) // 2, len(df) // 2 + size, sort=numeric_col)[1]
+    if text_col is not None:
+        value = grid.values(text_col)[0]
+        kind = analyzer.grid_filter_kind(profile, text_col)
+        filters = {text_col: ('values', (value,)) if kind == 'values' else ('contains', str(value))}
+        yield measure('tab.overview.grid.filter', grid.page, 0, size, filters, numeric_col)[1]
+    yield measure('tab.quality', lambda: (profile.null_counts / profile.n_rows) * 100)[1]
+
+    # Visualize tab
+    if numeric_col is not None:
+        yield measure('tab.visualize.histogram', analyzer.column_histogram, df, profile, numeric_col)[1]
+    if text_col is not None:
+        yield measure('tab.visualize.value_counts', lambda: df[text_col].value_counts().head(analyzer.TOP_CATEGORIES))[1]
+    if len(profile.numeric_cols) > 1:
+        yield measure('tab.visualize.correlation', analyzer.correlation_matrix, df, profile, profile.numeric_cols)[1]
+
+    # Breakdown tab
+    cube, record = measure('tab.breakdown.cube', analyzer.group_cube, df, profile)
+    yield record
+    if cube is not None:
+        yield measure('tab.breakdown.slice', cube.breakdown, cube.measures[0], cube.dimensions[:2])[1]
+
+    # Time series tab
+    date_cols = analyzer.datetime_columns(df, profile)
+    if date_cols:
+        rollup, record = measure('tab.timeseries.rollup', analyzer.time_rollup, df, profile, date_cols[0])
+        yield record
+        if not rollup.empty:
+            def series():
+                level = rollup.level_for(rollup.start, rollup.end)
+                values = rollup.series(level, numeric_col, 'sum').dropna()
+                return analyzer.lttb(values.index.asi8, values.to_numpy(), analyzer.TIMESERIES_POINTS)
+            yield measure('tab.timeseries.series', series)[1]
+
+    # Advanced tab
+    if numeric_col is not None:
+        yield measure('tab.advanced.box', analyzer.box_summary, df, profile, numeric_col)[1]
+        yield measure('tab.advanced.stats', profile.column_stats, numeric_col)[1]
+
+    # Exports
+    for export_format in analyzer.available_export_formats(len(df)):
+        yield measure(f'export.{export_format}', analyzer.export_bytes, df, export_format)[1]
+
+def run(rows_list, args):
+    environment = {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in rows_list:
+            df = generate_dataset(
+                rows=rows, numeric_columns=args.numeric_columns, text_columns=args.text_columns,
+                missing_rate=args.missing_rate, duplicate_rate=args.duplicate_rate,
+                cardinality=args.cardinality, seed=args.seed
+            )
+            stages = list(benchmark_ingestion(df, workdir, args.formats, args.xlsx_max_rows))
+            stages += list(benchmark_analysis(df))
+            for record in stages:
+                yield {'rows': rows, 'columns': len(df.columns), **record, **environment}
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return {(r['rows'], r['stage']): r for r in map(json.loads, f) if r}
+
+def compare(results, baseline):
+    """Print seconds and peak memory of this run against a previous one"""
+    print(f"{'rows':>10}  {'stage':<32}{'seconds':>10}{'baseline':>10}{'ratio':>8}{'peak MB':>10}", file=sys.stderr)
+    for result in results:
+        before = baseline.get((result['rows'], result['stage']))
+        ratio = f"{result['seconds'] / before['seconds']:.2f}" if before and before['seconds'] else '-'
+        previous = f"{before['seconds']:.4f}" if before else '-'
+        print(f"{result['rows']:>10}  {result['stage']:<32}{result['seconds']:>10.4f}{previous:>10}{ratio:>8}"
+              f"{result['peak_mb']:>10.1f}", file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Excel Analyzer Pro at configurable scale")
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS, help="dataset sizes to benchmark")
+    parser.add_argument('--numeric-columns', type=int, default=4)
+    parser.add_argument('--text-columns', type=int, default=3)
+    parser.add_argument('--missing-rate', type=float, default=0.05)
+    parser.add_argument('--duplicate-rate', type=float, default=0.04)
+    parser.add_argument('--cardinality', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--formats', nargs='+', choices=['csv', 'xlsx', 'parquet'], default=['csv', 'xlsx', 'parquet'],
+                        help="file formats to time ingestion for")
+    parser.add_argument('--xlsx-max-rows', type=int, default=100_000,
+                        help="skip xlsx ingestion above this size (writing large workbooks is slow)")
+    parser.add_argument('--output', '-o', default=None, help="JSON Lines results file (default: stdout)")
+    parser.add_argument('--compare', default=None, help="previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.compare) if args.compare else None
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    results = []
+    try:
+        for result in run(args.rows, args):
+            out.write(json.dumps(result) + '\n')
+            out.flush()
+            results.append(result)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if baseline is not None:
+        compare(results, baseline)
+
+if __name__ == '__main__':
+    main()
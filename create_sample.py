@@ -1,42 +1,110 @@
+import argparse
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-
-# Create sample data for testing
-np.random.seed(42)
-
-# Generate sample sales data
-n_records = 500
-
-data = {
-    'Date': [datetime.now() - timedelta(days=x) for x in range(n_records)],
-    'Product': np.random.choice(['Laptop', 'Desktop', 'Tablet', 'Smartphone', 'Monitor'], n_records),
-    'Category': np.random.choice(['Electronics', 'Accessories'], n_records),
-    'Sales_Amount': np.random.uniform(500, 5000, n_records),
-    'Quantity': np.random.randint(1, 50, n_records),
-    'Customer_ID': np.random.randint(1000, 9999, n_records),
-    'Region': np.random.choice(['North', 'South', 'East', 'West'], n_records),
-    'Discount_Percent': np.random.uniform(0, 30, n_records),
-}
-
-# Create DataFrame
-df = pd.DataFrame(data)
-
-# Introduce some missing values (10% of data)
-missing_indices = np.random.choice(len(df), size=int(len(df)*0.1), replace=False)
-df.loc[missing_indices[:len(missing_indices)//2], 'Discount_Percent'] = np.nan
-df.loc[missing_indices[len(missing_indices)//2:], 'Sales_Amount'] = np.nan
-
-# Introduce some duplicates
-df = pd.concat([df, df.iloc[:20]], ignore_index=True)
-
-# Round values
-df['Sales_Amount'] = df['Sales_Amount'].round(2)
-df['Discount_Percent'] = df['Discount_Percent'].round(2)
-
-# Save to Excel
-df.to_excel('sample_data.xlsx', index=False, engine='openpyxl')
-
-print("✅ Sample Excel file created: sample_data.xlsx")
-print(f"Total records: {len(df)}")
-print(f"Columns: {list(df.columns)}")
+from datetime import datetime
+
+# Column templates for the sample sales data; extra columns beyond these get generic names
+NUMERIC_TEMPLATES = [
+    ('Sales_Amount', 'uniform', 500, 5000),
+    ('Quantity', 'integer', 1, 50),
+    ('Customer_ID', 'integer', 1000, 9999),
+    ('Discount_Percent', 'uniform', 0, 30),
+]
+TEXT_TEMPLATES = [
+    ('Product', ['Laptop', 'Desktop', 'Tablet', 'Smartphone', 'Monitor']),
+    ('Category', ['Electronics', 'Accessories']),
+    ('Region', ['North', 'South', 'East', 'West']),
+]
+XLSX_MAX_ROWS = 1_048_575
+
+def text_values(name, pool, cardinality):
+    """Value pool for a text column: the template values, extended or cut to cardinality"""
+    if cardinality is None:
+        return pool
+    return (pool + [f'{name}_{i}' for i in range(len(pool), cardinality)])[:cardinality]
+
+def generate_dataset(rows=520, numeric_columns=4, text_columns=3, date_columns=1,
+                     missing_rate=0.05, duplicate_rate=0.04, cardinality=None, seed=42):
+    """Generate a synthetic sales-style dataset.
+
+    rows is the total row count including duplicates; duplicate_rate of the
+    rows are copies of earlier rows. missing_rate of the values in each
+    float column are set to NaN. cardinality overrides the number of
+    distinct values in every text column. The defaults reproduce the shape
+    of sample_data.xlsx: 500 records plus 20 duplicates.
+    """
+    rng = np.random.default_rng(seed)
+    n_duplicates = int(rows * duplicate_rate)
+    n_records = rows - n_duplicates
+
+    data = {}
+    # Daily dates going back from now, or minutes once days would leave the datetime range
+    step = np.timedelta64(1, 'D') if n_records <= 36_500 else np.timedelta64(1, 'm')
+    now = np.datetime64(datetime.now(), 'ms')
+    for i in range(date_columns):
+        name = 'Date' if i == 0 else f'Date_{i + 1}'
+        data[name] = now - np.arange(n_records) * step * (i + 1)
+    for i in range(text_columns):
+        name, pool = TEXT_TEMPLATES[i] if i < len(TEXT_TEMPLATES) else (f'Segment_{i + 1}', ['A', 'B', 'C', 'D'])
+        values = np.array(text_values(name, pool, cardinality), dtype=object)
+        data[name] = values[rng.integers(0, len(values), n_records)]
+    for i in range(numeric_columns):
+        name, kind, low, high = NUMERIC_TEMPLATES[i] if i < len(NUMERIC_TEMPLATES) else (f'Metric_{i + 1}', 'normal', 100, 15)
+        if kind == 'integer':
+            data[name] = rng.integers(low, high, n_records)
+        elif kind == 'uniform':
+            data[name] = rng.uniform(low, high, n_records).round(2)
+        else:
+            data[name] = rng.normal(low, high, n_records).round(2)
+
+    df = pd.DataFrame(data)
+
+    # Introduce missing values in the float columns
+    for col in df.select_dtypes(include=['float']).columns:
+        missing = rng.choice(n_records, size=int(n_records * missing_rate), replace=False)
+        df.loc[missing, col] = np.nan
+
+    # Introduce duplicates
+    if n_duplicates:
+        df = pd.concat([df, df.iloc[rng.integers(0, n_records, n_duplicates)]], ignore_index=True)
+    return df
+
+def save_dataset(df, path):
+    """Write df as CSV, Excel or Parquet depending on the file extension"""
+    if path.endswith('.csv'):
+        df.to_csv(path, index=False)
+    elif path.endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    elif path.endswith('.xlsx'):
+        if len(df) > XLSX_MAX_ROWS:
+            raise ValueError(f"Excel sheets hold at most {XLSX_MAX_ROWS:,} data rows, got {len(df):,}")
+        df.to_excel(path, index=False, engine='openpyxl')
+    else:
+        raise ValueError(f"Unsupported output format: {path}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic test data for Excel Analyzer Pro")
+    parser.add_argument('--rows', type=int, default=520, help="total rows, duplicates included")
+    parser.add_argument('--numeric-columns', type=int, default=4)
+    parser.add_argument('--text-columns', type=int, default=3)
+    parser.add_argument('--date-columns', type=int, default=1)
+    parser.add_argument('--missing-rate', type=float, default=0.05, help="fraction of missing values per float column")
+    parser.add_argument('--duplicate-rate', type=float, default=0.04, help="fraction of rows that are duplicates")
+    parser.add_argument('--cardinality', type=int, default=None, help="distinct values per text column")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', '-o', default='sample_data.xlsx', help=".xlsx, .csv or .parquet")
+    args = parser.parse_args(argv)
+
+    df = generate_dataset(
+        rows=args.rows, numeric_columns=args.numeric_columns, text_columns=args.text_columns,
+        date_columns=args.date_columns, missing_rate=args.missing_rate, duplicate_rate=args.duplicate_rate,
+        cardinality=args.cardinality, seed=args.seed
+    )
+    save_dataset(df, args.output)
+
+    print(f"✅ Sample file created: {args.output}")
+    print(f"Total records: {len(df)}")
+    print(f"Columns: {list(df.columns)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Shared frames and pandas comparisons for the tests."""
+import numpy as np
+import pandas as pd
+
+ROWS = 6_000
+CHUNK_ROWS = 700
+
+
+def sample_frame(rows=ROWS, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'amount': rng.lognormal(3, 1, rows).round(2),
+        'quantity': rng.integers(1, 20, rows).astype(np.float64),
+        'score': rng.normal(50, 10, rows),
+        'region': rng.choice(['North', 'South', 'East', 'West'], rows),
+        'product': rng.choice([f'P{i}' for i in range(300)], rows),
+    })
+    df.loc[rng.random(rows) < 0.05, 'quantity'] = np.nan
+    df.loc[rng.random(rows) < 0.02, 'region'] = np.nan
+    # Exact repeats of earlier rows
+    repeats = df.sample(300, random_state=seed)
+    return pd.concat([df, repeats], ignore_index=True)
+
+
+def csv_bytes(df):
+    return df.to_csv(index=False).encode('utf-8')
+
+
+def assert_exact_counts(profile, df):
+    assert profile.n_rows == len(df)
+    pd.testing.assert_series_equal(profile.null_counts.sort_index(), df.isna().sum().sort_index(), check_names=False)
+    assert profile.duplicate_count == df.duplicated().sum()
+
+
+def assert_moments(profile, df):
+    expected = df.describe()
+    for stat in ('count', 'mean', 'std', 'min', 'max'):
+        np.testing.assert_allclose(profile.describe.loc[stat, expected.columns], expected.loc[stat], rtol=1e-9)
+
+
+def assert_quantiles(profile, df, rank_error=0.02):
+    for col in profile.numeric_cols:
+        values = np.sort(df[col].dropna().to_numpy())
+        for q, estimate in zip((0.25, 0.5, 0.75), (profile.q1[col], profile.median[col], profile.q3[col])):
+            low = np.searchsorted(values, estimate, side='left') / len(values)
+            high = np.searchsorted(values, estimate, side='right') / len(values)
+            assert low - rank_error <= q <= high + rank_error, (col, q)
+
+
+def assert_unique_counts(profile, df, rtol=0.03):
+    np.testing.assert_allclose(profile.unique_counts[df.columns], df.nunique(), rtol=rtol)
+
+
+def numeric_frame(rows=5_000, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=rows)
+    df = pd.DataFrame({
+        'a': base + rng.normal(scale=0.5, size=rows),
+        'b': -2 * base + rng.normal(size=rows),
+        'c': rng.normal(size=rows),
+        'n': pd.array(rng.integers(0, 100, rows), dtype='Int64'),
+        'label': rng.choice(['x', 'y', 'z'], rows),
+    })
+    df.loc[rng.random(rows) < 0.1, 'a'] = np.nan
+    df.loc[rng.random(rows) < 0.1, 'n'] = pd.NA
+    return df
@@ -0,0 +1,35 @@
+"""The Streamlit app run headless: only the selected view renders, and view state survives switching."""
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+AppTest = pytest.importorskip('streamlit.testing.v1').AppTest
+policies = pytest.importorskip('streamlit.elements.lib.policies')
+
+APP = str(Path(__file__).resolve().parent.parent / 'app.py')
+
+
+@pytest.fixture
+def session_state_warnings(monkeypatch):
+    """Keys Streamlit warns were given a default value and also set through session state"""
+    keys = []
+    monkeypatch.setattr(policies, '_shown_default_value_warning', False)
+    monkeypatch.setattr(policies._LOGGER, 'warning', lambda message, key, **kwargs: keys.append(key))
+    return keys
+
+
+def test_view_state_survives_switching_views(session_state_warnings):
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.session_state.df = pd.read_excel(Path(APP).with_name('sample_data.xlsx'))
+    at.session_state.filename = 'sample_data.xlsx'
+    at.session_state.dataset_key = ('sample_data',)
+    at.run()
+    at.selectbox(key='grid_page_size').set_value(25).run()
+    at.radio(key='view').set_value('📊 Visualize').run()
+    assert not any(element.key == 'grid_page_size' for element in at.selectbox)
+    at.radio(key='view').set_value('📋 Overview').run()
+    at.run()
+    assert at.selectbox(key='grid_page_size').value == 25
+    assert not at.exception
+    assert session_state_warnings == []
@@ -0,0 +1,30 @@
+"""Approximate profiles: sketched quartiles and unique counts checked against pandas."""
+import numpy as np
+import pandas as pd
+
+import analyzer
+from helpers import assert_exact_counts, assert_quantiles, assert_unique_counts, sample_frame
+
+
+def test_approximate_profile_is_close():
+    df = sample_frame()
+    profile = analyzer.DatasetProfile(df, approximate=True)
+    assert_exact_counts(profile, df)
+    assert_quantiles(profile, df)
+    assert_unique_counts(profile, df)
+
+
+def test_approximate_sketches_merge_with_streaming_sketches():
+    df = sample_frame()
+    df['quantity'] = df['quantity'].fillna(0).astype(np.int64)
+    df['mixed'] = pd.Series([1, '1', 2.0, '2'] * (len(df) // 4) + [1] * (len(df) % 4), dtype=object)
+    approximate = analyzer.DatasetProfile(df.iloc[:3_000], approximate=True)
+    assert approximate.unique_counts['mixed'] == df['mixed'].iloc[:3_000].nunique() == 4
+    streaming = analyzer.StreamingProfile()
+    streaming.update(df.iloc[3_000:].astype({'quantity': np.float64}))
+    streaming = streaming.finalize()
+    for col in df.columns:
+        merged = analyzer.HyperLogLog()
+        merged.merge(approximate.distinct_sketches[col])
+        merged.merge(streaming.distinct_sketches[col])
+        np.testing.assert_allclose(merged.count(), df[col].nunique(), rtol=0.03, err_msg=col)
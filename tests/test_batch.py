@@ -0,0 +1,23 @@
+"""The batch CLI over a directory of workbooks."""
+import json
+from pathlib import Path
+
+import pandas as pd
+
+import analyzer
+
+
+def test_batch_cli_writes_one_result_per_file(tmp_path):
+    pd.DataFrame({'a': [1, 2, 2], 'b': ['x', None, None]}).to_csv(tmp_path / 'one.csv', index=False)
+    pd.DataFrame({'c': [1.5, 2.5]}).to_excel(tmp_path / 'two.xlsx', index=False)
+    (tmp_path / 'broken.csv').write_bytes(b'\xff\xfe\x00')
+    (tmp_path / 'notes.txt').write_text('not a dataset')
+    output = tmp_path / 'results.jsonl'
+    assert analyzer.main(['analyze', str(tmp_path), '--jobs', '2', '--output', str(output)]) == 1
+    results = {Path(result['file']).name: result for result in map(json.loads, output.read_text().splitlines())}
+    assert set(results) == {'one.csv', 'two.xlsx', 'broken.csv'}
+    one = results['one.csv']
+    assert one['error'] is None
+    assert (one['rows'], one['missing_values'], one['duplicate_rows']) == (3, 2, 1)
+    assert results['two.xlsx']['rows'] == 2
+    assert results['broken.csv']['error']
@@ -0,0 +1,32 @@
+"""The synthetic dataset generator and the benchmark runner."""
+import json
+
+import pandas as pd
+
+import benchmark
+from create_sample import generate_dataset
+
+
+def test_generated_dataset_has_requested_shape():
+    df = generate_dataset(rows=2_000, numeric_columns=5, text_columns=2, missing_rate=0.1, duplicate_rate=0.05,
+                          cardinality=7)
+    assert len(df) == 2_000
+    assert df.duplicated().sum() >= 100
+    assert df.select_dtypes('number').shape[1] == 5
+    text = df.select_dtypes(object)
+    assert text.shape[1] == 2 and (text.nunique() <= 7).all()
+    floats = df.select_dtypes('float')
+    assert (floats.iloc[:1_900].isna().mean() == 0.1).all()
+    # Dates count back from now; everything else is fixed by the seed
+    again = generate_dataset(rows=2_000, numeric_columns=5, text_columns=2, missing_rate=0.1, duplicate_rate=0.05,
+                             cardinality=7)
+    pd.testing.assert_frame_equal(df.drop(columns='Date'), again.drop(columns='Date'))
+
+
+def test_benchmark_writes_a_record_per_stage(tmp_path):
+    output = tmp_path / 'bench.jsonl'
+    benchmark.main(['--rows', '300', '--formats', 'csv', '--output', str(output)])
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert {record['rows'] for record in records} == {300}
+    assert len({record['stage'] for record in records}) == len(records) > 1
+    assert all(record['seconds'] >= 0 for record in records)
@@ -0,0 +1,29 @@
+"""Server-side histogram bins checked against numpy."""
+from io import BytesIO
+
+import numpy as np
+
+import analyzer
+from helpers import CHUNK_ROWS, csv_bytes, sample_frame
+
+
+def test_histogram_matches_numpy():
+    df = sample_frame()
+    profile = analyzer.DatasetProfile(df)
+    for col in profile.numeric_cols:
+        edges, counts = analyzer.column_histogram(df, profile, col)
+        expected_counts, expected_edges = np.histogram(df[col].dropna(), bins=analyzer.HISTOGRAM_BINS)
+        np.testing.assert_allclose(edges, expected_edges)
+        np.testing.assert_array_equal(counts, expected_counts)
+
+
+def test_streamed_histogram_is_close():
+    df = sample_frame()
+    profile = analyzer.stream_csv_profile(BytesIO(csv_bytes(df)), chunk_rows=CHUNK_ROWS)
+    for col in profile.numeric_cols:
+        edges, counts = analyzer.column_histogram(df, profile, col)
+        values = df[col].dropna()
+        expected_counts, expected_edges = np.histogram(values, bins=analyzer.HISTOGRAM_BINS)
+        np.testing.assert_allclose(edges, expected_edges)
+        assert abs(counts.sum() - len(values)) <= 1
+        assert np.abs(counts - expected_counts).max() <= 0.02 * len(values), col
@@ -0,0 +1,22 @@
+"""Blocked and sampled correlation checked against DataFrame.corr."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import analyzer
+from helpers import numeric_frame
+
+
+@pytest.mark.parametrize('block_rows', [97, analyzer.CORRELATION_BLOCK_ROWS])
+def test_blocked_correlation_matches_pandas(block_rows):
+    df = numeric_frame()
+    cols = ['a', 'b', 'c', 'n']
+    corr = analyzer.blocked_correlation(df, cols, block_rows=block_rows)
+    pd.testing.assert_frame_equal(corr, df[cols].astype(np.float64).corr(), atol=1e-12)
+
+
+def test_sampled_correlation_is_close():
+    df = numeric_frame(50_000)
+    cols = ['a', 'b', 'c']
+    corr = analyzer.blocked_correlation(df, cols, sample_rows=20_000)
+    np.testing.assert_allclose(corr, df[cols].corr(), atol=0.03)
@@ -0,0 +1,74 @@
+"""The group-by cube checked against DataFrame.groupby."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import analyzer
+
+
+def cube_frame(rows=4_000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'region': rng.choice(['North', 'South', 'East'], rows),
+        'tier': rng.choice([1, 2, 3], rows),
+        'sales': rng.gamma(2, 50, rows),
+        'units': rng.integers(0, 10, rows).astype(np.float64),
+    })
+    df.loc[rng.random(rows) < 0.05, 'region'] = None
+    df.loc[rng.random(rows) < 0.05, 'sales'] = np.nan
+    return df
+
+
+def expected_breakdown(df, by, measure):
+    keys = [df[dim].astype(object).where(df[dim].notna(), analyzer.CUBE_MISSING).astype(str) for dim in by]
+    grouped = df.groupby(keys)[measure]
+    return pd.DataFrame({
+        'rows': grouped.size().astype(np.float64),
+        'sum': grouped.sum(),
+        'count': grouped.count().astype(np.float64),
+        'mean': grouped.mean(),
+        'min': grouped.min(),
+        'max': grouped.max(),
+    })
+
+
+@pytest.mark.parametrize('by', [['region'], ['tier'], ['region', 'tier']])
+def test_group_cube_matches_groupby(by):
+    df = cube_frame()
+    cube = analyzer.GroupCube.from_frame(df, ['region', 'tier'], ['sales', 'units'])
+    for measure in ('sales', 'units'):
+        table = cube.breakdown(measure, by)
+        expected = expected_breakdown(df, by, measure)
+        pd.testing.assert_frame_equal(table.astype(np.float64), expected[table.columns],
+                                      check_names=False, check_index_type=False, rtol=1e-9)
+
+
+def test_group_cube_total_and_drill_down():
+    df = cube_frame()
+    cube = analyzer.GroupCube.from_frame(df, ['region', 'tier'], ['sales'])
+    total = cube.breakdown('sales', [])
+    assert total.loc['Total', 'rows'] == len(df)
+    assert total.loc['Total', 'sum'] == pytest.approx(df['sales'].sum())
+    north = cube.breakdown('sales', ['tier'], {'region': 'North'})
+    expected = expected_breakdown(df[df['region'] == 'North'], ['tier'], 'sales')
+    np.testing.assert_allclose(north['sum'], expected['sum'])
+    assert cube.values('tier', {'region': 'North'}) == ['1', '2', '3']
+
+
+def test_merged_cubes_match_cube_of_all_rows():
+    df = cube_frame()
+    whole = analyzer.GroupCube.from_frame(df, ['region', 'tier'], ['sales'])
+    halves = [analyzer.GroupCube.from_frame(part, ['region', 'tier'], ['sales']) for part in (df.iloc[:1_500], df.iloc[1_500:])]
+    merged = halves[0].merge(halves[1])
+    pd.testing.assert_frame_equal(merged.breakdown('sales', ['region', 'tier']),
+                                  whole.breakdown('sales', ['region', 'tier']), rtol=1e-9)
+
+
+def test_weighted_cube_scales_totals():
+    df = cube_frame(500)
+    cube = analyzer.GroupCube.from_frame(df, ['region'], ['sales'], weights=np.full(len(df), 3.0))
+    table = cube.breakdown('sales', ['region'])
+    expected = expected_breakdown(df, ['region'], 'sales')
+    np.testing.assert_allclose(table['rows'], 3 * expected['rows'])
+    np.testing.assert_allclose(table['sum'], 3 * expected['sum'])
+    np.testing.assert_allclose(table['mean'], expected['mean'])
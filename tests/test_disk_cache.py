@@ -0,0 +1,37 @@
+"""The on-disk Arrow parse cache."""
+import os
+
+import pandas as pd
+import pytest
+
+import analyzer
+
+pytest.importorskip('pyarrow')
+
+
+def test_disk_cache_round_trips_frames_and_attrs(tmp_path):
+    cache = analyzer.DiskParseCache(tmp_path)
+    df = pd.DataFrame({'n': [1, 2, None], 'label': ['a', None, 'c'], 'when': pd.date_range('2024-01-01', periods=3)})
+    df.attrs['memory_report'] = {'Column': ['n']}
+    assert cache.get('key') is None
+    cache.put('key', df)
+    cached = analyzer.DiskParseCache(tmp_path).get('key')
+    pd.testing.assert_frame_equal(cached, df)
+    assert cached.attrs == df.attrs
+    # Mixed numbers and text have no Arrow type, so the frame is left uncached
+    cache.put('mixed', pd.DataFrame({'x': [1, 'a']}))
+    assert cache.get('mixed') is None
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    df = pd.DataFrame({'x': range(10_000)})
+    cache = analyzer.DiskParseCache(tmp_path)
+    cache.put('first', df)
+    size = cache.path('first').stat().st_size
+    cache.max_bytes = 2 * size
+    cache.put('second', df)
+    # Files written within the same clock tick could tie on mtime
+    os.utime(cache.path('first'), (0, 0))
+    cache.put('third', df)
+    assert cache.get('first') is None
+    assert cache.get('second') is not None and cache.get('third') is not None
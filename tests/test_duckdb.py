@@ -0,0 +1,46 @@
+"""The out-of-core DuckDB profile checked against pandas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import analyzer
+from helpers import assert_exact_counts, assert_moments, csv_bytes, sample_frame
+
+pytest.importorskip('duckdb')
+
+
+def out_of_core_frame():
+    df = sample_frame()
+    df['empty'] = np.nan
+    df['blank'] = pd.Series(None, index=df.index, dtype=object)
+    return df
+
+
+def test_duckdb_profile_matches_pandas():
+    df = out_of_core_frame()
+    profile = analyzer.out_of_core_profile(csv_bytes(df), {'format': 'csv'})
+    assert_exact_counts(profile, df)
+    # DuckDB types a column that is empty in the CSV as text, where pandas reads it as float
+    assert 'empty' not in profile.numeric_cols
+    assert_moments(profile, df[profile.numeric_cols])
+    pd.testing.assert_series_equal(profile.unique_counts, df.nunique(), check_names=False, check_dtype=False)
+    for q, estimate in ((0.25, profile.q1), (0.5, profile.median), (0.75, profile.q3)):
+        expected = df[profile.numeric_cols].quantile(q)
+        np.testing.assert_allclose(estimate[profile.numeric_cols], expected, rtol=1e-9)
+
+
+def test_duckdb_recommendations_cover_all_null_columns():
+    df = out_of_core_frame()
+    profile = analyzer.out_of_core_profile(csv_bytes(df), {'format': 'csv'}, approximate=True)
+    findings = analyzer.column_findings(analyzer.generate_recommendations(profile.preview, profile))
+    assert {'empty', 'blank'} <= set(findings['Column'])
+
+
+def test_duckdb_quartiles_of_an_all_null_column(tmp_path):
+    df = out_of_core_frame()
+    df.to_parquet(tmp_path / 'data.parquet', index=False)
+    profile = analyzer.DuckDBProfile(tmp_path / 'data.parquet')
+    assert 'empty' in profile.numeric_cols
+    assert profile.q1[['empty']].isna().all() and profile.median[['empty']].isna().all()
+    np.testing.assert_allclose(profile.median[['amount', 'score']], df[['amount', 'score']].median(), rtol=1e-9)
+    assert profile.null_counts['blank'] == len(df)
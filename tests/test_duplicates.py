@@ -0,0 +1,37 @@
+"""Row hashing and the duplicate index checked against DataFrame.duplicated."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import analyzer
+
+
+@pytest.mark.parametrize('values', [
+    [1, '1', np.nan, 'nan', None, 'None'],
+    [1, 1.0, True, '1', 0.0, -0.0, 'True'],
+    [pd.Timestamp('2020-01-01'), '2020-01-01 00:00:00', 2.5, '2.5'],
+])
+def test_mixed_type_duplicates_match_pandas(values):
+    df = pd.DataFrame({'a': pd.Series(values, dtype=object), 'b': 0})
+    assert analyzer.DatasetProfile(df).duplicate_count == df.duplicated().sum()
+    np.testing.assert_array_equal(analyzer.DuplicateIndex(df).duplicated(), df.duplicated())
+
+
+def test_numbers_hash_alike_across_dtypes():
+    ints = analyzer.hash_rows(pd.DataFrame({'q': pd.array([1, None, 2 ** 60], dtype='Int64')}))
+    floats = analyzer.hash_rows(pd.DataFrame({'q': [1.0, np.nan, float(2 ** 60)]}))
+    np.testing.assert_array_equal(ints, floats)
+    # Integers beyond float precision stay distinct
+    large = analyzer.hash_rows(pd.DataFrame({'q': [2 ** 60, 2 ** 60 + 1]}))
+    assert large[0] != large[1]
+
+
+def test_duplicate_index_groups_and_near_duplicates():
+    df = pd.DataFrame({'name': ['Ann Lee', 'ann lee', 'Bob', 'ANN-LEE', 'Bob'], 'n': [1, 1, 2, 1, 2]})
+    exact = analyzer.DuplicateIndex(df)
+    np.testing.assert_array_equal(exact.duplicated(), df.duplicated())
+    near = analyzer.DuplicateIndex(df, normalize=True)
+    assert near.duplicate_count == 3
+    groups = near.groups()
+    assert groups['size'].tolist() == [3, 2]
+    assert near.group_rows(groups['group'].iloc[0]).tolist() == [0, 1, 3]
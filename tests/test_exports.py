@@ -0,0 +1,38 @@
+"""Chunked exports read back with pandas."""
+import gzip
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import analyzer
+
+
+@pytest.fixture
+def export_frame(monkeypatch):
+    monkeypatch.setattr(analyzer, 'EXPORT_CHUNK_ROWS', 7)
+    return pd.DataFrame({
+        'n': range(30),
+        'x': [0.5 * i if i % 4 else None for i in range(30)],
+        'label': [f'row {i}' if i % 5 else np.nan for i in range(30)],
+        'when': pd.date_range('2024-01-01', periods=30, freq='h'),
+    })
+
+
+@pytest.mark.parametrize('export_format', ['CSV', 'CSV (gzip)'])
+def test_csv_export_round_trips(export_frame, export_format):
+    data = analyzer.export_bytes(export_frame, export_format)
+    if export_format == 'CSV (gzip)':
+        data = gzip.decompress(data)
+    pd.testing.assert_frame_equal(pd.read_csv(BytesIO(data), parse_dates=['when']), export_frame)
+
+
+def test_excel_export_round_trips(export_frame):
+    data = analyzer.export_bytes(export_frame, 'Excel')
+    pd.testing.assert_frame_equal(pd.read_excel(BytesIO(data), sheet_name='Data'), export_frame, check_dtype=False)
+
+
+def test_excel_export_is_dropped_past_the_row_limit():
+    assert 'Excel' in analyzer.available_export_formats(analyzer.EXCEL_MAX_ROWS - 1)
+    assert 'Excel' not in analyzer.available_export_formats(analyzer.EXCEL_MAX_ROWS)
@@ -0,0 +1,73 @@
+"""The paged data grid: sorts, filters and pages checked against pandas."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import analyzer
+
+
+def grid_frame(rows=3_000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'price': rng.normal(100, 20, rows).round(1),
+        'city': rng.choice(['Oslo', 'Lima', 'Kyiv', 'Pune'], rows),
+        'code': [f'item-{i}' for i in rng.integers(0, 2_000, rows)],
+        'when': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 10_000, rows), unit='h'),
+    })
+    df.loc[rng.random(rows) < 0.05, 'price'] = np.nan
+    df.loc[rng.random(rows) < 0.05, 'city'] = None
+    return df
+
+
+@pytest.mark.parametrize('col', ['price', 'city', 'code', 'when'])
+@pytest.mark.parametrize('descending', [False, True])
+def test_grid_sort_matches_sort_values(col, descending):
+    df = grid_frame()
+    grid = analyzer.DataGrid(df, df.nunique())
+    rows, matching = grid.page(0, len(df), sort=col, descending=descending)
+    expected = df.sort_values(col, ascending=not descending, na_position='last', kind='stable')
+    assert matching == len(df)
+    pd.testing.assert_series_equal(rows[col].reset_index(drop=True), expected[col].reset_index(drop=True))
+
+
+def test_grid_filters_match_boolean_masks():
+    df = grid_frame()
+    grid = analyzer.DataGrid(df, df.nunique())
+    filters = {
+        'city': ('values', ('Oslo', None)),
+        'price': ('range', (90.0, 120.0)),
+        'code': ('contains', 'ITEM-1'),
+        'when': ('range', (pd.Timestamp('2024-02-01').to_pydatetime(), pd.Timestamp('2024-09-01').to_pydatetime())),
+    }
+    mask = ((df['city'].eq('Oslo') | df['city'].isna()) & df['price'].between(90, 120)
+            & df['code'].str.contains('item-1') & df['when'].between('2024-02-01', '2024-09-01'))
+    rows, matching = grid.page(0, 50, filters)
+    assert matching == mask.sum()
+    pd.testing.assert_frame_equal(rows, df[mask].head(50))
+    rows, _ = grid.page(10, 20, filters, sort='price')
+    pd.testing.assert_frame_equal(rows, df[mask].sort_values('price', kind='stable').iloc[10:20])
+
+
+def test_grid_pages_cover_every_row_once():
+    df = grid_frame()
+    grid = analyzer.DataGrid(df, df.nunique())
+    pages = [grid.page(start, start + 100, sort='city', descending=True)[0] for start in range(0, len(df), 100)]
+    assert sorted(pd.concat(pages).index) == list(df.index)
+
+
+def test_duckdb_grid_matches_data_grid(tmp_path):
+    pytest.importorskip('duckdb')
+    df = grid_frame()
+    df.to_parquet(tmp_path / 'grid.parquet', index=False)
+    on_disk = analyzer.DuckDBProfile(tmp_path / 'grid.parquet').data_grid()
+    in_memory = analyzer.DataGrid(df, df.nunique())
+    filters = {'city': ('values', ('Oslo', 'Lima')), 'price': ('range', (80.0, 130.0)), 'code': ('contains', 'ITEM-1')}
+    expected, expected_count = in_memory.page(40, 90, filters)
+    rows, count = on_disk.page(40, 90, filters)
+    assert count == expected_count
+    pd.testing.assert_frame_equal(rows, expected.reset_index(drop=True), check_dtype=False)
+    # The two grids may order tied rows differently, so sorted pages are compared on the sort column
+    for sort, descending in [('price', True), ('city', False), ('when', True)]:
+        expected, _ = in_memory.page(40, 90, filters, sort, descending)
+        rows, _ = on_disk.page(40, 90, filters, sort, descending)
+        pd.testing.assert_series_equal(rows[sort], expected[sort].reset_index(drop=True), check_dtype=False)
@@ -0,0 +1,36 @@
+"""Incremental profiles built from cached chunk states checked against pandas."""
+import numpy as np
+import pandas as pd
+
+import analyzer
+from helpers import CHUNK_ROWS, assert_exact_counts, assert_moments, assert_unique_counts, sample_frame
+
+
+def test_incremental_profile_matches_pandas_and_reuses_chunks():
+    df = sample_frame()
+    cache = analyzer.ChunkStateCache()
+    profile = analyzer.incremental_profile(df, chunk_rows=CHUNK_ROWS, cache=cache)
+    assert profile.reused_rows == 0
+    assert_exact_counts(profile, df)
+    assert_moments(profile, df)
+    assert_unique_counts(profile, df)
+
+    appended = pd.concat([df, df.head(50)], ignore_index=True)
+    again = analyzer.incremental_profile(appended, chunk_rows=CHUNK_ROWS, cache=cache)
+    assert again.reused_rows == len(df) // CHUNK_ROWS * CHUNK_ROWS
+    assert_exact_counts(again, appended)
+    assert_moments(again, appended)
+
+
+def test_incremental_duplicates_survive_dtype_drift():
+    df = pd.DataFrame({'q': [1, 2, 3, np.nan, 1, 2], 'x': 'a'})
+    # Chunks of three read q as int64 and float64
+    parts = [df.iloc[:3].astype({'q': np.int64}), df.iloc[3:]]
+    profile = analyzer.IncrementalProfile()
+    for part in parts:
+        state = analyzer.StreamingProfile()
+        state.update(part)
+        profile._fold(state)
+    result = profile.finalize()
+    assert result.duplicate_count == df.duplicated().sum() == 2
+    assert result.unique_counts['q'] == df['q'].nunique() == 3
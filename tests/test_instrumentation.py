@@ -0,0 +1,34 @@
+"""Per-stage timing and memory records."""
+import json
+
+import numpy as np
+import pandas as pd
+
+import analyzer
+
+
+def test_nested_stages_and_laps_are_recorded(tmp_path):
+    log = tmp_path / 'stages.jsonl'
+    instrument = analyzer.Instrumentation(trace_memory=True, log_path=log, file='data.csv')
+    with instrument.stage('outer'):
+        instrument.lap('allocate')
+        block = np.ones(2_000_000)
+        instrument.lap('free')
+        del block
+    records = {record['stage']: record for record in instrument.records}
+    assert [record['stage'] for record in instrument.records] == ['outer', 'allocate', 'free']
+    assert records['allocate']['depth'] == records['free']['depth'] == 1
+    assert records['allocate']['peak_mb'] >= 15
+    assert records['outer']['peak_mb'] >= records['allocate']['peak_mb']
+    assert records['outer']['seconds'] >= records['allocate']['seconds']
+    logged = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [line['stage'] for line in logged] == ['allocate', 'free', 'outer']
+    assert all(line['file'] == 'data.csv' for line in logged)
+    assert instrument.summary()['Stage'].tolist() == ['outer', '↳ allocate', '↳ free']
+
+
+def test_recommendations_record_their_stages():
+    instrument = analyzer.Instrumentation()
+    df = pd.DataFrame({'a': [1, 2, 2], 'b': ['x', 'y', 'y']})
+    analyzer.generate_recommendations(df, instrument=instrument)
+    assert instrument.records and all(record['seconds'] is not None for record in instrument.records)
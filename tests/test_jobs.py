@@ -0,0 +1,51 @@
+"""Background jobs: sharing, cancellation and eviction."""
+import threading
+
+import pytest
+
+import analyzer
+
+
+def test_same_key_shares_one_job():
+    jobs = analyzer.JobManager(workers=2)
+    calls = []
+    first = jobs.submit(('a', 'profile'), 'profile', 'key', lambda: calls.append(1) or 42)
+    second = jobs.submit(('b', 'profile'), 'profile', 'key', lambda: calls.append(1) or 43)
+    assert first is second
+    assert first.wait(5) and first.result() == 42 and calls == [1]
+    assert first.state == 'done' and first.seconds is not None
+
+
+def test_moving_a_slot_cancels_its_running_job():
+    jobs = analyzer.JobManager(workers=1)
+    started, stopped = threading.Event(), threading.Event()
+
+    def spin():
+        started.set()
+        try:
+            while True:
+                analyzer.checkpoint()
+        finally:
+            stopped.set()
+
+    old = jobs.submit(('a', 'profile'), 'profile', 'old', spin)
+    assert started.wait(5)
+    new = jobs.submit(('a', 'profile'), 'profile', 'new', lambda: 'fresh')
+    assert stopped.wait(5)
+    assert old.state == 'cancelled' and jobs.get('old') is None
+    with pytest.raises(analyzer.JobCancelled):
+        old.result()
+    assert new.wait(5) and new.result() == 'fresh'
+
+
+def test_results_of_departed_owners_are_evicted():
+    active = {'a', 'b'}
+    jobs = analyzer.JobManager(workers=1, max_results=1, is_active=lambda owner: owner in active)
+    for owner in ('a', 'b'):
+        jobs.submit((owner, 'profile'), 'profile', owner, lambda: owner).wait(5)
+    jobs.submit(('a', 'corr'), 'corr', 'other', lambda: None).wait(5)
+    assert jobs.get('b') is not None
+    active.discard('b')
+    jobs.submit(('a', 'corr'), 'corr', 'another', lambda: None).wait(5)
+    assert jobs.get('b') is None and jobs.slot_jobs('b') == []
+    assert jobs.get('a') is not None
@@ -0,0 +1,26 @@
+"""Memory-optimized frames keep the values of the original."""
+import numpy as np
+import pandas as pd
+
+import analyzer
+
+
+def test_optimize_dtypes_keeps_values():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'small': rng.integers(0, 100, 1_000),
+        'large': rng.integers(0, 2 ** 40, 1_000),
+        'halves': rng.integers(0, 100, 1_000) / 2,
+        'precise': rng.normal(size=1_000),
+        'city': rng.choice(['Oslo', 'Lima', None], 1_000),
+        'code': [f'item-{i}' for i in range(1_000)],
+    })
+    optimized, report = analyzer.optimize_dtypes(df)
+    assert optimized['small'].dtype == np.int8
+    assert optimized['large'].dtype == np.int64
+    assert optimized['halves'].dtype == np.float32
+    assert optimized['precise'].dtype == np.float64
+    assert isinstance(optimized['city'].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(optimized.astype(object), df.astype(object).where(df.notna(), np.nan),
+                                  check_dtype=False)
+    assert report['After (bytes)'].sum() < report['Before (bytes)'].sum()
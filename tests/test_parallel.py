@@ -0,0 +1,16 @@
+"""Per-column statistics on a thread or process pool match the serial profile."""
+import pandas as pd
+import pytest
+
+import analyzer
+from helpers import sample_frame
+
+
+@pytest.mark.parametrize('approximate', [False, True])
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_parallel_profile_matches_serial(executor, approximate):
+    df = sample_frame(2_000)
+    serial = analyzer.DatasetProfile(df, approximate=approximate)
+    parallel = analyzer.DatasetProfile(df, approximate=approximate, executor=executor, workers=2)
+    pd.testing.assert_frame_equal(parallel.describe, serial.describe)
+    pd.testing.assert_series_equal(parallel.unique_counts, serial.unique_counts)
@@ -0,0 +1,16 @@
+"""The exact profile checked against pandas: describe, nunique, isna, duplicated, skew and kurt."""
+import numpy as np
+import pandas as pd
+
+import analyzer
+from helpers import assert_exact_counts, sample_frame
+
+
+def test_exact_profile_matches_pandas():
+    df = sample_frame()
+    profile = analyzer.DatasetProfile(df)
+    assert_exact_counts(profile, df)
+    pd.testing.assert_frame_equal(profile.describe, df.describe(), check_exact=False, rtol=1e-9)
+    pd.testing.assert_series_equal(profile.unique_counts, df.nunique(), check_names=False, check_dtype=False)
+    np.testing.assert_allclose(profile.skew, df[profile.numeric_cols].skew(), rtol=1e-9)
+    np.testing.assert_allclose(profile.kurtosis, df[profile.numeric_cols].kurt(), rtol=1e-9)
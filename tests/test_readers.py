@@ -0,0 +1,36 @@
+"""Excel reader backends."""
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+import analyzer
+
+
+def workbook_bytes():
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer) as writer:
+        pd.DataFrame({'a': [1, 2, 3, 4], 'b': ['w', 'x', None, 'z'], 'c': [0.5, None, 1.5, 2.5]}).to_excel(
+            writer, sheet_name='first', index=False)
+        pd.DataFrame({'d': [10, 20]}).to_excel(writer, sheet_name='second', index=False)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('engine', ['calamine', 'openpyxl-stream', 'pandas'])
+def test_readers_match_read_excel(engine):
+    if engine not in analyzer.available_excel_readers('book.xlsx'):
+        pytest.skip(f'{engine} is not installed')
+    data = workbook_bytes()
+    options = {'format': 'xlsx', 'engine': engine, 'sheet': 'first', 'columns': ['c', 'a'], 'skip_rows': 1, 'n_rows': 2}
+    expected = pd.read_excel(BytesIO(data), sheet_name='first', usecols=['c', 'a'], skiprows=[1], nrows=2)
+    pd.testing.assert_frame_equal(analyzer.parse_upload(data, options), expected)
+    assert analyzer.list_sheets(data, engine) == ['first', 'second']
+
+
+def test_openpyxl_stream_reader_rejects_unknown_columns():
+    buffer = BytesIO()
+    pd.DataFrame({'a': [1], 'b': [2]}).to_excel(buffer, index=False)
+    with pytest.raises(ValueError, match='Usecols do not match columns'):
+        analyzer.read_excel_openpyxl_stream(buffer.getvalue(), {'columns': ['a', 'missing']})
+    projected = analyzer.read_excel_openpyxl_stream(buffer.getvalue(), {'columns': ['b']})
+    assert projected.columns.tolist() == ['b']
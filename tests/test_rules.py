@@ -0,0 +1,27 @@
+"""The recommendation rule registry."""
+import numpy as np
+import pandas as pd
+
+import analyzer
+
+
+def test_rules_flag_columns():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'constant': 7,
+        'empty': np.nan,
+        'id': np.arange(500),
+        'amount': rng.lognormal(0, 2, 500),
+        'digits': rng.integers(0, 1_000, 500).astype(str),
+    })
+    recommendations = analyzer.generate_recommendations(df)
+    findings = analyzer.column_findings(recommendations)
+    assert {'constant', 'empty', 'id', 'amount', 'digits'} <= set(findings['Column'])
+    only = analyzer.generate_recommendations(df, rules=['constant_columns'])
+    assert len(only) == 1 and set(only[0]['columns']) == {'constant'}
+
+
+def test_rules_skip_all_null_text_columns():
+    df = pd.DataFrame({'x': [1, 2, 3], 'y': pd.Series([None] * 3, dtype=object)})
+    recommendations = analyzer.generate_recommendations(df, analyzer.DatasetProfile(df))
+    assert 'y' in set(analyzer.column_findings(recommendations)['Column'])
@@ -0,0 +1,36 @@
+"""Sampled exploration mode: population counts, weights and confidence intervals."""
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import analyzer
+from helpers import CHUNK_ROWS, assert_exact_counts, assert_moments, csv_bytes, numeric_frame, sample_frame
+
+
+def test_sampled_profile_counts_every_row():
+    df = sample_frame()
+    profile = analyzer.stream_csv_profile(BytesIO(csv_bytes(df)), chunk_rows=CHUNK_ROWS,
+                                          options={'sample_rows': 1_500})
+    assert profile.sampled and len(profile.sample) == 1_500
+    assert_exact_counts(profile, df)
+    assert_moments(profile, df)
+    estimate, low, high = profile.mean_interval('amount')
+    assert low <= df['amount'].mean() <= high
+
+
+def test_stratified_sample_weights_sum_to_population():
+    df = sample_frame()
+    profile = analyzer.stream_csv_profile(BytesIO(csv_bytes(df)), chunk_rows=CHUNK_ROWS,
+                                          options={'sample_rows': 1_000, 'stratify': 'region'})
+    assert profile.weights.sum() == pytest.approx(len(df))
+
+
+def test_weighted_correlation_matches_repeated_rows():
+    df = numeric_frame(1_000)
+    weights = np.random.default_rng(2).integers(1, 4, len(df))
+    cols = ['a', 'b', 'c']
+    weighted = analyzer.blocked_correlation(df, cols, block_rows=128, weights=weights)
+    repeated = df.loc[df.index.repeat(weights), cols].corr()
+    pd.testing.assert_frame_equal(weighted, repeated, atol=1e-12)
@@ -0,0 +1,63 @@
+"""Streaming CSV profiles and their sketches checked against pandas."""
+from io import BytesIO, StringIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import analyzer
+from helpers import (CHUNK_ROWS, assert_exact_counts, assert_moments, assert_quantiles, assert_unique_counts,
+                     csv_bytes, sample_frame)
+
+
+def test_streaming_profile_matches_pandas():
+    df = sample_frame()
+    profile = analyzer.stream_csv_profile(BytesIO(csv_bytes(df)), chunk_rows=CHUNK_ROWS)
+    assert_exact_counts(profile, df)
+    assert_moments(profile, df)
+    assert_quantiles(profile, df)
+    assert_unique_counts(profile, df)
+    np.testing.assert_allclose(profile.skew, df[profile.numeric_cols].skew(), rtol=1e-6)
+    np.testing.assert_allclose(profile.kurtosis, df[profile.numeric_cols].kurt(), rtol=1e-6)
+
+
+def test_streaming_profile_merge_matches_single_pass():
+    df = sample_frame()
+    whole = analyzer.stream_csv_profile(BytesIO(csv_bytes(df)), chunk_rows=CHUNK_ROWS)
+    first = analyzer.stream_csv_profile(BytesIO(csv_bytes(df.iloc[:2_500])), chunk_rows=CHUNK_ROWS)
+    second = analyzer.stream_csv_profile(BytesIO(csv_bytes(df.iloc[2_500:])), chunk_rows=CHUNK_ROWS)
+    first.merge(second)
+    assert first.duplicate_count == whole.duplicate_count == df.duplicated().sum()
+    pd.testing.assert_frame_equal(first.describe.loc[['count', 'mean', 'std', 'min', 'max']],
+                                  whole.describe.loc[['count', 'mean', 'std', 'min', 'max']], rtol=1e-9)
+
+
+def test_streaming_duplicates_survive_dtype_drift():
+    # The second chunk's missing value makes q float there while the first chunk read it as int
+    csv = 'q,x\n' + ''.join(f'{i},a\n' for i in range(10)) + ',a\n1,a\n'
+    profile = analyzer.stream_csv_profile(BytesIO(csv.encode('utf-8')), chunk_rows=10)
+    assert profile.duplicate_count == pd.read_csv(StringIO(csv)).duplicated().sum() == 1
+
+
+def test_streaming_unique_counts_survive_dtype_drift():
+    # q repeats 0..998 in a second chunk that a missing value reads as float
+    csv = 'q,x\n' + ''.join(f'{i},a\n' for i in range(1_000)) + ',a\n' + ''.join(f'{i},a\n' for i in range(999))
+    df = pd.read_csv(StringIO(csv))
+    profile = analyzer.stream_csv_profile(BytesIO(csv.encode('utf-8')), chunk_rows=1_000)
+    assert_unique_counts(profile, df)
+
+
+def test_sketches_are_within_error_bounds():
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=200_000)
+    kll = analyzer.KLLSketch(seed=0)
+    for chunk in np.array_split(values, 7):
+        part = analyzer.KLLSketch(seed=1)
+        part.update(chunk)
+        kll.merge(part)
+    for q in (0.1, 0.5, 0.9):
+        assert abs(np.mean(values <= kll.quantile(q)) - q) < 0.01
+    keys = pd.Series(rng.integers(0, 50_000, 200_000))
+    hll = analyzer.HyperLogLog()
+    hll.update(analyzer.hash_values(keys))
+    assert hll.count() == pytest.approx(keys.nunique(), rel=0.03)
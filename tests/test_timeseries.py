@@ -0,0 +1,66 @@
+"""The time rollup pyramid checked against resample, and LTTB downsampling."""
+import numpy as np
+import pandas as pd
+import pytest
+
+import analyzer
+
+
+def time_frame(rows=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    minutes = np.sort(rng.integers(0, 60 * 24 * 200, rows))
+    df = pd.DataFrame({
+        'when': pd.Timestamp('2024-01-01') + pd.to_timedelta(minutes, unit='min'),
+        'value': rng.normal(10, 3, rows),
+    })
+    df.loc[rng.random(rows) < 0.05, 'value'] = np.nan
+    return df
+
+
+@pytest.mark.parametrize('level, rule', [
+    ('hour', 'h'), ('day', 'D'), ('week', 'W-MON'), ('month', 'MS'),
+])
+def test_time_rollup_matches_resample(level, rule):
+    df = time_frame()
+    rollup = analyzer.TimeRollup.from_frame(df, 'when', ['value'])
+    resampled = df.set_index('when')['value'].resample(rule, label='left', closed='left')
+    for statistic, expected in [('sum', resampled.sum()), ('count', resampled.count()), ('mean', resampled.mean()),
+                                ('min', resampled.min()), ('max', resampled.max())]:
+        series = rollup.series(level, 'value', statistic)
+        expected = expected.reindex(series.index)
+        np.testing.assert_allclose(series.to_numpy(np.float64), expected.to_numpy(np.float64), rtol=1e-9)
+    rows = rollup.series(level, None)
+    assert rows.sum() == len(df)
+    np.testing.assert_array_equal(rows.to_numpy(), resampled.size().reindex(rows.index).to_numpy())
+
+
+def test_time_rollup_parses_text_dates_and_merges():
+    df = time_frame(5_000)
+    text = df.assign(when=df['when'].dt.strftime('%Y-%m-%d %H:%M'))
+    profile = analyzer.DatasetProfile(text)
+    assert analyzer.datetime_columns(text, profile) == ['when']
+    parsed = analyzer.time_rollup(text, profile, 'when', ['value'])
+    direct = analyzer.TimeRollup.from_frame(df, 'when', ['value'])
+    pd.testing.assert_series_equal(parsed.series('day', 'value'), direct.series('day', 'value'))
+    merged = analyzer.TimeRollup.from_frame(df.iloc[:2_000], 'when', ['value']).merge(
+        analyzer.TimeRollup.from_frame(df.iloc[2_000:], 'when', ['value']))
+    pd.testing.assert_series_equal(merged.series('week', 'value'), direct.series('week', 'value'))
+
+
+def test_time_rollup_zoom_picks_finest_level():
+    rollup = analyzer.TimeRollup.from_frame(time_frame(), 'when', ['value'])
+    assert rollup.level_for(rollup.start, rollup.end) == 'hour'
+    assert rollup.level_for(rollup.start, rollup.end, max_points=500) == 'day'
+    assert rollup.level_for(rollup.start, rollup.end, max_points=10) == 'month'
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(10_000, dtype=np.float64)
+    y = np.sin(x / 500)
+    y[4_321] = 25.0
+    keep = analyzer.lttb(x, y, 200)
+    assert len(keep) == 200
+    assert keep[0] == 0 and keep[-1] == len(x) - 1
+    assert np.all(np.diff(keep) > 0)
+    assert 4_321 in keep
+    np.testing.assert_array_equal(analyzer.lttb(x[:50], y[:50], 200), np.arange(50))
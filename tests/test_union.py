@@ -0,0 +1,16 @@
+"""Union profiles over several sheets or files checked against the concatenated frame."""
+import pandas as pd
+
+import analyzer
+from helpers import CHUNK_ROWS, assert_exact_counts, assert_moments, sample_frame
+
+
+def test_union_profile_matches_concatenated_frames():
+    df = sample_frame()
+    frames = [df.iloc[:2_000], df.iloc[2_000:]]
+    profile = analyzer.UnionProfile(frames, [analyzer.incremental_profile(frame, chunk_rows=CHUNK_ROWS,
+                                                                         cache=analyzer.ChunkStateCache())
+                                             for frame in frames])
+    assert_exact_counts(profile, df)
+    assert_moments(profile, df)
+    pd.testing.assert_frame_equal(profile.correlation(['amount', 'score']), df[['amount', 'score']].corr(), atol=1e-12)